@@ -0,0 +1,131 @@
+# animation.py - Blink and breathing for the buddy on screen, and the gacha spin, on their own Tk timers
+
+import math
+import time
+import rng
+from art_cache import FRAMES
+
+FRAME_MS = 100              # How often the timeline checks for a new frame
+BLINK_INTERVAL = (3.0, 5.0)  # Seconds before the eyes open or close again
+BREATH_RATE = 0.4           # Radians per second, one breath every ~16 seconds
+SPIN_SECONDS = 1.0          # How long the gacha spin runs before the reveal
+SPIN_FRAME_MS = 80          # Time between spin frames
+
+
+class AnimationTimeline:
+    """
+    Drives the idle animation of the displayed buddy from root.after().
+
+    Blink and breath only depend on how much time has passed, not on how often the UI
+    redraws, and they are not part of the buddy so they never end up in a save. on_frame is
+    called whenever the blink state or breath offset changes, which is a few times a second
+    at most.
+    """
+
+    def __init__(self, root, on_frame, frame_ms=FRAME_MS, clock=time.monotonic):
+        self.root = root
+        self.on_frame = on_frame
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self.started = clock()
+        self.blink = 0  # 0=open, 1=blink
+        self.breath_offset = self._breath_offset(0.0)
+        self._next_blink = self.started + rng.get(rng.ANIMATION).uniform(*BLINK_INTERVAL)
+        self._after_id = None
+
+    @staticmethod
+    def _breath_offset(seconds):
+        # Same 0-3 padding the art cache has frames for
+        return int(1.5 * (1 + math.sin(seconds * BREATH_RATE)))
+
+    def advance(self, now=None):
+        """Move the animation to `now`, True if the frame changed"""
+        now = self.clock() if now is None else now
+        blink = self.blink
+        if now >= self._next_blink:
+            # The eyes stay open, then shut, for 3-5 seconds at a time
+            blink = 1 - blink
+            self._next_blink = now + rng.get(rng.ANIMATION).uniform(*BLINK_INTERVAL)
+        breath_offset = self._breath_offset(now - self.started)
+
+        changed = blink != self.blink or breath_offset != self.breath_offset
+        self.blink, self.breath_offset = blink, breath_offset
+        return changed
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.frame_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            if self.advance():
+                self.on_frame()
+        except Exception as e:
+            print(f"Error animating buddy: {e}")
+        self.start()
+
+
+def spin_frames():
+    """Baby idle frames of every species and rarity, what the gacha spin flicks through"""
+    # Rarities without their own art share frames, each frame only once
+    return list(dict.fromkeys(frame for (species, rarity, stage, art_key, blink, breath_offset, zzz), frame in FRAMES.items()
+            if stage == 1 and art_key == "idle" and not blink and breath_offset == 1 and not zzz))
+
+
+class GachaSpin:
+    """
+    The adoption screen's spin, driven by root.after() instead of sleeping on the Tk thread.
+
+    The buddy is rolled before the spin starts, the spin only cycles preview frames through
+    show(frame) and calls on_done() once it has run for `seconds`. stop() cancels it without
+    the reveal, e.g. when the window closes mid-spin.
+    """
+
+    def __init__(self, root, show, on_done, seconds=SPIN_SECONDS, frame_ms=SPIN_FRAME_MS, clock=time.monotonic):
+        self.root = root
+        self.show = show
+        self.on_done = on_done
+        self.seconds = seconds
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self.frames = spin_frames()
+        self._index = rng.get(rng.ANIMATION).randrange(len(self.frames)) if self.frames else 0
+        self._ends = None
+        self._after_id = None
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self):
+        self._ends = self.clock() + self.seconds
+        self._tick()
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        if self.clock() >= self._ends or not self.frames:
+            self.on_done()
+            return
+        try:
+            self.show(self.frames[self._index % len(self.frames)])
+        except Exception as e:
+            print(f"Error animating gacha spin: {e}")
+        self._index += 1
+        self._after_id = self.root.after(self.frame_ms, self._tick)
@@ -0,0 +1,60 @@
+# art_cache.py - Every buddy ASCII frame rendered once, so drawing a buddy is one dict lookup
+
+from types import MappingProxyType
+from assets import PET_ART, BRANCH_CODES, RARITY_DEFINITIONS
+
+STAGE_ART = {1: "baby", 2: "child", 3: "adult"}
+# Poses picked from the last action and energy (baby/child), adults show their branch
+POSES = ("idle", "eating", "bouncing", "breathing", "purring", "sleeping")
+BRANCHES = tuple(branch for branch in BRANCH_CODES if branch)
+# int(1.5 * (1 + sin(phase))) can only be one of these
+BREATH_OFFSETS = (0, 1, 2, 3)
+ZZZ = "   Z z z…\n"
+
+
+def _breathe(lines, breath_offset):
+    """Pad every line by breath_offset on both sides, except lines that would get too wide"""
+    widest = max(len(line) for line in lines) + 2
+    return [line if len(line) + 2 * breath_offset > widest else " " * breath_offset + line + " " * breath_offset
+            for line in lines]
+
+
+def _compile():
+    """(species, rarity, stage, art_key, blink, breath_offset, zzz) -> finished frame string"""
+    frames = {}
+    for species, rarities in PET_ART.items():
+        for rarity, stages in rarities.items():
+            for stage, stage_name in STAGE_ART.items():
+                art_set = stages.get(stage_name)
+                if not art_set:
+                    continue
+                first = next(iter(art_set.values()))
+                for art_key in (BRANCHES if stage == 3 else POSES):
+                    # Missing poses fall back to the stage's first variant
+                    for blink in (0, 1):
+                        if blink and "blink" in art_set:
+                            lines = art_set["blink"]
+                        else:
+                            lines = art_set.get(art_key, first)
+                        for breath_offset in BREATH_OFFSETS:
+                            text = "\n".join(_breathe(lines, breath_offset))
+                            for zzz in (False, True):
+                                frames[(species, rarity, stage, art_key, blink, breath_offset, zzz)] = (ZZZ + text) if zzz else text
+
+        # Art exists for one rarity per species, the other rarities use the first one drawn
+        fallback = next(iter(rarities), None)
+        for rarity in RARITY_DEFINITIONS:
+            if fallback is None or rarity in rarities:
+                continue
+            for key, frame in list(frames.items()):
+                if key[0] == species and key[1] == fallback:
+                    frames[(species, rarity) + key[2:]] = frame
+    return MappingProxyType(frames)
+
+
+FRAMES = _compile()
+
+
+def get_frame(species, rarity, stage, art_key, blink, breath_offset, zzz):
+    """The finished frame, or None if there is no art for this species/stage at all"""
+    return FRAMES.get((species, rarity, stage, art_key, blink, breath_offset, zzz))
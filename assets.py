@@ -515,6 +515,23 @@ PERSONALITY_TRAITS = {
     }
 }
 
+# Interned codes used by the binary pet save format (pet_codec.py)
+# Only ever append to these tuples, the position of each entry is what gets written to disk
+SPECIES_CODES = ("fuzzball", "glitterpup", "slimey", "starwhisker", "dragonling", "nebulite")
+RARITY_CODES = ("common", "uncommon", "rare", "epic", "legendary")
+TRAIT_CODES = ("playful", "lazy", "hungry", "neat_freak", "chill")
+BRANCH_CODES = (None, "joy", "pure", "plush", "spark", "bonded")
+ACTION_CODES = ("idle", "feed", "play", "clean", "sleep", "pet")
+
+# Seconds before a care action can be used again
+ACTION_COOLDOWNS = {
+    "feed": 5,
+    "play": 8,
+    "clean": 10,
+    "sleep": 15,
+    "pet": 5
+}
+
 #THEME DEFINITIONS for unlocking under achievements
 THEMES = {
     "forest": {
@@ -0,0 +1,133 @@
+# autosave.py - One place that decides when the game state and pets get written
+
+import os
+import threading
+import time
+
+# Save priorities, anything critical is written straight away
+PRIORITY_LOW = 0       # Stat ticks from the game loop
+PRIORITY_NORMAL = 1    # Player actions, currency and achievement progress
+PRIORITY_CRITICAL = 2  # Evolution, adoption, purchases and claims
+
+# Defaults, can be tuned per deployment with the env vars read below
+DEFAULT_DEBOUNCE = 5.0        # Write once nothing changed for this many seconds
+DEFAULT_MAX_STALENESS = 15.0  # ...but never keep a change unsaved for longer than this
+
+
+def _env_seconds(name, default):
+    try:
+        return max(0.0, float(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+class SaveScheduler:
+    """
+    Every mutation reports here with mark() instead of writing by itself.
+
+    Changes to the same target are coalesced: a target is written once it has been quiet
+    for `debounce` seconds, or once its oldest unsaved change is `max_staleness` seconds
+    old, whichever comes first. Critical changes are written immediately. The game loop
+    calls poll() to write whatever is due.
+    """
+
+    def __init__(self, debounce=None, max_staleness=None, clock=time.monotonic):
+        self.debounce = _env_seconds("BUDDY_SAVE_DEBOUNCE", DEFAULT_DEBOUNCE) if debounce is None else debounce
+        self.max_staleness = _env_seconds("BUDDY_SAVE_MAX_STALENESS", DEFAULT_MAX_STALENESS) if max_staleness is None else max_staleness
+        self.clock = clock
+        self._pending = {}  # key -> [write_fn, args, first_dirty, last_dirty]
+        self._lock = threading.Lock()
+
+        # Counters
+        self.marks = [0, 0, 0]  # Indexed by priority
+        self.coalesced = 0
+        self.writes = {"critical": 0, "debounce": 0, "staleness": 0, "flush": 0}
+        self.max_staleness_seen = 0.0
+
+    def mark(self, key, write_fn, *args, priority=PRIORITY_NORMAL):
+        """Report that `key` changed, write_fn(*args) will be called to write it"""
+        now = self.clock()
+        with self._lock:
+            self.marks[priority] += 1
+            if priority < PRIORITY_CRITICAL:
+                entry = self._pending.get(key)
+                if entry is None:
+                    self._pending[key] = [write_fn, args, now, now]
+                else:
+                    self.coalesced += 1
+                    entry[0], entry[1], entry[3] = write_fn, args, now
+                return
+            # Critical: anything pending for this key is superseded by the immediate write
+            self._count_write("critical", self._pending.pop(key, None), now)
+        self._run(write_fn, args)
+
+    def poll(self):
+        """Write every target whose debounce or staleness deadline has passed, returns how many"""
+        now = self.clock()
+        due = []
+        with self._lock:
+            for key, entry in list(self._pending.items()):
+                if now - entry[2] >= self.max_staleness:
+                    reason = "staleness"
+                elif now - entry[3] >= self.debounce:
+                    reason = "debounce"
+                else:
+                    continue
+                del self._pending[key]
+                self._count_write(reason, entry, now)
+                due.append(entry)
+        for write_fn, args, _, _ in due:
+            self._run(write_fn, args)
+        return len(due)
+
+    def flush(self, key=None):
+        """Write everything pending (or just `key`) right now"""
+        now = self.clock()
+        with self._lock:
+            if key is None:
+                due = list(self._pending.values())
+                self._pending.clear()
+            else:
+                entry = self._pending.pop(key, None)
+                due = [entry] if entry else []
+            for entry in due:
+                self._count_write("flush", entry, now)
+        for write_fn, args, _, _ in due:
+            self._run(write_fn, args)
+        return len(due)
+
+    def next_deadline(self):
+        """Clock time at which poll() next has something to write, or None if nothing is pending"""
+        with self._lock:
+            deadlines = [min(entry[2] + self.max_staleness, entry[3] + self.debounce) for entry in self._pending.values()]
+        return min(deadlines) if deadlines else None
+
+    def _count_write(self, reason, entry, now):
+        self.writes[reason] += 1
+        if entry is not None:
+            self.max_staleness_seen = max(self.max_staleness_seen, now - entry[2])
+
+    def _run(self, write_fn, args):
+        try:
+            write_fn(*args)
+        except Exception as e:
+            print(f"Error in scheduled save: {e}")
+
+    def stats(self):
+        """Return scheduler counters, write_amplification is writes per reported change"""
+        with self._lock:
+            pending = len(self._pending)
+            total_marks = sum(self.marks)
+            total_writes = sum(self.writes.values())
+            return {
+                "debounce": self.debounce,
+                "max_staleness": self.max_staleness,
+                "marks_low": self.marks[PRIORITY_LOW],
+                "marks_normal": self.marks[PRIORITY_NORMAL],
+                "marks_critical": self.marks[PRIORITY_CRITICAL],
+                "coalesced": self.coalesced,
+                "writes": dict(self.writes),
+                "pending": pending,
+                "max_staleness_seen": self.max_staleness_seen,
+                "write_amplification": (total_writes / total_marks) if total_marks else 0.0
+            }
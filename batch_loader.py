@@ -0,0 +1,108 @@
+# batch_loader.py - Fill a window in pages fetched off the Tk thread, so it opens straight away
+
+import queue
+
+PAGE_SIZE = 50   # Rows per page, also what the first rows wait for
+IN_FLIGHT = 2    # Pages requested ahead of the one being shown
+POLL_MS = 30     # How often the Tk side picks up finished pages
+
+
+class BatchLoader:
+    """
+    Streams pages of rows into a Tk window.
+
+    fetch(start, count) returns a Future of (rows, total) and runs somewhere other than the Tk
+    thread (the game actor's owner for the collection windows). Finished pages go into a
+    queue that the Tk side drains from root.after(), and on_batch(rows) gets them in order.
+    The first page is the same size however big the collection is, so the first rows show up
+    just as fast with ten buddies as with ten thousand. cancel() (e.g. when the window
+    closes) drops the pages still pending and stops polling.
+    """
+
+    def __init__(self, root, fetch, on_batch, on_done=None, page_size=PAGE_SIZE, in_flight=IN_FLIGHT, poll_ms=POLL_MS):
+        self.root = root
+        self.fetch = fetch
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.page_size = page_size
+        self.in_flight = in_flight
+        self.poll_ms = poll_ms
+        self.total = None       # Known once the first page is back
+        self.loaded = 0         # Rows handed to on_batch so far
+        self.cancelled = False
+        self._results = queue.SimpleQueue()  # (start, future), filled from the fetching thread
+        self._pending = {}      # start -> future
+        self._ready = {}        # start -> (rows, total), finished but not shown yet
+        self._next_request = 0
+        self._next_show = 0
+        self._after_id = None
+
+    def start(self):
+        self._request(0)
+        self._schedule()
+
+    def cancel(self):
+        self.cancelled = True
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._ready.clear()
+
+    @property
+    def done(self):
+        return self.total is not None and self._next_show >= self.total
+
+    def _request(self, start):
+        future = self.fetch(start, self.page_size)
+        self._pending[start] = future
+        self._next_request = start + self.page_size
+        future.add_done_callback(lambda f, start=start: self._results.put((start, f)))
+
+    def _schedule(self):
+        if not self.cancelled and self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        if self.cancelled:
+            return
+        try:
+            while True:
+                try:
+                    start, future = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if self._pending.pop(start, None) is None or future.cancelled():
+                    continue
+                self._ready[start] = future.result()
+
+            # Pages can come back in any order, they are shown in collection order
+            while self._next_show in self._ready:
+                # Every page carries the current size, a collection that changed meanwhile ends the load where it now ends
+                rows, self.total = self._ready.pop(self._next_show)
+                self._next_show += self.page_size
+                self.loaded += len(rows)
+                if rows:
+                    self.on_batch(rows)
+
+            if self.done:
+                self.cancel()
+                if self.on_done:
+                    self.on_done(self.total)
+                return
+
+            # Keep a few pages on the way
+            if self.total is not None:
+                while len(self._pending) < self.in_flight and self._next_request < self.total:
+                    self._request(self._next_request)
+        except Exception as e:
+            print(f"Error loading rows: {e}")
+            self.cancel()
+            return
+        self._schedule()
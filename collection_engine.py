@@ -0,0 +1,153 @@
+# collection_engine.py - Every owned buddy's stats in flat columns, decayed together in one step
+
+from array import array
+from pets import ROW_FIELDS
+
+# Typecodes for the ROW_FIELDS columns, stage and the bool flags fit in a signed byte
+_COLUMN_TYPES = {"stage": "b", "evolution_ready": "b", "dirty": "b"}
+
+
+class CollectionEngine:
+    """
+    Struct-of-arrays store for the pet collection.
+
+    Each Buddy field in ROW_FIELDS lives in one column (an array.array) with a row per pet,
+    and an attached Buddy reads and writes its row instead of its own attributes. The
+    per-second decay rates and evolution config of every row are kept in more columns, so
+    step() decays the whole collection column by column without calling into any Buddy.
+    Rows are refreshed from their Buddy only after stage, rarity or personality change.
+    """
+
+    def __init__(self):
+        self.ids = []      # row -> pet_id
+        self.buddies = []  # row -> Buddy
+        self.rows = {}     # pet_id -> row
+        self.columns = [array(_COLUMN_TYPES.get(name, "d")) for name in ROW_FIELDS]
+        # Derived per row: hunger/energy/cleanliness/happiness/affection decay per second
+        self.rates = [array("d") for _ in range(5)]
+        self.evolution_time = array("d")
+        self.stat_threshold = array("d")
+        self._stale = set()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, pet_id):
+        return pet_id in self.rows
+
+    def get(self, pet_id):
+        """The attached Buddy for pet_id, or None"""
+        row = self.rows.get(pet_id)
+        return None if row is None else self.buddies[row]
+
+    def owns(self, buddy):
+        return buddy._engine is self
+
+    def attach(self, pet_id, buddy):
+        """Give pet_id a row backed by `buddy`, replacing whatever buddy had that id before"""
+        if buddy._engine is not None:
+            if buddy._engine is self and self.buddies[buddy._row] is buddy and self.ids[buddy._row] == pet_id:
+                return buddy
+            buddy._engine.detach(buddy._engine.ids[buddy._row])
+
+        row = self.rows.get(pet_id)
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(pet_id)
+            self.buddies.append(buddy)
+            self.rows[pet_id] = row
+            for column in self.columns:
+                column.append(0)
+            for column in self.rates:
+                column.append(0.0)
+            self.evolution_time.append(0.0)
+            self.stat_threshold.append(0.0)
+        else:
+            self.buddies[row].detach()
+            self.buddies[row] = buddy
+
+        buddy.attach(self, row)
+        self._stale.add(row)
+        return buddy
+
+    def detach(self, pet_id):
+        """Drop pet_id's row, its Buddy keeps its values and works on its own again"""
+        row = self.rows.pop(pet_id, None)
+        if row is None:
+            return None
+        buddy = self.buddies[row]
+        buddy.detach()
+
+        # Move the last row into the gap so the columns stay contiguous
+        last = len(self.ids) - 1
+        if row != last:
+            for column in self.columns + self.rates + [self.evolution_time, self.stat_threshold]:
+                column[row] = column[last]
+            moved_id, moved = self.ids[last], self.buddies[last]
+            self.ids[row], self.buddies[row] = moved_id, moved
+            self.rows[moved_id] = row
+            object.__setattr__(moved, "_row", row)
+            if last in self._stale:
+                self._stale.add(row)
+        for column in self.columns + self.rates + [self.evolution_time, self.stat_threshold]:
+            column.pop()
+        self.ids.pop()
+        self.buddies.pop()
+        self._stale.discard(last)
+        return buddy
+
+    def mark_stale(self, row):
+        """A row's stage, rarity or personality changed, re-read its rates before the next step"""
+        self._stale.add(row)
+
+    def _refresh_derived(self):
+        for row in self._stale:
+            buddy = self.buddies[row]
+            for column, rate in zip(self.rates, buddy.get_decay_rates()):
+                column[row] = rate
+            self.evolution_time[row], self.stat_threshold[row] = buddy.get_evolution_config()
+        self._stale.clear()
+
+    def step(self, elapsed_seconds):
+        """Decay every pet by elapsed_seconds and advance evolution, same rules as Buddy.apply_decay"""
+        if not self.ids or elapsed_seconds <= 0:
+            return
+        self._refresh_derived()
+
+        # Clamped decay, one column at a time
+        old_stats = self.columns[:5]
+        for index, (values, rates) in enumerate(zip(old_stats, self.rates)):
+            self.columns[index] = array("d", [
+                value - rate * elapsed_seconds if value > rate * elapsed_seconds else 0.0
+                for value, rate in zip(values, rates)
+            ])
+
+        hunger, energy, cleanliness, happiness = self.columns[:4]
+        timers, stages, ready, dirty = self.columns[5:]
+        ready_rows = []
+        for row, (h, e, c, hp, stage, evolution_time, threshold, *old) in enumerate(zip(
+                hunger, energy, cleanliness, happiness, stages, self.evolution_time, self.stat_threshold, *old_stats)):
+            # Anything above zero decayed, so the row no longer matches the save
+            changed = any(old)
+            if (h + e + c + hp) / 4 < threshold:
+                # Stats dropped below the threshold, evolution progress resets
+                if timers[row] or ready[row]:
+                    timers[row] = 0.0
+                    ready[row] = 0
+                    changed = True
+            else:
+                timers[row] += elapsed_seconds
+                changed = True
+                if stage < 3 and timers[row] >= evolution_time:
+                    ready[row] = 1
+                    ready_rows.append(row)
+            if changed:
+                dirty[row] = 1
+
+        # Rare, so it is fine to do per buddy
+        for row in ready_rows:
+            self.buddies[row].determine_evolution_branch()
+
+    def dirty_pets(self):
+        """(pet_id, Buddy) for every row that changed since it was last saved"""
+        return [(self.ids[row], self.buddies[row]) for row, flag in enumerate(self.columns[-1]) if flag]
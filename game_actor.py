@@ -0,0 +1,360 @@
+# game_actor.py - One thread owns the game state, everything else sends it commands
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from pets import Buddy
+from autosave import PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_CRITICAL
+from assets import ACTION_COOLDOWNS
+
+# What the UI gets to see of the current buddy, render_art() and the bars only need these
+PetView = namedtuple("PetView", (
+    "pet_id", "species", "rarity", "personality",
+    "hunger", "energy", "cleanliness", "happiness", "affection", "satisfaction",
+    "stage", "evolution_ready", "evolution_branch", "last_action"
+))
+
+# Everything the UI reads, replaced as a whole on every change and never modified
+Snapshot = namedtuple("Snapshot", (
+    "version", "pet", "buddy_bucks", "gacha_rolls", "current_theme", "unlocked_themes"
+))
+
+# Bounds on how long the game loop sleeps between wakeups
+MIN_LOOP_SLEEP = 0.05
+MAX_LOOP_SLEEP = 60.0
+
+
+def pet_view(pet_id, buddy):
+    return PetView(
+        pet_id, buddy.species, buddy.rarity, tuple(buddy.personality),
+        buddy.hunger, buddy.energy, buddy.cleanliness, buddy.happiness, buddy.affection, buddy.satisfaction,
+        buddy.stage, buddy.evolution_ready, buddy.evolution_branch, buddy.last_action
+    )
+
+
+class GameActor:
+    """
+    Single owner of the GameState, the current buddy and the action cooldowns.
+
+    Only the owner thread (the one running the game loop) touches them. It calls step() for
+    decay and saves, and runs the commands other threads queue with submit() or call(). After
+    every step and command the owner publishes a new immutable Snapshot, which the Tk side
+    reads without any locking. Before the loop starts and after it stops, call() just runs the
+    command on the calling thread.
+    """
+
+    def __init__(self, game_state, recorder, clock):
+        self.game_state = game_state
+        self.recorder = recorder
+        self.clock = clock
+        self.current_pet = None
+        self.current_pet_id = None
+        # action -> clock time the action is ready again, checked when an action comes in so
+        # nothing has to happen (and the loop need not wake) when one runs out
+        self.cooldowns = {}
+        self._commands = queue.SimpleQueue()
+        # Set when there is something for the owner to do before its next deadline
+        self.wakeup = threading.Event()
+        # Extra wake hook for loops that do not sleep on self.wakeup (see game_loop.py)
+        self.waker = None
+        self._owner = None
+        self._version = 0
+        self.snapshot = None
+        self.publish()
+
+    # --- Talking to the owner ---
+
+    def start(self, owner=None):
+        """Make thread `owner` (an ident, default the calling thread) the owner"""
+        self._owner = owner or threading.get_ident()
+
+    def stop(self):
+        """No owner any more, runs whatever is still queued and lets call() run inline"""
+        self.run_pending()
+        self._owner = None
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) for the owner, returns a Future with its result"""
+        future = Future()
+        self._commands.put((future, fn, args))
+        self.wake()
+        return future
+
+    def call(self, fn, *args, timeout=5.0):
+        """Run fn(*args) on the owner and wait for the result, None if the owner did not get to it in time"""
+        if self._owner is None or self._owner == threading.get_ident():
+            result = fn(*args)
+            self.publish()
+            # The next deadline may have moved (new cooldown, other buddy, ...)
+            self.wake()
+            return result
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # A command that has not started is dropped, one already running still finishes
+            future.cancel()
+            print(f"Error running game command {getattr(fn, '__name__', fn)}: no answer within {timeout:g}s")
+            return None
+
+    def wake(self):
+        """Make the loop recompute its next wakeup straight away"""
+        self.wakeup.set()
+        if self.waker:
+            self.waker()
+
+    def run_pending(self):
+        """Run the queued commands, on the owner"""
+        ran = False
+        while True:
+            try:
+                future, fn, args = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            ran = True
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                print(f"Error running game command {getattr(fn, '__name__', fn)}: {e}")
+                future.set_exception(e)
+        if ran:
+            self.publish()
+
+    def publish(self):
+        """Replace the snapshot if anything the UI shows changed"""
+        game_state = self.game_state
+        pet = pet_view(self.current_pet_id, self.current_pet) if self.current_pet else None
+        previous = self.snapshot
+        fields = (pet, game_state.buddy_bucks, game_state.gacha_rolls, game_state.current_theme,
+                  tuple(game_state.unlocked_themes))
+        if previous is not None and previous[1:] == fields:
+            return previous
+        self._version += 1
+        self.snapshot = Snapshot(self._version, *fields)
+        return self.snapshot
+
+    # --- The loop body ---
+
+    def step(self):
+        """Commands, decay and due saves, returns how long the loop may sleep"""
+        # Cleared first, so a command queued from here on wakes the next wait()
+        self.wakeup.clear()
+        self.run_pending()
+        # Game seconds come in whole 2s steps (faster in dev mode)
+        _, decay_seconds = self.clock.tick()
+        game_state = self.game_state
+
+        # The whole collection (current pet included) decays together
+        if decay_seconds:
+            self.recorder.tick(decay_seconds)
+            try:
+                game_state.decay_collection(decay_seconds)
+            except Exception as e:
+                print(f"Error decaying collection: {e}")
+
+        if self.current_pet:
+            # Check if we're at night for theme unlock, not sure if it would work for vercel uploads
+            current_hour = time.localtime().tm_hour
+            if current_hour >= 22 and not game_state.achievements["night_play"]:
+                game_state.achievements["night_play"] = True
+                game_state.save_game()
+                game_state.check_theme_unlocks()
+            # A buddy that is not in the collection yet (still being adopted) decays on its own
+            if decay_seconds and not game_state.engine.owns(self.current_pet):
+                try:
+                    self.current_pet.apply_decay(decay_seconds)
+                except Exception:
+                    pass
+                # Report decay to the save scheduler, it coalesces these ticks into occasional writes
+                if self.current_pet.dirty:
+                    self.report_pet_change()
+
+        # Write whatever the save scheduler has due
+        game_state.scheduler.poll()
+        self.publish()
+        return self.seconds_until_next_event(time.time())
+
+    def wait(self, seconds):
+        """Sleep until the next deadline, or until a command or the UI wakes the owner"""
+        self.wakeup.wait(seconds)
+
+    def seconds_until_next_event(self, now):
+        """How long the game loop can sleep before something it handles is due"""
+        deadlines = [MAX_LOOP_SLEEP]
+
+        pet = self.current_pet
+        if pet:
+            # Next visible stat change, bar colour threshold or evolution-ready moment, rounded
+            # up to the decay step that will actually apply it
+            change = pet.seconds_until_visible_change()
+            if change is not None:
+                until_change = self.clock.real_seconds_until(change)
+                if until_change is not None:
+                    deadlines.append(until_change)
+
+            # 22:00 night unlock
+            if not self.game_state.achievements.get("night_play"):
+                local = time.localtime(now)
+                deadlines.append(max(0, (22 - local.tm_hour) * 3600 - local.tm_min * 60 - local.tm_sec))
+
+        # Autosave deadline
+        save_deadline = self.game_state.scheduler.next_deadline()
+        if save_deadline is not None:
+            deadlines.append(save_deadline - self.game_state.scheduler.clock())
+
+        return max(MIN_LOOP_SLEEP, min(deadlines))
+
+    # --- Commands, these run on the owner ---
+
+    def report_pet_change(self, priority=PRIORITY_LOW):
+        """Tell the save scheduler the current buddy changed (stat ticks are low priority)"""
+        if self.current_pet and self.current_pet_id:
+            self.game_state.mark_pet_dirty(self.current_pet_id, self.current_pet, priority)
+
+    def cooling_down(self, action):
+        return self.cooldowns.get(action, 0) > self.clock.source()
+
+    def _care(self, action_type):
+        """Apply a care action and start its cooldown, returns the satisfaction bucks it paid"""
+        self.recorder.action(self.current_pet_id, action_type)
+        bucks = 0
+        if self.current_pet.apply_action(action_type):
+            bucks = self.game_state.award_satisfaction()
+        self.report_pet_change(PRIORITY_NORMAL)
+
+        # Set cooldown (different for each action)
+        self.cooldowns[action_type] = self.clock.source() + ACTION_COOLDOWNS.get(action_type, 5)
+        return bucks
+
+    def perform_action(self, action_type):
+        """Care action on the current buddy, None if it is cooling down, else (daily bonus, satisfaction bucks)"""
+        if not self.current_pet or self.cooling_down(action_type):
+            return None
+
+        # Get daily bonus
+        daily_bonus = self.game_state.get_daily_bonus()
+        if daily_bonus > 0:
+            self.recorder.daily_bonus(daily_bonus)
+        return daily_bonus, self._care(action_type)
+
+    def pet_the_pet(self):
+        """Clicking the buddy, None if it is cooling down, else the satisfaction bucks"""
+        if not self.current_pet or self.cooling_down("pet"):
+            return None
+        return self._care("pet")
+
+    def evolve(self):
+        """Evolve the current buddy, returns the bucks awarded or None"""
+        if not self.current_pet or not self.current_pet.evolution_ready:
+            return None
+        self.recorder.evolve(self.current_pet_id)
+        if not self.current_pet.evolve():
+            return None
+        bucks = self.game_state.award_evolution()
+        # Persist pet immediately after evolution
+        self.report_pet_change(PRIORITY_CRITICAL)
+        return bucks
+
+    def roll(self):
+        """Roll a new buddy to show for adoption, it becomes the current buddy but is not kept yet"""
+        self.current_pet = Buddy()
+        self.current_pet_id = f"{self.current_pet.species}_{int(time.time())}"
+        self.recorder.roll(self.current_pet_id)
+        return self.current_pet_id
+
+    def adopt(self):
+        """Keep the rolled buddy, False if the roll could not be paid for"""
+        if not self.game_state.use_gacha_roll():  # ← CONSUMPTION HAPPENS HERE
+            return False
+        self.recorder.adopt()
+        self.game_state.add_pet_to_collection(self.current_pet_id, self.current_pet)
+        # Write the new buddy out straight away
+        self.game_state.mark_pet_dirty(self.current_pet_id, self.current_pet, PRIORITY_CRITICAL)
+        return True
+
+    def switch(self, pet_id):
+        pet = self.game_state.load_pet(pet_id)
+        if not pet:
+            return False
+        self.recorder.switch(pet_id)
+        self.current_pet = pet
+        self.current_pet_id = pet_id
+        return True
+
+    def add_happiness(self, amount):
+        """Bubble Pop raises happiness directly"""
+        if not self.current_pet:
+            return
+        self.current_pet.happiness = min(100, self.current_pet.happiness + amount)
+        self.recorder.happiness(self.current_pet_id, self.current_pet.happiness)
+        self.report_pet_change()
+
+    def bubble_earn(self, amount):
+        """Bubble Pop payout, returns True if it unlocked Bubble Master"""
+        self.recorder.bubble_earn(amount)
+        # Record achievement progress for bubble pop
+        unlocked = False
+        try:
+            unlocked = self.game_state.record_bubble_earn(amount)
+        except Exception:
+            pass
+        # Apply bucks (record_bubble_earn may already add reward money)
+        # Use earn_bucks to keep centralized behavior
+        try:
+            self.game_state.earn_bucks(amount)
+        except Exception:
+            # Fallback direct credit
+            self.game_state.buddy_bucks += amount
+        return unlocked
+
+    def earn(self, amount):
+        self.recorder.earn(amount)
+        self.game_state.buddy_bucks += amount
+        try:
+            self.game_state.force_save()
+        except Exception:
+            self.game_state.save_game()
+
+    def buy_roll(self):
+        if self.game_state.buddy_bucks < 50:
+            return False
+        self.recorder.buy_roll()
+        self.game_state.buddy_bucks -= 50
+        self.game_state.gacha_rolls += 1
+        self.game_state.save_game(PRIORITY_CRITICAL)
+        return True
+
+    def claim(self, aid):
+        self.recorder.claim(aid)
+        return self.game_state.claim_achievement(aid)
+
+    def set_theme(self, theme_name):
+        if theme_name not in self.game_state.unlocked_themes:
+            return False
+        self.game_state.current_theme = theme_name
+        self.game_state.save_game()
+        return True
+
+    def collection_size(self):
+        return len(self.game_state.pet_collection)
+
+    def collection_page(self, start, count):
+        """One page of (pet_id, summary) pairs for the collection windows, and the collection size"""
+        return self.game_state.get_collection_summaries(start, count), len(self.game_state.pet_collection)
+
+    def achievement_rows(self):
+        """(id, definition, state, current metric value) per achievement, copied for the UI"""
+        game_state = self.game_state
+        rows = []
+        for aid, meta in game_state.ACHIEVEMENT_DEFS.items():
+            state = dict(game_state.achievement_state.get(aid, {"unlocked": False, "claimed": False}))
+            rows.append((aid, dict(meta), state, game_state.achievements.get(meta.get("metric"), 0)))
+        return rows
+
+    def flush(self):
+        self.game_state.scheduler.flush()
+        return True
@@ -0,0 +1,85 @@
+# game_clock.py - The one place game time comes from
+
+import math
+import os
+import time
+
+DEFAULT_STEP = 2.0          # Game seconds per fixed decay step
+DEFAULT_MAX_CATCH_UP = 120.0  # Real seconds a single tick may cover, anything beyond is dropped
+DEV_DILATION = 30.0         # Dev mode: a normal evolution takes a few seconds instead of minutes
+
+
+def _env_dilation():
+    try:
+        return max(0.0, float(os.getenv("BUDDY_TIME_DILATION", 1.0)))
+    except ValueError:
+        return 1.0
+
+
+class GameClock:
+    """
+    Turns real time into game time in fixed steps.
+
+    Real time comes from time.monotonic(), so wall clock changes (NTP, the user changing the
+    time) never produce negative or huge deltas. Every tick() returns the real seconds since
+    the last tick (for cooldowns) and the game seconds to apply (for decay and evolution).
+    Game time runs `dilation` times faster than real time and is handed out in whole `step`
+    sized chunks. A gap longer than `max_catch_up` real seconds, e.g. the process being
+    stopped in a debugger, only counts as `max_catch_up`.
+    """
+
+    def __init__(self, step=DEFAULT_STEP, dilation=None, max_catch_up=DEFAULT_MAX_CATCH_UP, source=time.monotonic):
+        self.step = step
+        self.dilation = _env_dilation() if dilation is None else dilation
+        self.max_catch_up = max_catch_up
+        self.source = source
+        self._last = source()
+        self._accum = 0.0  # Game seconds not handed out yet
+
+        # Counters
+        self.ticks = 0
+        self.game_seconds = 0.0
+        self.dropped_seconds = 0.0
+
+    def tick(self):
+        """Return (real_elapsed, game_seconds) since the last tick, game_seconds is a multiple of step"""
+        now = self.source()
+        real_elapsed = max(0.0, now - self._last)
+        self._last = now
+        return self.advance(real_elapsed)
+
+    def advance(self, real_elapsed):
+        """Move the clock by real_elapsed seconds by hand (the headless simulator has no real time)"""
+        if real_elapsed > self.max_catch_up:
+            self.dropped_seconds += real_elapsed - self.max_catch_up
+            real_elapsed = self.max_catch_up
+        self.ticks += 1
+        self._accum += real_elapsed * self.dilation
+        if self._accum < self.step:
+            return real_elapsed, 0.0
+        steps = int(self._accum // self.step)
+        game_seconds = steps * self.step
+        self._accum -= game_seconds
+        self.game_seconds += game_seconds
+        return real_elapsed, game_seconds
+
+    def set_dilation(self, dilation):
+        """Change how fast game time runs, time already accumulated is kept"""
+        self.dilation = max(0.0, dilation)
+
+    def real_seconds_until(self, game_seconds):
+        """Real seconds until the step that hands out `game_seconds` more game time, None if time is frozen"""
+        if self.dilation <= 0:
+            return None
+        until_step = self.step - self._accum
+        # Every step hands out a whole `step` of game time, the first one included
+        extra_steps = max(0, math.ceil(game_seconds / self.step) - 1)
+        return (until_step + extra_steps * self.step) / self.dilation
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "dilation": self.dilation,
+            "game_seconds": self.game_seconds,
+            "dropped_seconds": self.dropped_seconds
+        }
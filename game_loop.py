@@ -0,0 +1,211 @@
+# game_loop.py - What drives GameActor.step(): its own thread, Tk's after() or an asyncio loop
+#
+#   BUDDY_LOOP=thread   a background thread owns the game state (default)
+#   BUDDY_LOOP=tk       steps run on the Tk thread from root.after(), no extra thread at all
+#   BUDDY_LOOP=asyncio  steps run in an asyncio task, the asyncio loop is pumped from root.after()
+#
+# All three sleep until the actor's next deadline or until something wakes them, and stop()
+# always returns with the loop finished and the actor handed back to the calling thread, so
+# the final save that follows it cannot race a step.
+
+import asyncio
+import os
+import threading
+
+LOOP_MODES = ("thread", "tk", "asyncio")
+DEFAULT_MODE = "thread"
+# How often Tk lets the asyncio loop run its ready callbacks and timers
+ASYNCIO_PUMP_MS = 20
+
+
+def loop_mode_from_env():
+    mode = os.getenv("BUDDY_LOOP", DEFAULT_MODE).strip().lower()
+    if mode not in LOOP_MODES:
+        print(f"Unknown BUDDY_LOOP '{mode}', using '{DEFAULT_MODE}'")
+        return DEFAULT_MODE
+    return mode
+
+
+def make_loop(mode, actor, root):
+    """Loop driver for `mode` (one of LOOP_MODES)"""
+    if mode == "tk":
+        return TkLoop(actor, root)
+    if mode == "asyncio":
+        return AsyncioLoop(actor, root)
+    return ThreadLoop(actor)
+
+
+class ThreadLoop:
+    """The actor's owner is a background thread that sleeps on the actor's wakeup event"""
+
+    mode = "thread"
+
+    def __init__(self, actor):
+        self.actor = actor
+        self.running = False
+        self.thread = None
+        self._owned = None
+
+    def start(self):
+        self.running = True
+        self._owned = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="game-loop", daemon=True)
+        self.thread.start()
+        # Until the thread owns the actor, call() would still run commands on this thread
+        self._owned.wait()
+
+    def wake(self):
+        self.actor.wakeup.set()
+
+    def _run(self):
+        # Take ownership before the first step
+        self.actor.start()
+        self._owned.set()
+        try:
+            while self.running:
+                try:
+                    delay = self.actor.step()
+                except Exception as e:
+                    print(f"Error in game loop: {e}")
+                    delay = 1.0
+                # Sleep until the next deadline, or until a command wakes us
+                self.actor.wait(delay)
+        finally:
+            # Anything queued while stopping still runs, later calls run on the caller
+            self.actor.stop()
+
+    def stop(self, timeout=5.0):
+        """Stop and join the loop thread, False if it did not finish in time"""
+        self.running = False
+        self.wake()
+        if self.thread is None:
+            return True
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            print(f"Game loop did not stop within {timeout:g}s")
+            return False
+        return True
+
+
+class TkLoop:
+    """Steps run on the Tk thread from root.after(), the Tk thread is the actor's owner"""
+
+    mode = "tk"
+
+    def __init__(self, actor, root):
+        self.actor = actor
+        self.root = root
+        self.running = False
+        self._after_id = None
+        self._woken = False
+
+    def start(self):
+        self.running = True
+        self.actor.start()
+        # Commands run inline on the Tk thread, they only need the next step moved up
+        self.actor.waker = self.wake
+        self._schedule(0)
+
+    def _schedule(self, seconds):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(max(0, int(seconds * 1000)), self._step)
+
+    def wake(self):
+        if self.running and not self._woken:
+            self._woken = True
+            self._schedule(0)
+
+    def _step(self):
+        self._after_id = None
+        self._woken = False
+        if not self.running:
+            return
+        try:
+            delay = self.actor.step()
+        except Exception as e:
+            print(f"Error in game loop: {e}")
+            delay = 1.0
+        if self.running and self._after_id is None:
+            self._schedule(delay)
+
+    def stop(self, timeout=5.0):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self.actor.waker = None
+        self.actor.stop()
+        return True
+
+
+class AsyncioLoop:
+    """Steps run in an asyncio task on the Tk thread, Tk pumps the asyncio loop every few ms"""
+
+    mode = "asyncio"
+
+    def __init__(self, actor, root, pump_ms=ASYNCIO_PUMP_MS):
+        self.actor = actor
+        self.root = root
+        self.pump_ms = pump_ms
+        self.loop = asyncio.new_event_loop()
+        self.task = None
+        self._wakeup = None
+        self._pump_id = None
+
+    def start(self):
+        self.actor.start()
+        self.actor.waker = self.wake
+        self.task = self.loop.create_task(self._run())
+        self._pump()
+
+    def wake(self):
+        if self._wakeup is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self):
+        # Made here so it belongs to this loop on every Python version
+        self._wakeup = asyncio.Event()
+        while True:
+            # Cleared before the step, a wake during it makes the wait below return at once
+            self._wakeup.clear()
+            try:
+                delay = self.actor.step()
+            except Exception as e:
+                print(f"Error in game loop: {e}")
+                delay = 1.0
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _run_ready(self):
+        """Run whatever the asyncio loop has ready right now, then hand control back to Tk"""
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+    def _pump(self):
+        self._pump_id = None
+        self._run_ready()
+        if self.task is not None and not self.task.done():
+            self._pump_id = self.root.after(self.pump_ms, self._pump)
+
+    def stop(self, timeout=5.0):
+        if self._pump_id is not None:
+            try:
+                self.root.after_cancel(self._pump_id)
+            except Exception:
+                pass
+            self._pump_id = None
+        if self.task is not None:
+            self.task.cancel()
+            # A cancelled task finishes on its next turn
+            while not self.task.done():
+                self._run_ready()
+        self.actor.waker = None
+        self.actor.stop()
+        self.loop.close()
+        return True
@@ -1,18 +1,36 @@
-import json
-import os
+import copy
 import time
 from datetime import datetime, date
 from pets import Buddy
+from collection_engine import CollectionEngine
+from save_store import open_store
+from persistence import PersistenceWorker
+from autosave import SaveScheduler, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_CRITICAL
 
+# Created by the save store the first time it is opened
 SAVE_DIR = "saves"
-os.makedirs(SAVE_DIR, exist_ok=True)
 
 class GameState:
-    def __init__(self):
+    # Buddy Bucks paid out for evolving a pet and for filling its satisfaction meter
+    EVOLUTION_REWARD = 100
+    SATISFACTION_REWARD = 30
+
+    def __init__(self, store=None, background_saves=True):
+        # Journal store by default, BUDDY_SAVE_BACKEND=sqlite switches to the SQLite store
+        self.store = store if store is not None else open_store(SAVE_DIR)
+        # Saves are snapshotted on the calling thread and written by this worker
+        self.worker = PersistenceWorker() if background_saves else None
+        # Decides when reported changes actually get written
+        self.scheduler = SaveScheduler()
+        # Every owned buddy, stats kept in columns so the whole collection decays in one step
+        self.engine = CollectionEngine()
         self.buddy_bucks = 50  # Starting currency
         self.gacha_rolls = 1    # Starting with 1 free roll
         self.unlocked_themes = ["forest"]  # Default theme for the game
         self.pet_collection = []  # List of pets
+        # pet_id -> Buddy.get_summary(), lets the collection windows list pets without loading them.
+        # Rebuilt from the pet records on load, it is never part of the game save
+        self.collection_index = {}
         self.last_daily_bonus = None
         self.achievements = {
             "evolved_pets": 0,
@@ -50,20 +68,16 @@ class GameState:
         }
         
         self.current_theme = "forest"
-        self.last_save_time = 0
         
         # Load saved game if it exists
         self.load_game()
     
     def load_game(self):
-        """Load game state from file"""
-        save_path = os.path.join(SAVE_DIR, "game_state.json")
+        """Load game state from the save store"""
+        data = self.store.load_game()
         
-        if os.path.exists(save_path):
+        if data:
             try:
-                with open(save_path, "r") as f:
-                    data = json.load(f)
-                
                 self.buddy_bucks = data.get("buddy_bucks", 50)
                 self.gacha_rolls = data.get("gacha_rolls", 1)
                 self.unlocked_themes = data.get("unlocked_themes", ["forest"])
@@ -75,56 +89,70 @@ class GameState:
                 self.current_theme = data.get("current_theme", "forest")
             except Exception as e:
                 print(f"Error loading game state: {e}")
+
+        # Load the whole collection into the engine, every buddy ages while you play. The
+        # summaries come from the same pet records, so each one is saved with its own pet
+        for pet_id, buddy in self.load_pets(self.pet_collection):
+            self.engine.attach(pet_id, buddy)
+            self.collection_index[pet_id] = buddy.get_summary()
         
         # Unlock themes based on achievements
         self.check_achievements()
         self.check_theme_unlocks()
     
-    def save_game(self):
-        """Save game state to file"""
-        # Only save every 60 seconds to avoid excessive writing 
-        if time.time() - self.last_save_time < 60:
-            return
-        
-        self.last_save_time = time.time()
-        save_path = os.path.join(SAVE_DIR, "game_state.json")
-        
-        data = {
+    def get_save_data(self):
+        """Collect the game state that gets persisted, copied deep enough that later changes do not reach it"""
+        return {
             "buddy_bucks": self.buddy_bucks,
             "gacha_rolls": self.gacha_rolls,
-            "unlocked_themes": self.unlocked_themes,
-            "pet_collection": self.pet_collection,
+            "unlocked_themes": list(self.unlocked_themes),
+            "pet_collection": list(self.pet_collection),
             "last_daily_bonus": self.last_daily_bonus,
-            "achievements": self.achievements,
-            "achievement_state": self.achievement_state,
+            "achievements": dict(self.achievements),
+            "achievement_state": {aid: dict(state) for aid, state in self.achievement_state.items()},
             "current_theme": self.current_theme
         }
-        
+
+    def save_game(self, priority=PRIORITY_NORMAL):
+        """Report that the game state changed, the save scheduler decides when it is written"""
+        self.scheduler.mark("game", self._write_game, priority=priority)
+
+    def force_save(self):
+        """Write the game state straight away, bypassing the scheduler's debounce"""
+        self.save_game(PRIORITY_CRITICAL)
+
+    def _write_game(self):
+        """Snapshot the game state and send it to the store (only the changed fields are journaled)"""
         try:
-            with open(save_path, "w") as f:
-                json.dump(data, f, indent=2)
+            self._persist("game", self.store.save_game, self.get_save_data())
         except Exception as e:
             print(f"Error saving game state: {e}")
 
-    def force_save(self):
-        """Forcefully save game state to file, bypassing throttle."""
-        self.last_save_time = time.time()
-        save_path = os.path.join(SAVE_DIR, "game_state.json")
-        data = {
-            "buddy_bucks": self.buddy_bucks,
-            "gacha_rolls": self.gacha_rolls,
-            "unlocked_themes": self.unlocked_themes,
-            "pet_collection": self.pet_collection,
-            "last_daily_bonus": self.last_daily_bonus,
-            "achievements": self.achievements,
-            "achievement_state": self.achievement_state,
-            "current_theme": self.current_theme
-        }
+    def _persist(self, key, write_fn, *args):
+        """Hand a snapshot to the background writer, or write it inline when there is none"""
+        if self.worker is None:
+            return write_fn(*args)
+        self.worker.submit(key, write_fn, *args)
+        return True
+
+    def flush(self, timeout=None):
+        """Wait for queued saves to reach the store, returns False if the timeout ran out"""
+        if self.worker is None:
+            return True
+        return self.worker.flush(timeout)
+
+    def close(self, timeout=5.0):
+        """Save everything and fold the journal into a snapshot before exiting"""
+        self.scheduler.flush()
+        self._write_game()
+        if not self.flush(timeout):
+            print("Warning: not all saves were written before closing")
+        if self.worker is not None:
+            self.worker.stop(timeout)
         try:
-            with open(save_path, "w") as f:
-                json.dump(data, f, indent=2)
+            self.store.close()
         except Exception as e:
-            print(f"Error force-saving game state: {e}")
+            print(f"Error closing save store: {e}")
     
     def has_gacha_roll(self):
         """Check if player can adopt a new pet"""
@@ -134,22 +162,25 @@ class GameState:
         """Consume a gacha roll ticket when adopting a pet"""
         if self.gacha_rolls > 0:
             self.gacha_rolls -= 1
-            self.save_game()
+            self.save_game(PRIORITY_CRITICAL)
             return True
         elif self.buddy_bucks >= 50:
             self.buddy_bucks -= 50
-            self.save_game()
+            self.save_game(PRIORITY_CRITICAL)
             return True
         return False
     
-    def add_pet_to_collection(self, buddy_id):
+    def add_pet_to_collection(self, buddy_id, buddy=None):
         """Add a pet to the collection"""
+        if buddy is not None:
+            self.collection_index[buddy_id] = buddy.get_summary()
+            self.engine.attach(buddy_id, buddy)
         if buddy_id not in self.pet_collection:
             self.pet_collection.append(buddy_id)
             # Re-check achievements that depend on pet count
             self.check_achievements()
             self.check_theme_unlocks()
-            self.save_game()
+            self.save_game(PRIORITY_CRITICAL)
     
     def get_daily_bonus(self):
         """Award daily login bonus"""
@@ -255,10 +286,7 @@ class GameState:
 
         if changed:
             # Persist achievement state and unlock themes
-            try:
-                self.force_save()
-            except Exception:
-                self.save_game()
+            self.save_game()
             # Unlock any themes that depend on newly unlocked achievements
             try:
                 self.check_theme_unlocks()
@@ -286,53 +314,152 @@ class GameState:
             print(f"Error claiming achievement {aid}: {e}")
             return None
     
-    def get_pet_save_path(self, pet_id):
-        """Get save path for a specific pet"""
-        return os.path.join(SAVE_DIR, f"pet_{pet_id}.json")
-    
+    def mark_pet_dirty(self, pet_id, buddy, priority=PRIORITY_LOW):
+        """Report that a pet changed, the save scheduler decides when it is written"""
+        self.scheduler.mark(("pet", pet_id), self.save_pet, pet_id, buddy, priority=priority)
+
     def save_pet(self, pet_id, buddy):
-        """Save individual pet data"""
-        save_path = self.get_pet_save_path(pet_id)
+        """Save individual pet data now, returns True if the write succeeded"""
+        # Cleared before the snapshot so changes made while it is being written are not lost
+        buddy.mark_clean()
         try:
-            with open(save_path, "w") as f:
-                json.dump({
-                    "pet_data": buddy.to_dict(),
-                    "last_saved": time.time()
-                }, f, indent=2)
+            saved = self._persist(("pet", pet_id), self.store.save_pet, pet_id, copy.deepcopy(buddy.to_dict()))
         except Exception as e:
             print(f"Error saving pet {pet_id}: {e}")
+            return False
+        self.update_collection_index(pet_id, buddy)
+        return saved
+
+    def decay_collection(self, elapsed_seconds):
+        """Decay every pet in the collection and schedule the changed ones to be written"""
+        if not len(self.engine):
+            return
+        self.engine.step(elapsed_seconds)
+        self.scheduler.mark("collection", self._write_collection, priority=PRIORITY_LOW)
+
+    def _write_collection(self):
+        """Write every collection pet that changed since it was last saved, in one batch"""
+        pets = self.engine.dirty_pets()
+        if pets:
+            self.save_pets(pets)
+
+    def update_collection_index(self, pet_id, buddy):
+        """Refresh a pet's collection summary, returns True if it changed"""
+        if pet_id not in self.pet_collection:
+            return False
+        summary = buddy.get_summary()
+        if self.collection_index.get(pet_id) == summary:
+            return False
+        self.collection_index[pet_id] = summary
+        return True
+
+    def get_collection_summaries(self, start=0, count=None):
+        """Return (pet_id, summary) pairs in collection order straight from the index, optionally just a slice"""
+        pet_ids = self.pet_collection if start == 0 and count is None else self.pet_collection[start:None if count is None else start + count]
+        return [(pet_id, self.collection_index[pet_id]) for pet_id in pet_ids if pet_id in self.collection_index]
     
+    def _queued_pet_data(self, pet_ids):
+        """Pet data that was saved but is still waiting in the background writer"""
+        if self.worker is None:
+            return {}
+        queued = {}
+        wanted = set(pet_ids)
+        # Oldest first, so newer snapshots overwrite older ones
+        for key, args in self.worker.pending_snapshots():
+            if key[0] == "pet" and key[1] in wanted:
+                queued[key[1]] = args[1]
+            elif key[0] == "pets":
+                queued.update((pet_id, data) for pet_id, data in args[0].items() if pet_id in wanted)
+        return queued
+
+    def _buddy_from_record(self, record):
+        """Build a Buddy from a stored record and catch it up on the time since it was saved"""
+        buddy = Buddy(from_data=record["pet_data"])
+        last_saved = record.get("last_saved")
+        if last_saved:
+            buddy.catch_up(time.time() - last_saved)
+        return buddy
+
     def load_pet(self, pet_id):
         """Load individual pet data"""
-        save_path = self.get_pet_save_path(pet_id)
-        
-        if not os.path.exists(save_path):
-            return None
-        
         try:
-            with open(save_path, "r") as f:
-                data = json.load(f)
-            return Buddy(from_data=data["pet_data"])
+            # Collection pets are already in memory and up to date
+            buddy = self.engine.get(pet_id)
+            if buddy is not None:
+                return buddy
+            # A change still waiting in the scheduler has to reach the writer first
+            self.scheduler.flush(("pet", pet_id))
+            queued = self._queued_pet_data([pet_id])
+            if pet_id in queued:
+                return Buddy(from_data=queued[pet_id])
+            data = self.store.load_pet(pet_id)
+            if data is None:
+                return None
+            return self._buddy_from_record(data)
         except Exception as e:
             print(f"Error loading pet {pet_id}: {e}")
             return None
+
+    def load_pets(self, pet_ids):
+        """Load several pets with one store read, returns (pet_id, Buddy) pairs in the given order"""
+        try:
+            # Collection pets are already in memory, only read the rest
+            to_read = [pet_id for pet_id in pet_ids if pet_id not in self.engine]
+            for pet_id in to_read:
+                self.scheduler.flush(("pet", pet_id))
+            records = self.store.load_pets(to_read) if to_read else {}
+            for pet_id, data in self._queued_pet_data(to_read).items():
+                records[pet_id] = {"pet_data": data}
+        except Exception as e:
+            print(f"Error loading pets: {e}")
+            return []
+
+        pets = []
+        for pet_id in pet_ids:
+            buddy = self.engine.get(pet_id)
+            if buddy is not None:
+                pets.append((pet_id, buddy))
+                continue
+            record = records.get(pet_id)
+            if record is None:
+                continue
+            try:
+                pets.append((pet_id, self._buddy_from_record(record)))
+            except Exception as e:
+                print(f"Error loading pet {pet_id}: {e}")
+        return pets
+
+    def save_pets(self, pets):
+        """Save several (pet_id, Buddy) pairs in one transaction"""
+        # Cleared before the snapshot, same as save_pet
+        for _, buddy in pets:
+            buddy.mark_clean()
+        try:
+            snapshot = {pet_id: copy.deepcopy(buddy.to_dict()) for pet_id, buddy in pets}
+            saved = self._persist(("pets", tuple(snapshot)), self.store.save_pets, snapshot)
+        except Exception as e:
+            print(f"Error saving pets: {e}")
+            return False
+        for pet_id, buddy in pets:
+            self.update_collection_index(pet_id, buddy)
+        return saved
     
     def award_evolution(self):
         """Award bonuses for evolution"""
-        self.buddy_bucks += 100
+        self.buddy_bucks += self.EVOLUTION_REWARD
         self.achievements["evolved_pets"] += 1
         # Check achievements and theme unlocks for awarding evolution
         self.check_achievements()
         self.check_theme_unlocks()
-        self.save_game()
-        return 100
+        self.save_game(PRIORITY_CRITICAL)
+        return self.EVOLUTION_REWARD
     
     def award_satisfaction(self):
         """Award bonuses for satisfaction"""
-        self.buddy_bucks += 30
+        self.buddy_bucks += self.SATISFACTION_REWARD
         self.achievements["satisfaction_rewards"] += 1
         # Check achievements and theme unlocks for awardiing satisfaction
         self.check_achievements()
         self.check_theme_unlocks()
         self.save_game()
-        return 30
\ No newline at end of file
+        return self.SATISFACTION_REWARD
\ No newline at end of file
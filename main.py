@@ -1,15 +1,25 @@
 import tkinter as tk
+import os
 from tkinter import ttk, messagebox
-import threading
 import time
-import json
-import os
-import random
-from pets import Buddy
+from pets import format_personality, render_art
 from game_state import GameState
+from game_clock import GameClock, DEV_DILATION
+from game_actor import GameActor
+from game_loop import make_loop, loop_mode_from_env
 import mini_games
+from replay import SessionRecorder
+from ui_bindings import WidgetBinder, ThemeRegistry, RefreshPoller
+from batch_loader import BatchLoader
+from virtual_list import VirtualList
+from animation import AnimationTimeline, GachaSpin
 from assets import THEMES, RARITY_DEFINITIONS
 
+# Row heights of the virtual lists in the Switch Buddy, Collection and Achievements windows
+SWITCH_ROW_HEIGHT = 34
+COLLECTION_ROW_HEIGHT = 72
+ACHIEVEMENT_ROW_HEIGHT = 132
+
 class MyLittleBuddyApp:
     def __init__(self, root):
         self.root = root
@@ -24,13 +34,16 @@ class MyLittleBuddyApp:
         
         # Game state
         self.game_state = GameState()
-        self.current_pet = None
-        self.current_pet_id = None
+        # Session log for bug reports and replays, only records when BUDDY_RECORD is set
+        self.recorder = SessionRecorder.from_env(self.game_state)
         self.running = True
-        self.action_cooldown = 0
-        self.action_cooldowns = {}  # Track individual action cooldowns
-        # Accumulator to apply decay in discrete intervals
-        self._decay_accum = 0.0
+        # Game time for decay, evolution and cooldowns, dev mode speeds it up
+        self.clock = GameClock()
+        # Owns the game state, the current buddy and the cooldowns. The Tk side only reads
+        # self.actor.snapshot and changes things through self.actor.call()
+        self.actor = GameActor(self.game_state, self.recorder, self.clock)
+        # What runs the actor: a thread, Tk's after() or asyncio, picked with BUDDY_LOOP
+        self.loop = make_loop(loop_mode_from_env(), self.actor, self.root)
 
         # Secret dev-mode spacebar counter, press spacebar 8 times to enable 
         self._space_count = 0
@@ -44,6 +57,17 @@ class MyLittleBuddyApp:
         self.bars = {}
         self.bar_labels = {}
         self.mini_game_instance = None
+        # Skips widget updates that would not change anything on screen
+        self.binder = WidgetBinder()
+        # Main screen widgets coloured by the theme, recoloured in place on theme change
+        self.themed = ThemeRegistry(self.binder)
+        self.pet_name_label = None
+        # Redraws from the Tk side when the actor publishes a new snapshot, the loop thread never calls into Tk
+        self.ui_refresh = RefreshPoller(self.root, lambda: self.actor.snapshot.version, self.update_ui_from_loop)
+        # Blink and breathing of the buddy on screen, ticks on its own after() timer
+        self.animation = AnimationTimeline(self.root, self.update_pet_display)
+        # Running gacha spin on the adoption screen, if any
+        self.gacha_spin = None
         
         # Setup UI
         self.setup_styles()
@@ -67,8 +91,10 @@ class MyLittleBuddyApp:
         # Show adoption screen after a brief delay to ensure window is ready
         self.root.after(100, self.show_adoption_screen)
         
-        # Start game loop
-        self.start_game_loop()
+        # Start game loop, the UI refresh and the idle animation
+        self.loop.start()
+        self.ui_refresh.start()
+        self.animation.start()
     
     def setup_styles(self):
         """Configure Tkinter"""
@@ -99,6 +125,7 @@ class MyLittleBuddyApp:
         self.shop_menu = shop_menu
         shop_menu.add_command(label="Buy Gacha Roll (50 💰)", command=self.buy_gacha_roll)
         shop_menu.add_command(label="Achievements", command=self.view_achievements)
+        shop_menu.add_command(label="Collection", command=self.view_collection)
         menubar.add_cascade(label="Shop", menu=shop_menu)
         
         # Games menu
@@ -125,7 +152,7 @@ class MyLittleBuddyApp:
             except Exception:
                 pass
 
-            unlocked = getattr(self.game_state, "unlocked_themes", ["forest"]) if self.game_state else ["forest"]
+            unlocked = self.actor.snapshot.unlocked_themes
             for theme in THEMES.keys():
                 label = f"{theme.title()} Theme"
                 state = "normal" if theme in unlocked else "disabled"
@@ -155,11 +182,10 @@ class MyLittleBuddyApp:
     
     def change_theme(self, theme_name):
         """Change application theme"""
-        if theme_name not in getattr(self.game_state, "unlocked_themes", ["forest"]):
+        if not self.actor.call(self.actor.set_theme, theme_name):
             messagebox.showinfo("🔒 Theme Locked", f"You need to unlock the {theme_name.title()} theme first!")
             return
         
-        self.game_state.current_theme = theme_name
         theme = THEMES[theme_name]
         
         # Update window background
@@ -172,7 +198,7 @@ class MyLittleBuddyApp:
         style.configure("Medium.Horizontal.TProgressbar", background="#f39c12")
         style.configure("High.Horizontal.TProgressbar", background="#2ecc71")
         
-        # Refresh UI
+        # Recolour the existing UI
         if self.main_frame and self.main_frame.winfo_exists():
             self.refresh_ui()
     
@@ -181,9 +207,6 @@ class MyLittleBuddyApp:
         # Prevent reopening if adoption screen is already visible
         if hasattr(self, 'adoption_frame') and self.adoption_frame and getattr(self.adoption_frame, 'winfo_exists', lambda: False)():
             return
-        # Clean up existing UI
-        if self.main_frame and self.main_frame.winfo_exists():
-            self.main_frame.destroy()
         if self.mini_game_instance:
             try:
                 self.mini_game_instance.on_close()
@@ -191,14 +214,19 @@ class MyLittleBuddyApp:
                 pass
 
         # ONLY CHECK rolls, DO NOT CONSUME ANY ROLLS 
-        if not self.game_state.has_gacha_roll():
+        snapshot = self.actor.snapshot
+        if snapshot.gacha_rolls <= 0 and snapshot.buddy_bucks < 50:
             messagebox.showwarning(
                 "🎟️ No Rolls!",
-                f"You need 50 Buddy Bucks!\nYou have: {self.game_state.buddy_bucks} 💰"
+                f"You need 50 Buddy Bucks!\nYou have: {snapshot.buddy_bucks} 💰"
             )
             return
 
-        adoption_frame = tk.Frame(self.root, bg=THEMES[self.game_state.current_theme]["bg"])
+        # Hide the main UI, it comes back as is after adopting
+        if self.main_frame and self.main_frame.winfo_exists():
+            self.main_frame.pack_forget()
+
+        adoption_frame = tk.Frame(self.root, bg=THEMES[self.actor.snapshot.current_theme]["bg"])
         adoption_frame.pack(expand=True, fill="both")
 
         # Disable the Adopt menu item while on the adoption screen
@@ -212,17 +240,17 @@ class MyLittleBuddyApp:
 
         tk.Label(adoption_frame, text="✨ Adopt Your Little Buddy! ✨", 
                  font=("Comic Sans MS", 20, "bold"),
-                 bg=THEMES[self.game_state.current_theme]["bg"],
-                 fg=THEMES[self.game_state.current_theme]["fg"]).pack(pady=30)
+                 bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+                 fg=THEMES[self.actor.snapshot.current_theme]["fg"]).pack(pady=30)
 
         # Show starting currency
-        info_text = f"Starting with {self.game_state.buddy_bucks} 💰 and {self.game_state.gacha_rolls} 🎟️"
-        tk.Label(adoption_frame, text=info_text, bg=THEMES[self.game_state.current_theme]["bg"],
-                 fg=THEMES[self.game_state.current_theme]["fg"]).pack(pady=5)
+        info_text = f"Starting with {snapshot.buddy_bucks} 💰 and {snapshot.gacha_rolls} 🎟️"
+        tk.Label(adoption_frame, text=info_text, bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+                 fg=THEMES[self.actor.snapshot.current_theme]["fg"]).pack(pady=5)
 
         adopt_button = tk.Button(adoption_frame, text="🎲 Gacha Adopt!", 
                                  font=("Courier", 14, "bold"),
-                                 bg=THEMES[self.game_state.current_theme]["button_bg"],
+                                 bg=THEMES[self.actor.snapshot.current_theme]["button_bg"],
                                  width=18, height=2,
                                  command=lambda: self.adopt_new_buddy(adoption_frame, adopt_button))
         adopt_button.pack(pady=30)
@@ -230,41 +258,55 @@ class MyLittleBuddyApp:
         self.adoption_frame = adoption_frame
         self.preview_label = tk.Label(adoption_frame, text="", 
                                       font=("Courier New", 10, "bold"),
-                                      bg=THEMES[self.game_state.current_theme]["bg"],
-                                      fg=THEMES[self.game_state.current_theme]["fg"])
+                                      bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+                                      fg=THEMES[self.actor.snapshot.current_theme]["fg"])
         self.preview_label.pack(pady=10, padx=20)
 
         self.name_label = tk.Label(adoption_frame, text="", 
-                                   bg=THEMES[self.game_state.current_theme]["bg"],
-                                   fg=THEMES[self.game_state.current_theme]["fg"])
+                                   bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+                                   fg=THEMES[self.actor.snapshot.current_theme]["fg"])
         self.name_label.pack()
     
     def adopt_new_buddy(self, adoption_frame, adopt_button):
         """Handle new buddy adoption (preview first, consume on confirm)"""
+        if self.gacha_spin and self.gacha_spin.running:
+            return
         adopt_button.config(state="disabled", text="Spinning...")
-        self.root.update()
-        time.sleep(1.0)
 
-        # CREATE PET (NO ROLL CONSUMED YET)
-        self.current_pet = Buddy()
-        self.current_pet_id = f"{self.current_pet.species}_{int(time.time())}"
+        # CREATE PET (NO ROLL CONSUMED YET), the spin below is only for show
+        if self.actor.call(self.actor.roll) is None:
+            adopt_button.config(state="normal", text="🎲 Gacha Adopt!")
+            return
+        pet = self.actor.snapshot.pet
+
+        def show(frame):
+            if self.preview_label.winfo_exists():
+                self.preview_label.config(text=frame)
+
+        self.gacha_spin = GachaSpin(self.root, show,
+                                    lambda: self.reveal_adoption(adoption_frame, pet))
+        self.gacha_spin.start()
+
+    def reveal_adoption(self, adoption_frame, pet):
+        """End of the gacha spin, show the rolled buddy and offer to keep it"""
+        self.gacha_spin = None
+        if not adoption_frame.winfo_exists():
+            return
 
         # SHOW PREVIEW
-        art = self.current_pet.get_ascii_art(self.game_state.current_theme)
+        art = render_art(pet)
         self.preview_label.config(text=art)
 
-        rarity_color = RARITY_DEFINITIONS[self.current_pet.rarity]["color"]
+        rarity_color = RARITY_DEFINITIONS[pet.rarity]["color"]
         self.name_label.config(
-            text=f"{self.current_pet.species.title()} ({self.current_pet.rarity.title()})\n"
-                 f"Personality: {self.current_pet.get_personality_display()}",
+            text=f"{pet.species.title()} ({pet.rarity.title()})\n"
+                 f"Personality: {format_personality(pet.personality)}",
             fg=rarity_color
         )
 
         # ONLY CONSUME ROLL WHEN PLAYER CONFIRMS
         def confirm_adoption():
-            if self.game_state.use_gacha_roll():  # ← CONSUMPTION HAPPENS HERE
-                self.game_state.add_pet_to_collection(self.current_pet_id)
-                self.game_state.save_pet(self.current_pet_id, self.current_pet)
+            if self.actor.call(self.actor.adopt):
                 self.start_main_ui(adoption_frame)
             else:
                 messagebox.showerror("🎫 Roll Failed!", "Not enough resources!")
@@ -283,37 +325,59 @@ class MyLittleBuddyApp:
         self.setup_main_ui()
     
     def setup_main_ui(self):
-        """Create main game interface"""
-        theme = THEMES[self.game_state.current_theme]
+        """Show the main game interface, it is built the first time and reused after that"""
+        if not (self.main_frame and self.main_frame.winfo_exists()):
+            self.build_main_ui()
+        if not self.main_frame.winfo_manager():
+            self.main_frame.pack(expand=True, fill="both", padx=10, pady=10)
+        
+        # Point the existing widgets at the current pet
+        self.bind_current_pet()
+        # Update dev badge if needed
+        try:
+            self._update_dev_badge()
+        except Exception:
+            pass
+        # Reenable Adopt menu item when returning to main UI
+        try:
+            if hasattr(self, 'buddy_menu'):
+                self.buddy_menu.entryconfig("Adopt New Buddy", state="normal")
+        except Exception:
+            pass
+    
+    def build_main_ui(self):
+        """Create the main game widgets, once. Theme colours come from self.themed"""
+        snapshot = self.actor.snapshot
+        theme = THEMES[snapshot.current_theme]
+        themed = self.themed.register
         
         # Main frame
-        self.main_frame = tk.Frame(self.root, bg=theme["bg"])
-        self.main_frame.pack(expand=True, fill="both", padx=10, pady=10)
+        self.main_frame = themed(tk.Frame(self.root, bg=theme["bg"]), bg="bg")
         
         # Currency display
-        currency_frame = tk.Frame(self.main_frame, bg=theme["bg"])
+        currency_frame = themed(tk.Frame(self.main_frame, bg=theme["bg"]), bg="bg")
         currency_frame.pack(fill="x", pady=5)
         
-        self.currency_label = tk.Label(
+        self.currency_label = themed(tk.Label(
             currency_frame,
-            text=f"💰 {self.game_state.buddy_bucks} | 🎟️ {self.game_state.gacha_rolls}",
+            text=f"💰 {snapshot.buddy_bucks} | 🎟️ {snapshot.gacha_rolls}",
             font=("Comic Sans MS", 12, "bold"),
             bg=theme["bg"],
             fg=theme["fg"]
-        )
+        ), bg="bg", fg="fg")
         self.currency_label.pack(side="left", padx=10)
         # Dev mode badge (non-intrusive)
-        self.dev_badge = tk.Label(
+        self.dev_badge = themed(tk.Label(
             currency_frame,
             text="",
             font=("Comic Sans MS", 10, "bold"),
             bg=theme["bg"],
             fg="#ffcc00"
-        )
+        ), bg="bg")
         self.dev_badge.pack(side="right", padx=10)
         
         # Pet display
-        self.pet_display = tk.Label(
+        self.pet_display = themed(tk.Label(
             self.main_frame,
             text="",
             font=("Courier New", 10, "bold"),
@@ -321,49 +385,46 @@ class MyLittleBuddyApp:
             fg=theme["fg"],
             justify="center",
             cursor="heart"
-        )
+        ), bg="bg", fg="fg")
         self.pet_display.pack(pady=10, padx=20)
         self.pet_display.bind("<Button-1>", self.pet_the_pet)
         
         # Info panel
-        info_frame = tk.Frame(self.main_frame, bg=theme["bg"])
+        info_frame = themed(tk.Frame(self.main_frame, bg=theme["bg"]), bg="bg")
         info_frame.pack(fill="x", pady=5)
         
-        # Pet name and stage
-        name_text = f"{self.current_pet.species.title()} - Stage {self.current_pet.stage}"
-        if self.current_pet.stage == 3:
-            name_text += f" ({self.current_pet.evolution_branch.title()})"
-        
-        tk.Label(
+        # Pet name and stage, filled in by bind_current_pet
+        self.pet_name_label = themed(tk.Label(
             info_frame,
-            text=name_text,
+            text="",
             font=("Comic Sans MS", 14, "bold"),
             bg=theme["bg"],
             fg=theme["fg"]
-        ).pack(side="left")
+        ), bg="bg", fg="fg")
+        self.pet_name_label.pack(side="left")
         
         # Satisfaction meter
-        sat_frame = tk.Frame(info_frame, bg=theme["bg"])
+        sat_frame = themed(tk.Frame(info_frame, bg=theme["bg"]), bg="bg")
         sat_frame.pack(side="right", padx=10)
         
-        tk.Label(
+        themed(tk.Label(
             sat_frame,
             text="Satisfaction:",
             bg=theme["bg"],
             fg=theme["fg"]
-        ).pack(side="left")
+        ), bg="bg", fg="fg").pack(side="left")
         
         self.satisfaction_bar = ttk.Progressbar(
             sat_frame,
             length=100,
             maximum=100,
-            value=self.current_pet.satisfaction,
+            value=0,
             style="Horizontal.TProgressbar"
         )
         self.satisfaction_bar.pack(side="left", padx=5)
         
         # Status bars
-        self.bar_frame = tk.Frame(self.main_frame, bg=theme["bg"])
+        self.bar_frame = themed(tk.Frame(self.main_frame, bg=theme["bg"]), bg="bg")
         self.bar_frame.pack(pady=10, fill="x")
         
         # Stats to display, emojis here because I do not want to draw any illustrations for them
@@ -376,43 +437,43 @@ class MyLittleBuddyApp:
         ]
         
         self.bars = {}
+        self.bar_labels = {}
         for stat, label in stats:
-            frame = tk.Frame(self.bar_frame, bg=theme["bg"])
+            frame = themed(tk.Frame(self.bar_frame, bg=theme["bg"]), bg="bg")
             frame.pack(fill="x", pady=2)
             
-            tk.Label(
+            themed(tk.Label(
                 frame,
                 text=label,
                 width=15,
                 anchor="w",
                 bg=theme["bg"],
                 fg=theme["fg"]
-            ).pack(side="left")
+            ), bg="bg", fg="fg").pack(side="left")
             
-            value = getattr(self.current_pet, stat)
             bar = ttk.Progressbar(
                 frame,
                 length=350,
                 maximum=100,
-                value=value,
-                style=self.get_bar_style(value)
+                value=0,
+                style=self.get_bar_style(0)
             )
             bar.pack(side="left", fill="x", expand=True)
             self.bars[stat] = bar
             
             # Value label
-            value_label = tk.Label(
+            value_label = themed(tk.Label(
                 frame,
-                text=f"{value:.1f}",
+                text="",
                 width=6,
                 bg=theme["bg"],
                 fg=theme["fg"]
-            )
+            ), bg="bg", fg="fg")
             value_label.pack(side="right")
             self.bar_labels[stat] = value_label
         
         # Action buttons with emojis because illustrations are just not worth the time to make 
-        btn_frame = tk.Frame(self.main_frame, bg=theme["bg"])
+        btn_frame = themed(tk.Frame(self.main_frame, bg=theme["bg"]), bg="bg")
         btn_frame.pack(pady=15)
         
         actions = [
@@ -423,59 +484,60 @@ class MyLittleBuddyApp:
         ]
         
         for text, action in actions:
-            btn = tk.Button(
+            btn = themed(tk.Button(
                 btn_frame,
                 text=text,
                 font=("Comic Sans MS", 10, "bold"),
                 bg=theme["button_bg"],
                 width=10,
                 command=lambda a=action: self.perform_action(a)
-            )
+            ), bg="button_bg")
             btn.pack(side="left", padx=5)
-            self.action_cooldowns[action] = 0  # Initialize cooldown
+    
+    def bind_current_pet(self):
+        """Fill the main screen widgets in from the current pet (after switching, adopting or evolving)"""
+        pet = self.actor.snapshot.pet
+        if not pet or not self.main_frame:
+            return
+        name_text = f"{pet.species.title()} - Stage {pet.stage}"
+        if pet.stage == 3:
+            name_text += f" ({(pet.evolution_branch or 'joy').title()})"
+        self.binder.set(self.pet_name_label, text=name_text)
         
-        # Initial pet display
+        self.update_currency_display()
+        self.update_bars()
         self.update_pet_display()
-        # Update dev badge if needed
-        try:
-            self._update_dev_badge()
-        except Exception:
-            pass
-        # Reenable Adopt menu item when returning to main UI
-        try:
-            if hasattr(self, 'buddy_menu'):
-                self.buddy_menu.entryconfig("Adopt New Buddy", state="normal")
-        except Exception:
-            pass
 
     def _update_dev_badge(self):
         """Show/hide a small dev-mode badge in the UI."""
         try:
             if getattr(self, 'dev_mode', False):
                 if hasattr(self, 'dev_badge') and self.dev_badge:
-                    self.dev_badge.config(text='🔧 DEV MODE')
+                    self.binder.set(self.dev_badge, text='🔧 DEV MODE')
             else:
                 if hasattr(self, 'dev_badge') and self.dev_badge:
-                    self.dev_badge.config(text='')
+                    self.binder.set(self.dev_badge, text='')
         except Exception:
             pass
     
     def refresh_ui(self):
-        """Refresh UI with the current theme"""
-        if self.main_frame and self.main_frame.winfo_exists():
-            self.main_frame.destroy()
-        self.setup_main_ui()
+        """Recolour the existing UI for the current theme and refresh what it shows"""
+        self.themed.apply(THEMES[self.actor.snapshot.current_theme])
+        self.bind_current_pet()
     
     def update_currency_display(self):
         """Update the currency display"""
         if self.currency_label and self.currency_label.winfo_exists():
-            self.currency_label.config(
-                text=f"💰 {self.game_state.buddy_bucks} | 🎟️ {self.game_state.gacha_rolls}"
+            snapshot = self.actor.snapshot
+            self.binder.set(
+                self.currency_label,
+                text=f"💰 {snapshot.buddy_bucks} | 🎟️ {snapshot.gacha_rolls}"
             )
     
     def update_bars(self):
         """Update status bars"""
-        if not self.current_pet:
+        pet = self.actor.snapshot.pet
+        if not pet:
             return
             
         # Iterate over a snapshot of items to allow safe skips and removals
@@ -485,11 +547,11 @@ class MyLittleBuddyApp:
                 if not bar or not getattr(bar, 'winfo_exists', lambda: False)():
                     continue
 
-                value = getattr(self.current_pet, stat)
-                # Only update existing widgets
+                # Tenths are below a pixel on the bar and are all the label shows
+                value = round(getattr(pet, stat), 1)
+                # Only update existing widgets, and only the options that changed
                 try:
-                    bar['value'] = value
-                    bar.config(style=self.get_bar_style(value))
+                    self.binder.set(bar, value=value, style=self.get_bar_style(value))
                 except Exception:
                     # If the underlying tk widget is gone, skip
                     continue
@@ -498,7 +560,7 @@ class MyLittleBuddyApp:
                 if stat == "happiness":
                     try:
                         if getattr(self, 'satisfaction_bar', None) and getattr(self.satisfaction_bar, 'winfo_exists', lambda: False)():
-                            self.satisfaction_bar['value'] = self.current_pet.satisfaction
+                            self.binder.set(self.satisfaction_bar, value=pet.satisfaction)
                     except Exception:
                         pass
 
@@ -506,7 +568,7 @@ class MyLittleBuddyApp:
                 lbl = self.bar_labels.get(stat)
                 if lbl and getattr(lbl, 'winfo_exists', lambda: False)():
                     try:
-                        lbl.config(text=f"{value:.1f}")
+                        self.binder.set(lbl, text=f"{value:.1f}")
                     except Exception:
                         pass
             except Exception:
@@ -515,11 +577,12 @@ class MyLittleBuddyApp:
     
     def update_pet_display(self):
         """Update pet display with ASCII art"""
-        if not self.current_pet or not self.pet_display:
+        pet = self.actor.snapshot.pet
+        if not pet or not self.pet_display:
             return
             
-        art = self.current_pet.get_ascii_art(self.game_state.current_theme)
-        self.pet_display.config(text=art)
+        art = render_art(pet, self.animation.blink, self.animation.breath_offset)
+        self.binder.set(self.pet_display, text=art)
     
     def get_bar_style(self, value):
         """Get progress bar style based on value"""
@@ -532,82 +595,59 @@ class MyLittleBuddyApp:
     
     def pet_the_pet(self, event=None):
         """Handle pet interaction"""
-        if not self.current_pet or self.action_cooldowns.get("pet", 0) > 0:
+        satisfaction_bucks = self.actor.call(self.actor.pet_the_pet)
+        if satisfaction_bucks is None:
             return
         
-        # Apply action
-        satisfaction_reward = self.current_pet.apply_action("pet")
-        
         # Show heart effect
         self.show_emoji_feedback("💖")
         
         # Handle rewards
-        if satisfaction_reward:
-            bucks = self.game_state.award_satisfaction()
-            self.show_emoji_feedback(f"+{bucks}💰", duration=1500)
+        if satisfaction_bucks:
+            self.show_emoji_feedback(f"+{satisfaction_bucks}💰", duration=1500)
         
         # Update UI
-        self.update_bars()
-        self.update_pet_display()
-        
-        # Set cooldown
-        self.action_cooldowns["pet"] = 5
+        self.ui_refresh.refresh()
     
     def perform_action(self, action_type):
         """Perform a care action"""
-        if not self.current_pet or self.action_cooldowns.get(action_type, 0) > 0:
+        result = self.actor.call(self.actor.perform_action, action_type)
+        if result is None:
             return
+        daily_bonus, satisfaction_bucks = result
         
-        # Get daily bonus
-        daily_bonus = self.game_state.get_daily_bonus()
+        # Daily bonus
         if daily_bonus > 0:
             self.show_emoji_feedback(f"+{daily_bonus}💰", duration=1200)
         
-        # Apply action
-        satisfaction_reward = self.current_pet.apply_action(action_type)
-        
         # Handle satisfaction reward
-        if satisfaction_reward:
-            bucks = self.game_state.award_satisfaction()
-            self.show_emoji_feedback(f"+{bucks}💰", duration=1500)
+        if satisfaction_bucks:
+            self.show_emoji_feedback(f"+{satisfaction_bucks}💰", duration=1500)
         
         # Check for evolution
-        if self.current_pet.evolution_ready:
+        pet = self.actor.snapshot.pet
+        if pet.evolution_ready:
             if messagebox.askyesno("🌟 Evolution Ready!", 
-                                  f"Your {self.current_pet.species} is ready to evolve!\n"
+                                  f"Your {pet.species} is ready to evolve!\n"
                                   f"Earn 100 💰 and unlock new form.\n\n"
                                   f"Evolve now?"):
-                    if self.current_pet.evolve():
-                        bucks = self.game_state.award_evolution()
-                        # Persist pet immediately after evolution
-                        if self.current_pet_id:
-                            self.game_state.save_pet(self.current_pet_id, self.current_pet)
+                    bucks = self.actor.call(self.actor.evolve)
+                    if bucks is not None:
+                        pet = self.actor.snapshot.pet
                         self.show_emoji_feedback("🌟✨", duration=1500)
                         # Standard evolution message
                         messagebox.showinfo("🎉 Evolution Complete!", 
-                                            f"{self.current_pet.species.title()} evolved to Stage {self.current_pet.stage}!\n"
+                                            f"{pet.species.title()} evolved to Stage {pet.stage}!\n"
                                             f"+{bucks} Buddy Bucks!")
                         # Special notification when pet reaches max stage
-                        if self.current_pet.stage >= 3:
+                        if pet.stage >= 3:
                             messagebox.showinfo("🏆 Max Evolution!", 
-                                                f"Your {self.current_pet.species.title()} has reached its final form! Congratulations!")
-                        # Refresh main UI so labels (name/stage) reflect new stage/art
-                        if self.main_frame and self.main_frame.winfo_exists():
-                            self.refresh_ui()
+                                                f"Your {pet.species.title()} has reached its final form! Congratulations!")
+                        # Update labels (name/stage) and art for the new stage
+                        self.bind_current_pet()
         
         # Update UI
-        self.update_bars()
-        self.update_pet_display()
-        self.update_currency_display()
-        
-        # Set cooldown (different for each action)
-        cooldowns = {
-            "feed": 5,
-            "play": 8,
-            "clean": 10,
-            "sleep": 15
-        }
-        self.action_cooldowns[action_type] = cooldowns.get(action_type, 5)
+        self.ui_refresh.refresh()
     
     def show_emoji_feedback(self, emoji, duration=800):
         """Show temporary emoji feedback"""
@@ -620,7 +660,7 @@ class MyLittleBuddyApp:
                 text=emoji, 
                 font=("Comic Sans MS", 20, "bold"),
                 fg="#ff69b4",
-                bg=THEMES[self.game_state.current_theme]["bg"]
+                bg=THEMES[self.actor.snapshot.current_theme]["bg"]
             )
             label.place(relx=0.5, rely=0.0, anchor="n")
             self._feedback_label = label
@@ -644,7 +684,7 @@ class MyLittleBuddyApp:
             x = parent.winfo_rootx() - self.root.winfo_rootx()
             y = parent.winfo_rooty() - self.root.winfo_rooty()
 
-            lab = tk.Label(self.root, text=f"+{amount}💰", font=("Comic Sans MS", 14, "bold"), fg="#ffd700", bg=THEMES[self.game_state.current_theme]["bg"])
+            lab = tk.Label(self.root, text=f"+{amount}💰", font=("Comic Sans MS", 14, "bold"), fg="#ffd700", bg=THEMES[self.actor.snapshot.current_theme]["bg"])
             lab.place(x=x + 60, y=y)
 
             # Animate upward movement and fade (simple)
@@ -667,70 +707,16 @@ class MyLittleBuddyApp:
         except Exception:
             pass
     
-    def game_loop(self):
-        """Main game loop for stat decay and updates"""
-        last_update = time.time()
-        
-        while self.running:
-            current_time = time.time()
-            elapsed = current_time - last_update
-            last_update = current_time
-            
-            # Update cooldowns
-            for action in self.action_cooldowns:
-                if self.action_cooldowns[action] > 0:
-                    self.action_cooldowns[action] -= elapsed
-            
-            # Apply stat decay if pet exists which it should 
-            if self.current_pet:
-                # Check if we're at night for theme unlock, not sure if it would work for vercel uploads
-                current_hour = time.localtime().tm_hour
-                if current_hour >= 22 and not self.game_state.achievements["night_play"]:
-                    self.game_state.achievements["night_play"] = True
-                    self.game_state.check_theme_unlocks()
-                # Accumulate elapsed time and apply decay in 2s steps to keep changes small and discrete
-                try:
-                    self._decay_accum += elapsed
-                    if self._decay_accum >= 2.0:
-                        # number of 2-second steps to apply
-                        steps = int(self._decay_accum // 2)
-                        # apply decay in one call scaled to total seconds for efficiency
-                        self.current_pet.apply_decay(steps * 2)
-                        self._decay_accum -= steps * 2
-                except Exception:
-                    # fallback to continuous decay if something goes wrong
-                    try:
-                        self.current_pet.apply_decay(elapsed)
-                    except Exception:
-                        pass
-                
-                # Auto-save pet
-                if hasattr(self, 'current_pet_id') and self.current_pet_id:
-                    self.game_state.save_pet(self.current_pet_id, self.current_pet)
-            
-            # Auto-save game state
-            self.game_state.save_game()
-            
-            # Update UI in main thread
-            if self.root.winfo_exists():
-                self.root.after(0, self.update_ui_from_loop)
-            
-            # Sleep to prevent 100% CPU usage
-            time.sleep(0.1)
-    
     def update_ui_from_loop(self):
-        """Update UI from game loop"""
-        if self.current_pet and self.pet_display and self.pet_display.winfo_exists():
+        """Redraw the main screen from the latest snapshot, called by self.ui_refresh"""
+        if self.actor.snapshot.pet and self.pet_display and self.pet_display.winfo_exists():
             self.update_bars()
             self.update_pet_display()
-    
-    def start_game_loop(self):
-        thread = threading.Thread(target=self.game_loop, daemon=True)
-        thread.start()
+            self.update_currency_display()
     
     def start_bubble_pop(self):
         """Start bubble pop mini-game"""
-        if not self.current_pet:
+        if not self.actor.snapshot.pet:
             messagebox.showwarning("⚠️ No Buddy", "You need to adopt a buddy first!")
             return
         
@@ -742,27 +728,14 @@ class MyLittleBuddyApp:
             except:
                 pass
         
-        def update_callback():
-            self.update_bars()
-            self.update_pet_display()
+        def update_callback(happiness_gain):
+            # Bubble Pop raises happiness directly
+            self.actor.call(self.actor.add_happiness, happiness_gain)
+            self.ui_refresh.refresh()
         
         def earn_bucks_callback(amount):
-            # Record achievement progress for bubble pop
-            unlocked = False
-            try:
-                unlocked = self.game_state.record_bubble_earn(amount)
-            except Exception:
-                pass
-
-            # Apply bucks (record_bubble_earn may already add reward money)
-            # Use earn_bucks to keep centralized behavior
-            try:
-                self.game_state.earn_bucks(amount)
-            except Exception:
-                # Fallback direct credit
-                self.game_state.buddy_bucks += amount
-
-            self.update_currency_display()
+            unlocked = self.actor.call(self.actor.bubble_earn, amount)
+            self.ui_refresh.refresh()
 
             # If achievement unlocked, show a small non-intrusive popup
             if unlocked:
@@ -775,7 +748,6 @@ class MyLittleBuddyApp:
         
         self.mini_game_instance = mini_games.BubblePopGame(
             self.root,
-            self.current_pet,
             update_callback,
             earn_bucks_callback
         )
@@ -792,7 +764,7 @@ class MyLittleBuddyApp:
     #The memory match game is defunct and will be removed in future updates.
     def start_memory_match(self):
         """Start memory match mini-game"""
-        if not self.current_pet:
+        if not self.actor.snapshot.pet:
             messagebox.showwarning("No Buddy", "You need to adopt a buddy first!")
             return
         
@@ -804,21 +776,15 @@ class MyLittleBuddyApp:
             except:
                 pass
         
-        def update_callback():
-            self.update_bars()
-            self.update_pet_display()
+        def update_callback(happiness_gain=0):
+            self.ui_refresh.refresh()
         
         def earn_bucks_callback(amount):
-            self.game_state.buddy_bucks += amount
-            self.update_currency_display()
-            try:
-                self.game_state.force_save()
-            except Exception:
-                self.game_state.save_game()
+            self.actor.call(self.actor.earn, amount)
+            self.ui_refresh.refresh()
         
         self.mini_game_instance = mini_games.MemoryMatchGame(
             self.root,
-            self.current_pet,
             update_callback,
             earn_bucks_callback
         )
@@ -833,17 +799,18 @@ class MyLittleBuddyApp:
     
     def buy_gacha_roll(self):
         """Buy additional gacha roll"""
-        if self.game_state.buddy_bucks >= 50:
-            self.game_state.buddy_bucks -= 50
-            self.game_state.gacha_rolls += 1
-            self.update_currency_display()
-            messagebox.showinfo("🛒 Purchased!", f"You got 1 Gacha Roll!\nTotal rolls: {self.game_state.gacha_rolls}")
+        if self.actor.call(self.actor.buy_roll):
+            self.ui_refresh.refresh()
+            messagebox.showinfo("🛒 Purchased!", f"You got 1 Gacha Roll!\nTotal rolls: {self.actor.snapshot.gacha_rolls}")
         else:
-            messagebox.showerror("❌ Not Enough", f"Need 50 💰\nYou have: {self.game_state.buddy_bucks}")
+            messagebox.showerror("❌ Not Enough", f"Need 50 💰\nYou have: {self.actor.snapshot.buddy_bucks}")
     
     def switch_pet(self):
         """Switch between owned pets"""
-        if not self.game_state.pet_collection:
+        size = self.actor.call(self.actor.collection_size)
+        if size is None:
+            return
+        if not size:
             messagebox.showinfo("EmptyEntries", "No buddies in your collection!")
             return
         
@@ -851,7 +818,7 @@ class MyLittleBuddyApp:
         top = tk.Toplevel(self.root)
         top.title("Choose Your Buddy")
         top.geometry("350x400")
-        top.configure(bg=THEMES[self.game_state.current_theme]["bg"])
+        top.configure(bg=THEMES[self.actor.snapshot.current_theme]["bg"])
         # Disable the menu entry while this window is open
         try:
             if hasattr(self, 'buddy_menu'):
@@ -875,69 +842,67 @@ class MyLittleBuddyApp:
             top,
             text="Select a Buddy:",
             font=("Comic Sans MS", 12, "bold"),
-            bg=THEMES[self.game_state.current_theme]["bg"],
-            fg=THEMES[self.game_state.current_theme]["fg"]
+            bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+            fg=THEMES[self.actor.snapshot.current_theme]["fg"]
         ).pack(pady=10)
         
-        # Create a scrollable frame
-        canvas = tk.Canvas(top, bg=THEMES[self.game_state.current_theme]["bg"])
-        scrollbar = ttk.Scrollbar(top, orient="vertical", command=canvas.yview)
-        scroll_frame = tk.Frame(canvas, bg=THEMES[self.game_state.current_theme]["bg"])
-        
-        scroll_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        # Only the rows on screen exist, they are refilled as the list scrolls
+        theme = THEMES[self.actor.snapshot.current_theme]
+        pet_list = VirtualList(top, lambda parent: self.make_switch_row(parent, top, theme),
+                               self.fill_switch_row, SWITCH_ROW_HEIGHT, bg=theme["bg"])
+        # Pet options stream in from the collection index, the full buddy only loads on select
+        self.load_collection_rows(top, pet_list)
+        pet_list.pack(fill="both", expand=True, padx=10, pady=10)
+    
+    def make_switch_row(self, parent, top, theme):
+        """Empty row for the Switch Buddy list, fill_switch_row() points it at a buddy"""
+        frame = tk.Frame(parent, bg=theme["bg"])
+        frame.info = tk.Label(frame, bg=theme["bg"], font=("Comic Sans MS", 10))
+        frame.info.pack(side="left", padx=5)
+        
+        # Select button
+        frame.select = tk.Button(frame, text="Select", bg="#90ee90", font=("Comic Sans MS", 9))
+        frame.select.pack(side="right", padx=5)
+        frame.top = top
+        return frame
+    
+    def fill_switch_row(self, frame, row):
+        pet_id, pet = row
+        # Pet info
+        info = f"{pet['species'].title()} (Stage {pet['stage']})"
+        if pet["stage"] == 3:
+            info += f" - {(pet['evolution_branch'] or 'joy').title()}"
+        if "legendary" in pet["rarity"]:
+            info += " ✨"
+        frame.info.config(text=info, fg=RARITY_DEFINITIONS[pet["rarity"]]["color"])
+        frame.select.config(command=lambda p=pet_id, w=frame.top: self.select_pet(p, w))
+    
+    def load_collection_rows(self, top, pet_list):
+        """Fill a collection list page by page in the background, stops when the window goes away"""
+        theme = THEMES[self.actor.snapshot.current_theme]
+        # Placeholder under the list until every page is in, packed before the list so it keeps its space
+        placeholder = tk.Label(top, text="Loading buddies...", font=("Comic Sans MS", 9, "italic"),
+                               bg=theme["bg"], fg=theme["fg"])
+        placeholder.pack(side="bottom", anchor="w", padx=10, pady=5)
+        
+        def on_batch(rows):
+            pet_list.append(rows)
+            placeholder.config(text=f"Loading buddies... {loader.loaded}/{loader.total}")
+        
+        loader = BatchLoader(
+            self.root,
+            lambda start, count: self.actor.submit(self.actor.collection_page, start, count),
+            on_batch,
+            lambda total: placeholder.destroy()
         )
-        
-        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Add pet options
-        for pet_id in self.game_state.pet_collection:
-            pet = self.game_state.load_pet(pet_id)
-            if not pet:
-                continue
-            
-            frame = tk.Frame(scroll_frame, bg=THEMES[self.game_state.current_theme]["bg"])
-            frame.pack(fill="x", padx=5, pady=2)
-            
-            # Pet info
-            info = f"{pet.species.title()} (Stage {pet.stage})"
-            if pet.stage == 3:
-                info += f" - {pet.evolution_branch.title()}"
-            if "legendary" in pet.rarity:
-                info += " ✨"
-            
-            tk.Label(
-                frame,
-                text=info,
-                bg=THEMES[self.game_state.current_theme]["bg"],
-                fg=RARITY_DEFINITIONS[pet.rarity]["color"],
-                font=("Comic Sans MS", 10)
-            ).pack(side="left", padx=5)
-            
-            # Select button
-            tk.Button(
-                frame,
-                text="Select",
-                command=lambda p=pet_id, w=top: self.select_pet(p, w),
-                bg="#90ee90",
-                font=("Comic Sans MS", 9)
-            ).pack(side="right", padx=5)
+        # Covers every way the window can close
+        top.bind("<Destroy>", lambda e: loader.cancel() if e.widget is top else None, add="+")
+        loader.start()
+        return loader
     
     def select_pet(self, pet_id, window):
         """Switch to selected pet"""
-        pet = self.game_state.load_pet(pet_id)
-        if pet:
-            self.current_pet = pet
-            self.current_pet_id = pet_id
-            
-            if self.main_frame and self.main_frame.winfo_exists():
-                self.main_frame.destroy()
-            
+        if self.actor.call(self.actor.switch, pet_id):
             self.setup_main_ui()
         try:
             window.destroy()
@@ -952,7 +917,10 @@ class MyLittleBuddyApp:
     
     def view_collection(self):
         """View pet collection"""
-        if not self.game_state.pet_collection:
+        size = self.actor.call(self.actor.collection_size)
+        if size is None:
+            return
+        if not size:
             messagebox.showinfo("EmptyEntries", "Your collection is empty!")
             return
         # Prevent opening multiple collection windows
@@ -962,7 +930,7 @@ class MyLittleBuddyApp:
         top = tk.Toplevel(self.root)
         top.title("My Collection")
         top.geometry("350x400")
-        top.configure(bg=THEMES[self.game_state.current_theme]["bg"])
+        top.configure(bg=THEMES[self.actor.snapshot.current_theme]["bg"])
         # Disable menu entry while open
         try:
             if hasattr(self, 'shop_menu'):
@@ -981,6 +949,46 @@ class MyLittleBuddyApp:
             except Exception:
                 pass
         top.protocol("WM_DELETE_WINDOW", _on_collection_close)
+        
+        tk.Label(
+            top,
+            text="My Buddy Collection",
+            font=("Comic Sans MS", 14, "bold"),
+            bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+            fg=THEMES[self.actor.snapshot.current_theme]["fg"]
+        ).pack(pady=10)
+        
+        # Only the rows on screen exist, they are refilled as the list scrolls
+        theme = THEMES[self.actor.snapshot.current_theme]
+        pet_list = VirtualList(top, lambda parent: self.make_collection_row(parent, theme),
+                               self.fill_collection_row, COLLECTION_ROW_HEIGHT, bg=theme["bg"])
+        # Pets stream in from the collection index
+        self.load_collection_rows(top, pet_list)
+        pet_list.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def make_collection_row(self, parent, theme):
+        """Empty row for the Collection list, fill_collection_row() points it at a buddy"""
+        frame = tk.Frame(parent, bg=theme["bg"], pady=5)
+        
+        # Pet info
+        info_frame = tk.Frame(frame, bg=theme["bg"])
+        info_frame.pack(side="left", fill="x", expand=True, padx=5)
+        
+        frame.info = tk.Label(info_frame, font=("Comic Sans MS", 10, "bold"), bg=theme["bg"])
+        frame.info.pack(anchor="w")
+        frame.details = tk.Label(info_frame, font=("Comic Sans MS", 8), bg=theme["bg"], fg=theme["fg"])
+        frame.details.pack(anchor="w")
+        # Evolution stars
+        frame.stars = tk.Label(info_frame, font=("Comic Sans MS", 8), fg="#f1c40f", bg=theme["bg"])
+        frame.stars.pack(anchor="w")
+        return frame
+
+    def fill_collection_row(self, frame, row):
+        _, pet = row
+        frame.info.config(text=f"{pet['species'].title()} - {pet['rarity'].title()}",
+                          fg=RARITY_DEFINITIONS[pet["rarity"]]["color"])
+        frame.details.config(text=f"Stage {pet['stage']} • {format_personality(pet['personality'])}")
+        frame.stars.config(text="⭐" * pet["stage"] if pet["stage"] >= 2 else "")
 
     def view_achievements(self):
         """Show achievements and currency rewards"""
@@ -991,7 +999,7 @@ class MyLittleBuddyApp:
         top = tk.Toplevel(self.root)
         top.title("Achievements")
         top.geometry("720x560")
-        top.configure(bg=THEMES[self.game_state.current_theme]["bg"])
+        top.configure(bg=THEMES[self.actor.snapshot.current_theme]["bg"])
 
         # Disable menu entry while open
         try:
@@ -1019,165 +1027,108 @@ class MyLittleBuddyApp:
             top,
             text="Achievements",
             font=("Comic Sans MS", 16, "bold"),
-            bg=THEMES[self.game_state.current_theme]["bg"],
-            fg=THEMES[self.game_state.current_theme]["fg"]
+            bg=THEMES[self.actor.snapshot.current_theme]["bg"],
+            fg=THEMES[self.actor.snapshot.current_theme]["fg"]
         ).pack(pady=8)
 
-        # Scrollable frame for achievements
-        canvas = tk.Canvas(top, bg=THEMES[self.game_state.current_theme]["bg"], highlightthickness=0)
-        frame = tk.Frame(canvas, bg=THEMES[self.game_state.current_theme]["bg"])
-        scroll = ttk.Scrollbar(top, orient="vertical", command=canvas.yview)
-        canvas.configure(yscrollcommand=scroll.set)
-        canvas.create_window((0,0), window=frame, anchor="nw")
+        tk.Button(top, text="Close", command=_on_ach_close, bg="#90ee90").pack(side="bottom", pady=8)
 
-        def on_config(e):
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        # Only the cards on screen exist, they are refilled as the list scrolls
+        theme = THEMES[self.actor.snapshot.current_theme]
+        achievement_list = VirtualList(top, lambda parent: self.make_achievement_row(parent, top, theme),
+                                       self.fill_achievement_row, ACHIEVEMENT_ROW_HEIGHT, bg=theme["bg"])
+        # Use GameState definitions to render achievements and claim actions
+        achievement_list.set_items(self.actor.call(self.actor.achievement_rows) or [])
+        achievement_list.pack(fill="both", expand=True, padx=8, pady=6)
 
-        frame.bind("<Configure>", on_config)
-        canvas.pack(side="left", fill="both", expand=True, padx=8, pady=6)
-        scroll.pack(side="right", fill="y")
+    def make_achievement_row(self, parent, top, theme):
+        """Empty achievement card, fill_achievement_row() points it at an achievement"""
+        row = tk.Frame(parent, bg=theme["bg"])
+        # Card container
+        card = tk.Frame(row, bg=theme["bg"], relief="groove", bd=1)
+        card.pack(fill="both", expand=True, pady=4, padx=6)
 
-        # Use GameState definitions to render achievements and claim actions
-        for aid, meta in getattr(self.game_state, 'ACHIEVEMENT_DEFS', {}).items():
-            state = self.game_state.achievement_state.get(aid, {"unlocked": False, "claimed": False})
-            unlocked = bool(state.get("unlocked", False))
-            claimed = bool(state.get("claimed", False))
-            metric = meta.get("metric")
-            threshold = meta.get("threshold")
-            current = self.game_state.achievements.get(metric, 0)
+        left = tk.Frame(card, bg=theme["bg"])
+        left.pack(side="left", fill="both", expand=True, padx=8, pady=6)
 
-            # Card container
-            card = tk.Frame(frame, bg=THEMES[self.game_state.current_theme]["bg"], relief="groove", bd=1)
-            card.pack(fill="x", pady=8, padx=6)
+        row.title = tk.Label(left, font=("Comic Sans MS", 12, "bold"), bg=theme["bg"], fg=theme["fg"])
+        row.title.pack(anchor="w")
+        row.desc = tk.Label(left, font=("Comic Sans MS", 9), bg=theme["bg"], fg="#666")
+        row.desc.pack(anchor="w", pady=(2,6))
 
-            left = tk.Frame(card, bg=THEMES[self.game_state.current_theme]["bg"])
-            left.pack(side="left", fill="both", expand=True, padx=8, pady=6)
+        # Progress bar
+        row.progress = ttk.Progressbar(left, length=260, style="Horizontal.TProgressbar")
+        row.progress.pack(anchor="w", pady=(0,4))
+        row.progress_text = tk.Label(left, font=("Comic Sans MS", 9, "italic"), bg=theme["bg"], fg="#888")
+        row.progress_text.pack(anchor="w")
 
-            tk.Label(left, text=meta.get("title", aid), font=("Comic Sans MS", 12, "bold"), bg=THEMES[self.game_state.current_theme]["bg"], fg=THEMES[self.game_state.current_theme]["fg"]).pack(anchor="w")
-            tk.Label(left, text=meta.get("desc", ""), font=("Comic Sans MS", 9), bg=THEMES[self.game_state.current_theme]["bg"], fg="#666").pack(anchor="w", pady=(2,6))
+        right = tk.Frame(card, bg=theme["bg"])
+        right.pack(side="right", padx=8, pady=6)
 
-            # Progress bar
-            try:
-                pb_max = threshold if isinstance(threshold, (int, float)) and threshold > 0 else 1
-                pb_val = float(current) if isinstance(current, (int, float)) else (1.0 if bool(current) else 0.0)
-                pb = ttk.Progressbar(left, length=260, maximum=pb_max, value=min(pb_val, pb_max), style="Horizontal.TProgressbar")
-                pb.pack(anchor="w", pady=(0,4))
-                prog_text = f"{int(pb_val)}/{int(pb_max)}" if isinstance(pb_val, (int, float)) else str(pb_val)
-                tk.Label(left, text=prog_text, font=("Comic Sans MS", 9, "italic"), bg=THEMES[self.game_state.current_theme]["bg"], fg="#888").pack(anchor="w")
-            except Exception:
-                pass
+        row.reward = tk.Label(right, font=("Comic Sans MS", 10), bg=theme["bg"], fg="#2c3e50")
+        row.reward.pack()
+        # Only one of these is shown, depending on the achievement
+        row.claim = tk.Button(right, text="Claim", bg="#90ee90")
+        row.claimed = tk.Label(right, text="Claimed", font=("Comic Sans MS", 10, "italic"), bg=theme["bg"], fg="#4caf50")
+        row.top = top
+        return row
 
-            right = tk.Frame(card, bg=THEMES[self.game_state.current_theme]["bg"])
-            right.pack(side="right", padx=8, pady=6)
-
-            tk.Label(right, text=f"Reward:\n{meta.get('reward')}", font=("Comic Sans MS", 10), bg=THEMES[self.game_state.current_theme]["bg"], fg="#2c3e50").pack()
-
-            # Claim button if unlocked and not yet claimed
-            if unlocked and not claimed:
-                def make_claim(aid_local):
-                    def _claim():
-                        reward = self.game_state.claim_achievement(aid_local)
-                        if reward is not None:
-                            try:
-                                self.show_claim_animation(reward)
-                            except:
-                                pass
-                            self.update_currency_display()
-                            try:
-                                messagebox.showinfo("Claimed!", f"You claimed {reward} 💰 from achievement.")
-                            except:
-                                pass
-                            # Refresh achievements window and theme menu
-                            try:
-                                top.destroy()
-                                self.update_theme_menu()
-                                self.view_achievements()
-                            except:
-                                pass
-                        else:
-                            try:
-                                messagebox.showwarning("Cannot Claim", "Achievement cannot be claimed.")
-                            except:
-                                pass
-                    return _claim
+    def fill_achievement_row(self, row, achievement):
+        aid, meta, state, current = achievement
+        unlocked = bool(state.get("unlocked", False))
+        claimed = bool(state.get("claimed", False))
+        threshold = meta.get("threshold")
 
-                tk.Button(right, text="Claim", command=make_claim(aid), bg="#90ee90").pack(pady=6)
-            elif claimed:
-                tk.Label(right, text="Claimed", font=("Comic Sans MS", 10, "italic"), bg=THEMES[self.game_state.current_theme]["bg"], fg="#4caf50").pack(pady=10)
+        row.title.config(text=meta.get("title", aid))
+        row.desc.config(text=meta.get("desc", ""))
+        try:
+            pb_max = threshold if isinstance(threshold, (int, float)) and threshold > 0 else 1
+            pb_val = float(current) if isinstance(current, (int, float)) else (1.0 if bool(current) else 0.0)
+            row.progress.config(maximum=pb_max, value=min(pb_val, pb_max))
+            row.progress_text.config(text=f"{int(pb_val)}/{int(pb_max)}")
+        except Exception:
+            pass
+        row.reward.config(text=f"Reward:\n{meta.get('reward')}")
+
+        # Claim button if unlocked and not yet claimed
+        row.claim.pack_forget()
+        row.claimed.pack_forget()
+        if unlocked and not claimed:
+            row.claim.config(command=lambda: self.claim_achievement(aid, row.top))
+            row.claim.pack(pady=6)
+        elif claimed:
+            row.claimed.pack(pady=10)
+
+    def claim_achievement(self, aid, top):
+        reward = self.actor.call(self.actor.claim, aid)
+        if reward is not None:
+            try:
+                self.show_claim_animation(reward)
+            except:
+                pass
+            self.ui_refresh.refresh()
+            try:
+                messagebox.showinfo("Claimed!", f"You claimed {reward} 💰 from achievement.")
+            except:
+                pass
+            # Refresh achievements window and theme menu
+            try:
+                top.destroy()
+                self.update_theme_menu()
+                self.view_achievements()
+            except:
+                pass
+        else:
+            try:
+                messagebox.showwarning("Cannot Claim", "Achievement cannot be claimed.")
+            except:
+                pass
 
-        tk.Button(top, text="Close", command=_on_ach_close, bg="#90ee90").pack(pady=8)
-        
-        tk.Label(
-            top,
-            text="My Buddy Collection",
-            font=("Comic Sans MS", 14, "bold"),
-            bg=THEMES[self.game_state.current_theme]["bg"],
-            fg=THEMES[self.game_state.current_theme]["fg"]
-        ).pack(pady=10)
-        
-        # Create scrollable frame
-        canvas = tk.Canvas(top, bg=THEMES[self.game_state.current_theme]["bg"])
-        scrollbar = ttk.Scrollbar(top, orient="vertical", command=canvas.yview)
-        scroll_frame = tk.Frame(canvas, bg=THEMES[self.game_state.current_theme]["bg"])
-        
-        scroll_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Add pets to collection
-        for pet_id in self.game_state.pet_collection:
-            pet = self.game_state.load_pet(pet_id)
-            if not pet:
-                continue
-            
-            frame = tk.Frame(scroll_frame, bg=THEMES[self.game_state.current_theme]["bg"], pady=5)
-            frame.pack(fill="x", padx=5)
-            
-            # Pet info
-            info_frame = tk.Frame(frame, bg=THEMES[self.game_state.current_theme]["bg"])
-            info_frame.pack(side="left", fill="x", expand=True)
-            
-            info = f"{pet.species.title()} - {pet.rarity.title()}"
-            tk.Label(
-                info_frame,
-                text=info,
-                font=("Comic Sans MS", 10, "bold"),
-                fg=RARITY_DEFINITIONS[pet.rarity]["color"],
-                bg=THEMES[self.game_state.current_theme]["bg"]
-            ).pack(anchor="w")
-            
-            details = f"Stage {pet.stage} • {pet.get_personality_display()}"
-            tk.Label(
-                info_frame,
-                text=details,
-                font=("Comic Sans MS", 8),
-                bg=THEMES[self.game_state.current_theme]["bg"],
-                fg=THEMES[self.game_state.current_theme]["fg"]
-            ).pack(anchor="w")
-            
-            # Evolution stars
-            if pet.stage >= 2:
-                stars = "⭐" * pet.stage
-                tk.Label(
-                    info_frame,
-                    text=stars,
-                    font=("Comic Sans MS", 8),
-                    fg="#f1c40f",
-                    bg=THEMES[self.game_state.current_theme]["bg"]
-                ).pack(anchor="w")
-    
     def save_game(self):
         """Save current game state"""
-        if self.current_pet and self.current_pet_id:
-            self.game_state.save_pet(self.current_pet_id, self.current_pet)
-        self.game_state.save_game()
+        if not self.actor.call(self.actor.flush):
+            messagebox.showerror("Not Saved", "The game is busy, try saving again in a moment.")
+            return
         messagebox.showinfo("Saved!", "Game saved successfully!")
 
     def _watch_mini_game(self):
@@ -1219,6 +1170,18 @@ class MyLittleBuddyApp:
         """Handle application closing"""
         self.save_game()
         self.running = False
+        self.animation.stop()
+        if self.gacha_spin:
+            self.gacha_spin.stop()
+        self.ui_refresh.stop()
+        # Stop the game loop, once it returns the game state is ours and nothing else touches it
+        self.loop.stop(timeout=5.0)
+        self.recorder.close(self.game_state)
+        # Write the final game state, wait (up to 5s) for queued saves and fold the save journal into a snapshot
+        self.game_state.close(timeout=5.0)
+        # Internal counters, only in dev mode or with BUDDY_STATS set
+        if self.dev_mode or os.getenv("BUDDY_STATS"):
+            self.print_shutdown_stats()
         
         if self.mini_game_instance:
             try:
@@ -1231,6 +1194,23 @@ class MyLittleBuddyApp:
         except:
             pass
 
+    def print_shutdown_stats(self):
+        """Print the save and UI counters of this session"""
+        stats = self.game_state.scheduler.stats()
+        print(f"Save scheduler: {sum(stats['writes'].values())} writes for "
+              f"{stats['marks_low'] + stats['marks_normal'] + stats['marks_critical']} changes "
+              f"({stats['coalesced']} coalesced, max staleness {stats['max_staleness_seen']:.1f}s)")
+        if self.game_state.worker:
+            stats = self.game_state.worker.stats()
+            print(f"Background saves: {stats['writes']} writes, {stats['superseded']} superseded, "
+                  f"max queue depth {stats['max_queue_depth']}, avg {stats['avg_write_ms']:.1f} ms, max {stats['max_write_ms']:.1f} ms")
+        stats = self.binder.stats()
+        print(f"UI updates: {stats['issued']} sent to Tk, {stats['suppressed']} unchanged and skipped "
+              f"({stats['suppressed_ratio']:.0%})")
+        stats = self.ui_refresh.stats()
+        print(f"UI refresh: {stats['frames']} redraws from {stats['polls']} polls, {stats['coalesced']} snapshots coalesced, "
+              f"{stats['stalls']} stalls (worst {stats['max_delay_ms']:.0f} ms late)")
+
     def _on_key_press(self, event):
         """Handle key presses to detect secret dev-mode (8x spacebar)."""
         try:
@@ -1254,22 +1234,22 @@ class MyLittleBuddyApp:
             pass
 
     def _enable_dev_mode(self):
-        """Enable dev/test mode: turn on FAST_EVOLVE and show feedback."""
+        """Enable dev/test mode: run game time faster and show feedback."""
         try:
-            os.environ['FAST_EVOLVE'] = '1'
+            self.actor.call(self.clock.set_dilation, DEV_DILATION)
             self.dev_mode = True
             # Visible feedback
             try:
                 self.show_emoji_feedback('🔧 Dev Mode ON', duration=2000)
             except Exception:
-                messagebox.showinfo('Dev Mode', 'Dev mode enabled (FAST_EVOLVE=1)')
+                messagebox.showinfo('Dev Mode', f'Dev mode enabled (time x{DEV_DILATION:g})')
         except Exception as e:
             print('Failed to enable dev mode:', e)
 
     def _disable_dev_mode(self):
-        """Disable dev/test mode: turn off FAST_EVOLVE and show feedback."""
+        """Disable dev/test mode: back to normal game time and show feedback."""
         try:
-            os.environ['FAST_EVOLVE'] = '0'
+            self.actor.call(self.clock.set_dilation, 1.0)
             self.dev_mode = False
             try:
                 self.show_emoji_feedback('🔧 Dev Mode OFF', duration=2000)
@@ -2,8 +2,8 @@
 
 import tkinter as tk
 from tkinter import messagebox
-import random
 import time
+import rng
 from assets import BUBBLE_CHAR
 
 class BubblePopGame:
@@ -12,9 +12,9 @@ class BubblePopGame:
     Rewards scale with performance where more bubbles popped means more happiness & coins.
     """
     
-    def __init__(self, parent_window, buddy, update_callback, earn_bucks_callback):
+    def __init__(self, parent_window, update_callback, earn_bucks_callback):
         self.parent = parent_window
-        self.buddy = buddy
+        # update_callback(happiness_gain) hands the buddy's reward to the game, earn_bucks_callback(amount) the coins
         self.update_callback = update_callback
         self.earn_bucks_callback = earn_bucks_callback
         self.score = 0
@@ -91,9 +91,9 @@ class BubblePopGame:
         if not self.running or not self.canvas.winfo_exists():
             return
             
-        x = random.randint(30, 370)
+        x = rng.get(rng.BUBBLES).randint(30, 370)
         y = 400
-        size = random.randint(20, 40)
+        size = rng.get(rng.BUBBLES).randint(20, 40)
         
         # Bubble colors based on theme
         theme = "forest"
@@ -111,7 +111,7 @@ class BubblePopGame:
         else:  # chromatic or default
             colors = ["#ff9ff3", "#ff6b6b", "#ff9e80"]
         
-        color = random.choice(colors)
+        color = rng.get(rng.BUBBLES).choice(colors)
         
         # Create bubble with glow effect
         glow = self.canvas.create_oval(
@@ -140,7 +140,7 @@ class BubblePopGame:
             "x": x,
             "y": y,
             "size": size,
-            "speed": random.uniform(0.8, 1.5)
+            "speed": rng.get(rng.BUBBLES).uniform(0.8, 1.5)
         })
         
         # Schedule next bubble
@@ -203,13 +203,12 @@ class BubblePopGame:
                 
                 # Reward buddy
                 happiness_gain = min(25, self.score * 2)  # Cap at 25
-                self.buddy.happiness = min(100, self.buddy.happiness + happiness_gain)
                 
                 clicked = True
                 break
         
         if clicked:
-            self.update_callback()
+            self.update_callback(happiness_gain)
     
     def update_timer(self):
         """Update game timer"""
@@ -248,7 +247,7 @@ class BubblePopGame:
         bucks_reward = max(0, int(self.score / 2))
         
         # Apply rewards
-        self.buddy.happiness = min(100, self.buddy.happiness + happiness_reward)
+        self.update_callback(happiness_reward)
         
         awarded = 0
         if hasattr(self, 'earn_bucks_callback'):
@@ -261,8 +260,8 @@ class BubblePopGame:
         # Show results in a popup and include updated total if available
         total_text = ''
         try:
-            if hasattr(self.parent, 'app') and hasattr(self.parent.app, 'game_state'):
-                total = self.parent.app.game_state.buddy_bucks
+            if hasattr(self.parent, 'app') and hasattr(self.parent.app, 'actor'):
+                total = self.parent.app.actor.snapshot.buddy_bucks
                 total_text = f"\nTotal Buddy Bucks: {total}"
         except Exception:
             total_text = ''
@@ -287,8 +286,6 @@ class BubblePopGame:
             bg="#90ee90",
             font=("Comic Sans MS", 10)
         ).pack(pady=10)
-
-        self.update_callback()
     
     def on_close(self):
         """Handle window close"""
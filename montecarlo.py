@@ -0,0 +1,196 @@
+# montecarlo.py - Batch balancing statistics over lots of simulated buddies, one process per core
+#
+#   python -m montecarlo --buddies 200000 --hours 1 --workers 8
+#
+# Buddies are split into batches that run through simulate.run_simulation() in a process
+# pool. Every batch gets its own seed derived from --seed and its batch number, so a run
+# gives the same numbers whatever the worker count. Batch results are merged into
+# histograms of the final evolution branch, time to each stage and Buddy Bucks income.
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import simulate
+
+DEFAULT_BATCH = 500
+# Histogram bin widths
+MINUTES_BIN = 1.0
+INCOME_BIN = 10.0
+
+
+def batch_seed(seed, batch):
+    """Seed for one batch, fixed by the run seed and batch number"""
+    return random.Random(f"{seed}:{batch}").getrandbits(63)
+
+
+def _init_worker(tuning):
+    """Apply the tuning in this process, returns the function that undoes it"""
+    return simulate.apply_tuning(**tuning)
+
+
+def _run_batch(task):
+    """Simulate one batch and boil it down to histograms, runs in a worker process"""
+    batch, pets, hours, tick, policies, seed, auto_evolve, dilation = task
+    result = simulate.run_simulation(hours, policies, pets, tick, batch_seed(seed, batch), auto_evolve, dilation)
+    return {
+        "buddies": pets,
+        "ticks": result["ticks"] * pets,
+        "branches": Counter(result["branches"]),
+        "branches_by_rarity": {group: Counter(counts) for group, counts in result["branches_by_rarity"].items()},
+        "branches_by_trait": {group: Counter(counts) for group, counts in result["branches_by_trait"].items()},
+        "stage_minutes": {stage: _histogram((s / 60 for s in times), MINUTES_BIN)
+                          for stage, times in result["time_to_stage"].items()},
+        "income": _histogram(result["bucks_per_buddy_hour"], INCOME_BIN),
+        "satisfaction_rewards": result["satisfaction_rewards"],
+        "bucks_earned": result["bucks_earned"]
+    }
+
+
+def _histogram(values, width):
+    """Counter of bin start -> count"""
+    return Counter(int(value // width) * width for value in values)
+
+
+def _merge(total, part):
+    """Add one batch summary into the running total"""
+    if total is None:
+        return part
+    total["buddies"] += part["buddies"]
+    total["ticks"] += part["ticks"]
+    total["satisfaction_rewards"] += part["satisfaction_rewards"]
+    total["bucks_earned"] += part["bucks_earned"]
+    total["branches"].update(part["branches"])
+    total["income"].update(part["income"])
+    for key in ("branches_by_rarity", "branches_by_trait", "stage_minutes"):
+        for group, counts in part[key].items():
+            total[key].setdefault(group, Counter()).update(counts)
+    return total
+
+
+def run_montecarlo(buddies, hours=1.0, policies=None, batch=DEFAULT_BATCH, workers=None, seed=0,
+                   tick=2.0, auto_evolve=True, tuning=None, dilation=1.0):
+    """Simulate `buddies` buddies in batches across `workers` processes and merge the histograms"""
+    workers = workers or os.cpu_count() or 1
+    specs = [policy if isinstance(policy, str) else policy.spec for policy in (policies or simulate.DEFAULT_POLICIES)]
+    tasks = []
+    for index, start in enumerate(range(0, buddies, batch)):
+        tasks.append((index, min(batch, buddies - start), hours, tick, specs, seed, auto_evolve, dilation))
+
+    started = time.perf_counter()
+    total = None
+    if workers == 1:
+        # Same process, handy for profiling. The tuning is undone afterwards, the caller keeps using these modules
+        restore = _init_worker(tuning or {})
+        try:
+            for task in tasks:
+                total = _merge(total, _run_batch(task))
+        finally:
+            restore()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tuning or {},)) as pool:
+            for part in pool.map(_run_batch, tasks):
+                total = _merge(total, part)
+    wall_seconds = time.perf_counter() - started
+
+    total = total or _merge(None, {
+        "buddies": 0, "ticks": 0, "branches": Counter(), "branches_by_rarity": {}, "branches_by_trait": {},
+        "stage_minutes": {}, "income": Counter(), "satisfaction_rewards": 0, "bucks_earned": 0
+    })
+    total.update({
+        "hours": hours,
+        "seed": seed,
+        "batches": len(tasks),
+        "workers": workers,
+        "policies": specs,
+        "wall_seconds": wall_seconds,
+        "buddy_ticks_per_second": total["ticks"] / wall_seconds if wall_seconds else 0.0
+    })
+    return total
+
+
+def _percentile(histogram, fraction):
+    """Bin start holding the given fraction of a histogram's samples"""
+    target = fraction * sum(histogram.values())
+    seen = 0
+    for start in sorted(histogram):
+        seen += histogram[start]
+        if seen >= target:
+            return start
+    return None
+
+
+def _bars(histogram, width, unit, rows=12):
+    """Text histogram, neighbouring bins are merged to keep it at most `rows` lines"""
+    if not histogram:
+        return ["  (none)"]
+    low, high = min(histogram), max(histogram)
+    step = max(1, int(((high - low) / width + 1 + rows - 1) // rows)) * width
+    merged = Counter()
+    for start, count in histogram.items():
+        merged[low + ((start - low) // step) * step] += count
+    peak = max(merged.values())
+    return [f"  {start:8.1f}-{start + step:<8.1f}{unit} {'#' * max(1, round(30 * count / peak))} {count}"
+            for start, count in sorted(merged.items())]
+
+
+def _branch_mix(counts):
+    total = sum(counts.values())
+    return ", ".join(f"{branch} {count / total:.0%}" for branch, count in counts.most_common()) if total else "-"
+
+
+def format_report(result):
+    """Human readable summary of a run_montecarlo() result"""
+    buddies = result["buddies"]
+    lines = [
+        f"{buddies:,} buddies x {result['hours']:g} h in {result['batches']} batches on {result['workers']} workers "
+        f"({result['wall_seconds']:.1f} s, {result['buddy_ticks_per_second']:,.0f} buddy ticks/s)",
+        f"Policies: {', '.join(result['policies'])}",
+        "",
+        f"Final branch: {_branch_mix(result['branches'])}"
+    ]
+    for key, label in (("branches_by_rarity", "rarity"), ("branches_by_trait", "trait")):
+        lines.append(f"By {label}:")
+        for group in sorted(result[key]):
+            lines.append(f"  {group:<14} {_branch_mix(result[key][group])}")
+
+    for stage in sorted(result["stage_minutes"]):
+        histogram = result["stage_minutes"][stage]
+        reached = sum(histogram.values())
+        lines.append("")
+        lines.append(f"Minutes to stage {stage}: {reached:,}/{buddies:,} buddies, "
+                     f"median ~{_percentile(histogram, 0.5)}, p90 ~{_percentile(histogram, 0.9)}")
+        lines.extend(_bars(histogram, MINUTES_BIN, " min"))
+
+    lines.append("")
+    per_hour = result["bucks_earned"] / buddies / result["hours"] if buddies and result["hours"] else 0.0
+    lines.append(f"Buddy Bucks per buddy per hour: mean {per_hour:.1f}, "
+                 f"median ~{_percentile(result['income'], 0.5)} ({result['satisfaction_rewards']:,} satisfaction rewards)")
+    lines.extend(_bars(result["income"], INCOME_BIN, " BB/h"))
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m montecarlo",
+                                     description="Branch, stage timing and income statistics over many simulated buddies")
+    simulate.add_run_arguments(parser, hours=1.0)
+    parser.add_argument("--buddies", type=int, default=10000, help="buddies to simulate (default 10000)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help=f"buddies per batch (default {DEFAULT_BATCH})")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="run seed, batch seeds are derived from it (default 0)")
+    parser.add_argument("--json", action="store_true", help="print the merged histograms as JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    result = run_montecarlo(args.buddies, args.hours, args.policy, args.batch, args.workers, args.seed,
+                            args.tick, not args.no_evolve, simulate.tuning_from_args(args), args.dilation)
+    print(json.dumps(result, indent=2, sort_keys=True) if args.json else format_report(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# persistence.py - Background writer so Tk callbacks never wait on the disk
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PersistenceWorker:
+    """
+    Writes save snapshots on its own thread.
+
+    Callers take a snapshot on their own thread and submit it under a key ("game",
+    ("pet", pet_id) or ("pets", pet_ids)). Only the newest snapshot per key is kept, so a burst of saves for
+    the same thing turns into a single write. The queue is bounded by `max_pending`
+    distinct keys; submitting past that waits for the writer to catch up.
+    """
+
+    def __init__(self, max_pending=64):
+        self.max_pending = max_pending
+        self._pending = OrderedDict()  # key -> (write_fn, args)
+        self._in_flight = None         # (key, args) currently being written
+        self._cond = threading.Condition()
+        self._running = True
+
+        # Counters
+        self.submitted = 0
+        self.writes = 0
+        self.superseded = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self.total_write_time = 0.0
+        self.max_write_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self._thread.start()
+
+    def submit(self, key, write_fn, *args):
+        """Queue write_fn(*args), replacing any snapshot still waiting under the same key"""
+        with self._cond:
+            if not self._running:
+                # Writer already stopped (app closing), write inline instead of losing it
+                self._write(write_fn, args)
+                return
+            while key not in self._pending and len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            if key in self._pending:
+                self.superseded += 1
+                del self._pending[key]
+            self._pending[key] = (write_fn, args)
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+            self._cond.notify_all()
+
+    def pending_snapshots(self):
+        """Return (key, args) for every snapshot that has not reached the store yet, oldest first"""
+        with self._cond:
+            snapshots = [self._in_flight] if self._in_flight else []
+            snapshots.extend((key, args) for key, (_, args) in self._pending.items())
+            return snapshots
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is written, returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=None):
+        """Flush and shut the writer thread down"""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                key, (write_fn, args) = self._pending.popitem(last=False)
+                self._in_flight = (key, args)
+                # Room in the queue again
+                self._cond.notify_all()
+
+            self._write(write_fn, args)
+
+            with self._cond:
+                self._in_flight = None
+                self._cond.notify_all()
+
+    def _write(self, write_fn, args):
+        start = time.perf_counter()
+        try:
+            if write_fn(*args) is False:
+                self.errors += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Error in background save: {e}")
+        elapsed = time.perf_counter() - start
+        self.writes += 1
+        self.total_write_time += elapsed
+        self.max_write_time = max(self.max_write_time, elapsed)
+
+    def stats(self):
+        """Return queue depth and write latency counters"""
+        with self._cond:
+            depth = len(self._pending) + (1 if self._in_flight else 0)
+        return {
+            "queue_depth": depth,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "writes": self.writes,
+            "superseded": self.superseded,
+            "errors": self.errors,
+            "avg_write_ms": (self.total_write_time / self.writes * 1000) if self.writes else 0.0,
+            "max_write_ms": self.max_write_time * 1000
+        }
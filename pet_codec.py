@@ -0,0 +1,108 @@
+# pet_codec.py - Compact, versioned binary encoding for pet save records
+
+import struct
+from assets import SPECIES_CODES, RARITY_CODES, TRAIT_CODES, BRANCH_CODES, ACTION_CODES
+
+MAGIC = b"BUDY"
+FORMAT_VERSION = 1
+
+# Header: magic + format version
+_HEADER = struct.Struct("<4sB")
+
+# Version 1 body (fixed layout, 66 bytes):
+#   species, rarity, stage, evolution branch, last action, flags (bit 0 = evolution_ready)
+#   four personality trait slots (0xFF = empty)
+#   hunger, energy, cleanliness, happiness, affection, satisfaction, evolution_timer as doubles
+_BODY_V1 = struct.Struct("<6B4B7d")
+
+_NO_TRAIT = 0xFF
+_MAX_TRAITS = 4
+_FLAG_EVOLUTION_READY = 1
+
+# Reverse lookups for encoding
+_SPECIES_INDEX = {name: i for i, name in enumerate(SPECIES_CODES)}
+_RARITY_INDEX = {name: i for i, name in enumerate(RARITY_CODES)}
+_TRAIT_INDEX = {name: i for i, name in enumerate(TRAIT_CODES)}
+_BRANCH_INDEX = {name: i for i, name in enumerate(BRANCH_CODES)}
+_ACTION_INDEX = {name: i for i, name in enumerate(ACTION_CODES)}
+
+
+def encode_pet(pet_data):
+    """Encode a Buddy.to_dict() payload, raises ValueError if it holds something the format cannot intern"""
+    try:
+        traits = [_TRAIT_INDEX[t] for t in pet_data["personality"]]
+        if len(traits) > _MAX_TRAITS:
+            raise ValueError(f"at most {_MAX_TRAITS} personality traits fit in a pet record")
+        traits += [_NO_TRAIT] * (_MAX_TRAITS - len(traits))
+        flags = _FLAG_EVOLUTION_READY if pet_data["evolution_ready"] else 0
+        body = _BODY_V1.pack(
+            _SPECIES_INDEX[pet_data["species"]],
+            _RARITY_INDEX[pet_data["rarity"]],
+            pet_data["stage"],
+            _BRANCH_INDEX[pet_data["evolution_branch"]],
+            _ACTION_INDEX[pet_data.get("last_action", "idle")],
+            flags,
+            *traits,
+            pet_data["hunger"],
+            pet_data["energy"],
+            pet_data["cleanliness"],
+            pet_data["happiness"],
+            pet_data["affection"],
+            pet_data["satisfaction"],
+            pet_data["evolution_timer"]
+        )
+    except KeyError as e:
+        raise ValueError(f"cannot encode pet field value {e}") from None
+    except struct.error as e:
+        raise ValueError(f"cannot encode pet record: {e}") from None
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + body
+
+
+def _decode_v1(body):
+    (species, rarity, stage, branch, action, flags,
+     t1, t2, t3, t4,
+     hunger, energy, cleanliness, happiness, affection, satisfaction, evolution_timer) = _BODY_V1.unpack(body)
+    return {
+        "species": SPECIES_CODES[species],
+        "rarity": RARITY_CODES[rarity],
+        "personality": [TRAIT_CODES[t] for t in (t1, t2, t3, t4) if t != _NO_TRAIT],
+        "hunger": hunger,
+        "energy": energy,
+        "cleanliness": cleanliness,
+        "happiness": happiness,
+        "affection": affection,
+        "satisfaction": satisfaction,
+        "stage": stage,
+        "evolution_timer": evolution_timer,
+        "evolution_ready": bool(flags & _FLAG_EVOLUTION_READY),
+        "evolution_branch": BRANCH_CODES[branch],
+        "last_action": ACTION_CODES[action]
+    }
+
+
+# Decoders per format version, older versions stay here so old saves keep loading
+_DECODERS = {
+    1: (_BODY_V1.size, _decode_v1)
+}
+
+
+def is_pet_record(blob):
+    """True if blob looks like a binary pet record rather than legacy JSON"""
+    return isinstance(blob, (bytes, bytearray, memoryview)) and bytes(blob[:4]) == MAGIC
+
+
+def decode_pet(blob):
+    """Decode a binary pet record into the same dict shape Buddy.to_dict() produces"""
+    blob = bytes(blob)
+    if len(blob) < _HEADER.size:
+        raise ValueError("pet record is truncated")
+    magic, version = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("not a pet record")
+    if version not in _DECODERS:
+        raise ValueError(f"unsupported pet record version {version}")
+    size, decoder = _DECODERS[version]
+    body = blob[_HEADER.size:]
+    if len(body) != size:
+        raise ValueError(f"pet record has {len(body)} bytes, expected {size}")
+    return decoder(body)
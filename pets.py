@@ -1,22 +1,126 @@
-import random
-import time
-import math
-import os
+import rng
 from assets import PET_ART, RARITY_DEFINITIONS, PERSONALITY_TRAITS
+from art_cache import get_frame
 
 PET_SPECIES = [
     "fuzzball", "glitterpup", "slimey", 
     "starwhisker", "dragonling", "nebulite"
 ]
 
+# Buddy fields that live in a CollectionEngine column once the buddy is attached to one,
+# in column order. Bool fields are stored as 0/1.
+ROW_FIELDS = (
+    "hunger", "energy", "cleanliness", "happiness", "affection",
+    "evolution_timer", "stage", "evolution_ready", "dirty"
+)
+
+
+class _RowField:
+    """Buddy attribute stored on the buddy itself, or in its engine row once attached"""
+
+    __slots__ = ("index", "cast")
+
+    def __init__(self, index, cast=None):
+        self.index = index
+        self.cast = cast
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        engine = obj._engine
+        if engine is None:
+            return obj._values[self.index]
+        value = engine.columns[self.index][obj._row]
+        return value if self.cast is None else self.cast(value)
+
+    def __set__(self, obj, value):
+        engine = obj._engine
+        if engine is None:
+            obj._values[self.index] = value
+        else:
+            engine.columns[self.index][obj._row] = value
+
+
+def format_personality(traits):
+    """Get display string for a list of personality traits"""
+    return ", ".join([trait.replace("_", " ").title() for trait in traits])
+
+# (species, stage) pairs render_art() already warned about
+_missing_art = set()
+
+def render_art(pet, blink=0, breath_offset=1):
+    """ASCII art for anything with a buddy's species/rarity/stage/mood fields (a Buddy or a UI snapshot of one)"""
+    # Determine which art to use
+    art_key = "idle"
+    if pet.last_action == "feed":
+        art_key = "eating"
+    elif pet.last_action == "play":
+        art_key = "bouncing" if pet.species == "slimey" else "breathing"
+    elif pet.last_action == "pet" and pet.affection > 75:
+        art_key = "purring"
+    elif pet.energy < 30:
+        art_key = "sleeping"
+    
+    # Adults show their evolution branch instead of a pose
+    stage = pet.stage if pet.stage in (1, 2) else 3
+    if stage == 3:
+        art_key = pet.evolution_branch or "joy"
+    
+    # Every frame is pre-rendered, see art_cache.py
+    zzz = pet.energy < 30 or art_key == "sleeping"
+    frame = get_frame(pet.species, pet.rarity, stage, art_key, blink, breath_offset, zzz)
+    if frame is None:
+        # Said once per species/stage, this runs on every animation frame
+        if (pet.species, pet.stage) not in _missing_art:
+            _missing_art.add((pet.species, pet.stage))
+            print(f"Missing art for {pet.species}/{pet.rarity}/stage {pet.stage}")
+        return "🐾"
+    return frame
+
 class Buddy:
+    # Fields that end up in the save file, writing a new value to any of them marks the buddy dirty
+    _PERSISTED_FIELDS = frozenset((
+        "species", "rarity", "personality",
+        "hunger", "energy", "cleanliness", "happiness", "affection", "satisfaction",
+        "stage", "evolution_timer", "evolution_ready", "evolution_branch", "last_action"
+    ))
+    # Fields the cached decay rates and evolution config are derived from
+    _RATE_FIELDS = frozenset(("rarity", "personality", "stage"))
+
+    __slots__ = (
+        "species", "rarity", "personality", "satisfaction",
+        "evolution_branch", "last_action",
+        # Caches, see get_decay_rates() and get_evolution_config()
+        "_decay_rates", "_evolution_config",
+        # Backing storage for the ROW_FIELDS: a local list, or a row in a CollectionEngine
+        "_values", "_engine", "_row"
+    )
+
+    # Stats, evolution progress and the dirty flag, see _RowField
+    hunger = _RowField(0)
+    energy = _RowField(1)
+    cleanliness = _RowField(2)
+    happiness = _RowField(3)
+    affection = _RowField(4)
+    evolution_timer = _RowField(5)
+    stage = _RowField(6)
+    evolution_ready = _RowField(7, bool)
+    dirty = _RowField(8, bool)
+
     def __init__(self, species=None, rarity=None, personality=None, from_data=None):
+        object.__setattr__(self, "_values", [0, 0, 0, 0, 0, 0, 1, False, True])
+        object.__setattr__(self, "_engine", None)
+        object.__setattr__(self, "_row", None)
+        # A brand new buddy has never been written to disk
+        self.dirty = True
+        self._decay_rates = None
+        self._evolution_config = None
         if from_data:
             self.load_from_data(from_data)
             return
             
         # Random generation if not loaded
-        self.species = species or random.choice(PET_SPECIES)
+        self.species = species or rng.get(rng.ADOPTION).choice(PET_SPECIES)
         self.rarity = rarity or self._determine_rarity()
         self.personality = personality or self._determine_personality()
         
@@ -36,16 +140,52 @@ class Buddy:
         self.evolution_ready = False
         self.evolution_branch = None
         
-        # Visual state/interaction 
-        self.blink_state = 0  # 0=open, 1=blink
-        self.last_blink = time.time()
-        self.last_breath = time.time()
-        self.breath_phase = 0
+        # Last interaction, picks the pose
         self.last_action = "idle"
         
         # Apply rarity and personality bonuses
         self.apply_rarity_bonus()
-        self.decay_multipliers = self.get_decay_multipliers()
+
+    def __setattr__(self, name, value):
+        """Track changes to persisted fields so autosave only writes when something changed"""
+        if name in self._PERSISTED_FIELDS and getattr(self, name, None) != value:
+            object.__setattr__(self, "dirty", True)
+            if name in self._RATE_FIELDS:
+                # Decay rates and evolution config depend on this, rebuild them on next use
+                object.__setattr__(self, "_decay_rates", None)
+                object.__setattr__(self, "_evolution_config", None)
+                if self._engine is not None:
+                    self._engine.mark_stale(self._row)
+        object.__setattr__(self, name, value)
+
+    def attach(self, engine, row):
+        """Move the row fields into `engine` row `row`, called by CollectionEngine.attach()"""
+        for index, value in enumerate(self._values):
+            engine.columns[index][row] = value
+        object.__setattr__(self, "_engine", engine)
+        object.__setattr__(self, "_row", row)
+        object.__setattr__(self, "_values", None)
+
+    def detach(self):
+        """Copy the row fields back onto the buddy, called by CollectionEngine.detach()"""
+        values = [getattr(self, name) for name in ROW_FIELDS]
+        object.__setattr__(self, "_engine", None)
+        object.__setattr__(self, "_row", None)
+        object.__setattr__(self, "_values", values)
+
+    def __getstate__(self):
+        # Slots plus row fields, so a buddy pickles the same whether or not it is attached
+        state = {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+        state.update(_values=[getattr(self, name) for name in ROW_FIELDS], _engine=None, _row=None)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def mark_clean(self):
+        """Mark the buddy as matching what is on disk"""
+        object.__setattr__(self, "dirty", False)
     
     def _determine_rarity(self):
         """Determine rarity based on weighted chances"""
@@ -55,7 +195,7 @@ class Buddy:
             choices = []
             for rarity, data in RARITY_DEFINITIONS.items():
                 choices.extend([rarity] * data["chance"])
-            return random.choice(choices)
+            return rng.get(rng.ADOPTION).choice(choices)
 
         # Build weighted list only from available rarities
         choices = []
@@ -65,15 +205,16 @@ class Buddy:
 
         if not choices:
             # As a final fallback which should not be called , pick any available rarity
-            return random.choice(available)
+            return rng.get(rng.ADOPTION).choice(available)
 
-        return random.choice(choices)
+        return rng.get(rng.ADOPTION).choice(choices)
     
     def _determine_personality(self):
         """Determine 1-2 personality traits"""
         traits = list(PERSONALITY_TRAITS.keys())
-        num_traits = random.choice([1, 1, 2])  # More likely to have 1 trait
-        return random.sample(traits, num_traits)
+        adoption = rng.get(rng.ADOPTION)
+        num_traits = adoption.choice([1, 1, 2])  # More likely to have 1 trait
+        return adoption.sample(traits, num_traits)
     
     def apply_rarity_bonus(self):
         """Apply stat bonuses based on rarity"""
@@ -125,24 +266,74 @@ class Buddy:
         
         return multipliers
     
+    @property
+    def decay_multipliers(self):
+        return self.get_decay_multipliers()
+
+    def get_decay_rates(self):
+        """Per-second decay for hunger, energy, cleanliness, happiness and affection.
+
+        Cached until stage, rarity or personality changes.
+        """
+        rates = self._decay_rates
+        if rates is None:
+            multipliers = self.get_decay_multipliers()
+            # Base decay per minute, sped up for gameplay and scaled to per second
+            per_second = self.DECAY_SPEED_MULTIPLIER / 60
+            rates = (
+                3 * per_second * multipliers["hunger_decay"],
+                4 * per_second * multipliers["energy_decay"],
+                2 * per_second * multipliers["cleanliness_decay"],
+                3 * per_second * multipliers["happiness_decay"],
+                1 * per_second * multipliers["affection_decay"]
+            )
+            object.__setattr__(self, "_decay_rates", rates)
+        return rates
+
+    def seconds_until_visible_change(self, precision=0.1, thresholds=(30, 60)):
+        """Seconds of decay until something on screen changes, or None if nothing ever will.
+
+        Looks at the next `precision` step of each displayed stat, the bar colour
+        thresholds and the moment the evolution timer runs out.
+        """
+        soonest = None
+        values = (self.hunger, self.energy, self.cleanliness, self.happiness, self.affection)
+        for value, rate in zip(values, self.get_decay_rates()):
+            if rate <= 0 or value <= 0:
+                continue
+            # The shown value drops one step once the stat falls below the rounding boundary
+            boundary = max(0, round(value / precision) * precision - precision / 2)
+            candidates = [(value - boundary) / rate]
+            candidates.extend((value - t) / rate for t in thresholds if value >= t)
+            wait = min(candidates)
+            if soonest is None or wait < soonest:
+                soonest = wait
+
+        if self.stage < 3 and not self.evolution_ready:
+            evolution_time, stat_threshold = self.get_evolution_config()
+            if self.get_stat_average() >= stat_threshold:
+                wait = max(0, evolution_time - self.evolution_timer)
+                if soonest is None or wait < soonest:
+                    soonest = wait
+        return soonest
+
     def get_stat_average(self):
         """Calculate average of visible stats"""
         return (self.hunger + self.energy + self.cleanliness + self.happiness) / 4
     
-    def update_evolution_status(self, elapsed_seconds):
-        """Check if pet is ready to evolve"""
-        current_avg = self.get_stat_average()
+    def get_evolution_config(self):
+        """Return (evolution_time, stat_threshold) for this pet, cached until its rarity changes.
+
+        Dev mode speeds up the game clock (see game_clock.py) instead of changing these.
+        """
+        if self._evolution_config is not None:
+            return self._evolution_config
+
         # Normal evolution time (in seconds) defined per rarity in assets
         evolution_time = RARITY_DEFINITIONS[self.rarity]["evolution_time"]
 
-        # FAST_EVOLVE override for testing/DEV shorten required time and lower stat threshold
-        fast_flag = os.getenv("FAST_EVOLVE", "0").lower() in ("1", "true", "yes")
-        if fast_flag:
-            evolution_time = 5  # 5 seconds to evolve for testing
-            stat_threshold = 30
-        else:
-            # Slightly easier require a lower average so evolution occurs sooner
-            stat_threshold = 50
+        # Slightly easier require a lower average so evolution occurs sooner
+        stat_threshold = 50
 
         # Make evolution faster across rarities (non-testing) for better responsiveness
         try:
@@ -151,6 +342,14 @@ class Buddy:
         except Exception:
             pass
 
+        object.__setattr__(self, "_evolution_config", (evolution_time, stat_threshold))
+        return evolution_time, stat_threshold
+
+    def update_evolution_status(self, elapsed_seconds):
+        """Check if pet is ready to evolve"""
+        current_avg = self.get_stat_average()
+        evolution_time, stat_threshold = self.get_evolution_config()
+
         # Reset timer if stats drop below threshold
         if current_avg < stat_threshold:
             self.evolution_timer = 0
@@ -206,9 +405,6 @@ class Buddy:
         self.cleanliness = min(100, self.cleanliness + bonus)
         self.happiness = min(100, self.happiness + bonus)
         
-        # Update the decay multipliers
-        self.decay_multipliers = self.get_decay_multipliers()
-        
         return True
     
     def apply_action(self, action_type):
@@ -258,127 +454,57 @@ class Buddy:
         
         return False
     
+    def catch_up(self, elapsed_seconds):
+        """Apply decay for time spent away (e.g. since the last save) in one O(1) step.
+
+        Decay is linear and clamped at 0, so applying it once for the whole gap gives the
+        same stats as ticking apply_decay the entire time. The stats only ever fall while
+        away, so the average is lowest at the end: if it is still above the evolution
+        threshold then it was above it at every tick and the timer simply gains the whole
+        gap, otherwise the last tick reset it. apply_decay already does exactly that.
+
+        The one difference is the evolution branch. Ticking picks it on every tick the pet
+        is ready, so a pet that got ready and then dropped below the threshold keeps the
+        branch from its last ready tick. Here it keeps the branch it had before the gap.
+        Neither is ever shown, since the branch is picked again whenever the pet gets
+        ready and only adults display it.
+        """
+        if elapsed_seconds <= 0:
+            return
+        self.apply_decay(elapsed_seconds)
+
     def apply_decay(self, elapsed_seconds):
         """Apply natural stat decay"""
-        # Base decay rates per minute, scaled to elapsed seconds
-        base_decay = {
-            "hunger": 3 * elapsed_seconds / 60,
-            "energy": 4 * elapsed_seconds / 60,
-            "cleanliness": 2 * elapsed_seconds / 60,
-            "happiness": 3 * elapsed_seconds / 60,
-            "affection": 1 * elapsed_seconds / 60
-        }
-        # Speed up global decay to make gameplay more responsive and fast paced
-        for k in base_decay:
-            base_decay[k] *= self.DECAY_SPEED_MULTIPLIER
-        
-        # Apply personality multipliers
-        decay_rates = {
-            "hunger": base_decay["hunger"] * self.decay_multipliers["hunger_decay"],
-            "energy": base_decay["energy"] * self.decay_multipliers["energy_decay"],
-            "cleanliness": base_decay["cleanliness"] * self.decay_multipliers["cleanliness_decay"],
-            "happiness": base_decay["happiness"] * self.decay_multipliers["happiness_decay"],
-            "affection": base_decay["affection"] * self.decay_multipliers["affection_decay"]
-        }
+        # Per-second rates already include the speed and personality/stage multipliers
+        hunger, energy, cleanliness, happiness, affection = self._decay_rates or self.get_decay_rates()
         
         # Apply decay
-        self.hunger = max(0, self.hunger - decay_rates["hunger"])
-        self.energy = max(0, self.energy - decay_rates["energy"])
-        self.cleanliness = max(0, self.cleanliness - decay_rates["cleanliness"])
-        self.happiness = max(0, self.happiness - decay_rates["happiness"])
-        self.affection = max(0, self.affection - decay_rates["affection"])
+        self.hunger = max(0, self.hunger - hunger * elapsed_seconds)
+        self.energy = max(0, self.energy - energy * elapsed_seconds)
+        self.cleanliness = max(0, self.cleanliness - cleanliness * elapsed_seconds)
+        self.happiness = max(0, self.happiness - happiness * elapsed_seconds)
+        self.affection = max(0, self.affection - affection * elapsed_seconds)
         
         # Update evolution status
         self.update_evolution_status(elapsed_seconds)
     
-    def get_ascii_art(self, current_theme):
-        """Get appropriate ASCII art based on state"""
-        now = time.time()
-        
-        # Blinking (every 3-5 seconds)
-        if now - self.last_blink > random.uniform(3, 5):
-            self.blink_state = 1 - self.blink_state
-            self.last_blink = now
-        
-        # Handle breathing animation
-        if now - self.last_breath > 0.5:  # Update every 0.5 seconds
-            self.breath_phase = (self.breath_phase + 0.2) % (2 * math.pi)
-            self.last_breath = now
-        
-        # Determine which art to use
-        art_key = "idle"
-        if self.last_action == "feed":
-            art_key = "eating"
-        elif self.last_action == "play":
-            art_key = "bouncing" if self.species == "slimey" else "breathing"
-        elif self.last_action == "pet" and self.affection > 75:
-            art_key = "purring"
-        elif self.energy < 30:
-            art_key = "sleeping"
-        
-        # This section is mostly for fallback purposes
-        try:
-            # If the exact rarity doesn't exist for this species, fall back to any available rarity.
-            species_art = PET_ART.get(self.species, {})
-            if self.rarity in species_art:
-                art_set = species_art[self.rarity]
-            else:
-                # choose a fallback rarity (prefer common->uncommon->rare order if present)
-                fallback = next(iter(species_art.keys()), None)
-                if fallback:
-                    art_set = species_art[fallback]
-                    print(f"Warning: using fallback rarity '{fallback}' for {self.species} (requested '{self.rarity}')")
-                else:
-                    raise KeyError(f"no art for species {self.species}")
-            
-            # Stage-specific art for evolution showcase
-            if self.stage == 1:
-                art_set = art_set["baby"]
-            elif self.stage == 2:
-                art_set = art_set["child"]
-            else:  # stage 3
-                art_set = art_set["adult"]
-                art_key = self.evolution_branch or "joy"
-            
-            # Use blink art if needed
-            if self.blink_state == 1 and "blink" in art_set:
-                lines = art_set["blink"]
-            else:
-                # Try requested key, then fall back to any available art in this stage
-                lines = art_set.get(art_key)
-                if lines is None:
-                    # pick the first available art variant for this stage
-                    try:
-                        lines = next(iter(art_set.values()))
-                    except StopIteration:
-                        raise KeyError(f"no art variants for {self.species}/{self.rarity}/{self.stage}")
-            
-            # Apply breathing effect
-            breath_offset = int(1.5 * (1 + math.sin(self.breath_phase)))
-            breathed_lines = []
-            
-            for line in lines:
-                # Don't add breathing effect to lines that are already at max width
-                if len(line) + 2 * breath_offset > max(len(l) for l in lines) + 2:
-                    breathed_lines.append(line)
-                else:
-                    breathed_lines.append(" " * breath_offset + line + " " * breath_offset)
-            
-            # Add Zzz if sleeping
-            if self.energy < 30 or art_key == "sleeping":
-                return "   Z z z…\n" + "\n".join(breathed_lines)
-            
-            return "\n".join(breathed_lines)
-        except KeyError as e:
-            print(f"Missing art for {self.species}/{self.rarity}/stage {self.stage}: {e}")
-            return "🐾"
-        except Exception as e:
-            print(f"Error getting ASCII art: {e}")
-            return "🐾"
+    def get_ascii_art(self, current_theme, blink=0, breath_offset=1):
+        """Get appropriate ASCII art based on state, blink/breath_offset come from the UI's animation timeline"""
+        return render_art(self, blink, breath_offset)
     
     def get_personality_display(self):
         """Get display string for personality traits"""
-        return ", ".join([trait.replace("_", " ").title() for trait in self.personality])
+        return format_personality(self.personality)
+
+    def get_summary(self):
+        """Small description used by the collection lists so they never need a full Buddy"""
+        return {
+            "species": self.species,
+            "rarity": self.rarity,
+            "stage": self.stage,
+            "evolution_branch": self.evolution_branch,
+            "personality": list(self.personality)
+        }
     
     def to_dict(self):
         """Convert pet to dictionary for saving"""
@@ -396,10 +522,6 @@ class Buddy:
             "evolution_timer": self.evolution_timer,
             "evolution_ready": self.evolution_ready,
             "evolution_branch": self.evolution_branch,
-            "blink_state": self.blink_state,
-            "last_blink": self.last_blink,
-            "last_breath": getattr(self, "last_breath", time.time()),
-            "breath_phase": getattr(self, "breath_phase", 0),
             "last_action": self.last_action
         }
     
@@ -418,9 +540,6 @@ class Buddy:
         self.evolution_timer = data["evolution_timer"]
         self.evolution_ready = data["evolution_ready"]
         self.evolution_branch = data["evolution_branch"]
-        self.blink_state = data.get("blink_state", 0)
-        self.last_blink = data.get("last_blink", time.time())
-        self.last_breath = data.get("last_breath", time.time())
-        self.breath_phase = data.get("breath_phase", 0)
         self.last_action = data.get("last_action", "idle")
-        self.decay_multipliers = self.get_decay_multipliers()
\ No newline at end of file
+        # Freshly loaded data matches the save file
+        self.mark_clean()
\ No newline at end of file
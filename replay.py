@@ -0,0 +1,365 @@
+# replay.py - Record a play session to a compact binary log and re-run it headless
+#
+#   BUDDY_RECORD=session.bud python main.py     # play, the log is written as you go
+#   python -m replay session.bud                 # re-run it at full speed and check the result
+#
+# The log starts with the session seed and the state the session started from, followed by
+# one small record per decay tick and per player input (care actions, adoptions, evolutions,
+# claims, ...). Every bit of randomness comes from the rng streams, so replaying the inputs
+# against the same seed and starting state gives exactly the same buddies and stats. The
+# recorder ends the log with a digest of the final state, replay compares against it.
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+import rng
+from assets import ACTION_CODES
+from autosave import PRIORITY_CRITICAL
+from game_state import GameState
+from pets import Buddy
+from save_store import MemoryStore
+
+MAGIC = b"BUDR"
+FORMAT_VERSION = 1
+
+# Header: magic, format version, session seed, length of the zlib'd JSON start state
+_HEADER = struct.Struct("<4sBQI")
+
+# Record types
+TICK = 1          # decay seconds (d)
+ROLL = 2          # pet index (H) + id, a new buddy shown for adoption
+ADOPT = 3         # the rolled buddy was kept
+ACTION = 4        # pet index (H), action code (B)
+EVOLVE = 5        # pet index (H)
+SWITCH = 6        # pet index (H)
+CLAIM = 7         # achievement id
+BUY_ROLL = 8
+HAPPINESS = 9     # pet index (H), new happiness (d), set by Bubble Pop
+BUBBLE_EARN = 10  # amount (i)
+EARN = 11         # amount (i)
+DAILY_BONUS = 12  # amount (i)
+END = 13          # sha256 of the final state
+
+_TYPE = struct.Struct("<B")
+_PET = struct.Struct("<H")
+_DOUBLE = struct.Struct("<d")
+_AMOUNT = struct.Struct("<i")
+_STR_LEN = struct.Struct("<H")
+_ACTION_INDEX = {name: i for i, name in enumerate(ACTION_CODES)}
+
+
+def state_digest(game_state):
+    """sha256 over everything a replay must reproduce exactly (wall-clock driven fields are left out)"""
+    pets = {pet_id: buddy.to_dict() for pet_id, buddy in game_state.load_pets(game_state.pet_collection)}
+    achievements = {key: value for key, value in game_state.achievements.items() if key != "night_play"}
+    payload = {
+        "buddy_bucks": game_state.buddy_bucks,
+        "gacha_rolls": game_state.gacha_rolls,
+        "pet_collection": game_state.pet_collection,
+        "achievements": achievements,
+        "pets": pets
+    }
+    # repr keeps every bit of the floats
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")).digest()
+
+
+def start_state(game_state, current_pet_id=None):
+    """What a recording starts from: the saved game, every collection pet and the current pet"""
+    pets = {pet_id: buddy.to_dict() for pet_id, buddy in game_state.load_pets(game_state.pet_collection)}
+    return {"game": game_state.get_save_data(), "pets": pets, "current": current_pet_id}
+
+
+class SessionRecorder:
+    """
+    Appends session events to a binary log. Every method is a no-op when recording is off,
+    so the game can call them unconditionally. Safe to call from the game loop and Tk threads.
+    """
+
+    def __init__(self, path=None, game_state=None, current_pet_id=None, seed=None):
+        self.enabled = path is not None
+        self._lock = threading.Lock()
+        self._pets = {}  # pet_id -> index
+        self.events = 0
+        if not self.enabled:
+            return
+        # Reseed so the log's seed covers every draw from here on
+        self.seed = rng.seed_all(seed)
+        state = start_state(game_state, current_pet_id)
+        for pet_id in state["pets"]:
+            self._pets[pet_id] = len(self._pets)
+        packed = zlib.compress(json.dumps(state).encode("utf-8"))
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.seed, len(packed)) + packed)
+
+    @classmethod
+    def from_env(cls, game_state, current_pet_id=None):
+        """Record to $BUDDY_RECORD if it is set, otherwise a disabled recorder"""
+        path = os.getenv("BUDDY_RECORD")
+        if not path:
+            return cls()
+        try:
+            return cls(path, game_state, current_pet_id, rng.session_seed())
+        except Exception as e:
+            print(f"Error starting session recording: {e}")
+            return cls()
+
+    def _write(self, kind, payload=b""):
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                self._file.write(_TYPE.pack(kind) + payload)
+                self.events += 1
+            except Exception as e:
+                print(f"Error recording session: {e}")
+                self.enabled = False
+
+    def _pet(self, pet_id):
+        return _PET.pack(self._pets[pet_id])
+
+    def tick(self, seconds):
+        self._write(TICK, _DOUBLE.pack(seconds))
+
+    def roll(self, pet_id):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pets.setdefault(pet_id, len(self._pets))
+        self._write(ROLL, self._pet(pet_id) + _encode_str(pet_id))
+
+    def adopt(self):
+        self._write(ADOPT)
+
+    def action(self, pet_id, action):
+        if self.enabled and pet_id in self._pets:
+            self._write(ACTION, self._pet(pet_id) + _TYPE.pack(_ACTION_INDEX[action]))
+
+    def evolve(self, pet_id):
+        if self.enabled and pet_id in self._pets:
+            self._write(EVOLVE, self._pet(pet_id))
+
+    def switch(self, pet_id):
+        if self.enabled and pet_id in self._pets:
+            self._write(SWITCH, self._pet(pet_id))
+
+    def claim(self, aid):
+        self._write(CLAIM, _encode_str(aid))
+
+    def buy_roll(self):
+        self._write(BUY_ROLL)
+
+    def happiness(self, pet_id, value):
+        if self.enabled and pet_id in self._pets:
+            self._write(HAPPINESS, self._pet(pet_id) + _DOUBLE.pack(value))
+
+    def bubble_earn(self, amount):
+        self._write(BUBBLE_EARN, _AMOUNT.pack(amount))
+
+    def earn(self, amount):
+        self._write(EARN, _AMOUNT.pack(amount))
+
+    def daily_bonus(self, amount):
+        self._write(DAILY_BONUS, _AMOUNT.pack(amount))
+
+    def close(self, game_state):
+        """Finish the log with the final state digest"""
+        if not self.enabled:
+            return
+        self._write(END, state_digest(game_state))
+        with self._lock:
+            self.enabled = False
+            self._file.close()
+
+
+def _encode_str(text):
+    data = text.encode("utf-8")
+    return _STR_LEN.pack(len(data)) + data
+
+
+class Session:
+    """
+    Headless stand-in for the game window: applies recorded events to a GameState the same
+    way main.py applies the player's input.
+    """
+
+    def __init__(self, state, seed):
+        rng.seed_all(seed)
+        store = MemoryStore()
+        store.game = state["game"]
+        # No last_saved, so nothing catches up on time away
+        store.pets = {pet_id: {"pet_data": data, "last_saved": None} for pet_id, data in state["pets"].items()}
+        self.game_state = GameState(store=store, background_saves=False)
+        self.pet_ids = list(state["pets"])
+        self.current_pet_id = state.get("current")
+        self.current_pet = self.game_state.load_pet(self.current_pet_id) if self.current_pet_id else None
+
+    def _pet(self, index):
+        pet_id = self.pet_ids[index]
+        if pet_id == self.current_pet_id:
+            return self.current_pet
+        return self.game_state.load_pet(pet_id)
+
+    def tick(self, seconds):
+        self.game_state.decay_collection(seconds)
+        # A buddy still being adopted is not in the collection yet
+        if self.current_pet and not self.game_state.engine.owns(self.current_pet):
+            self.current_pet.apply_decay(seconds)
+
+    def roll(self, index, pet_id):
+        while len(self.pet_ids) <= index:
+            self.pet_ids.append(None)
+        self.pet_ids[index] = pet_id
+        self.current_pet = Buddy()
+        self.current_pet_id = pet_id
+
+    def adopt(self):
+        if self.game_state.use_gacha_roll():
+            self.game_state.add_pet_to_collection(self.current_pet_id, self.current_pet)
+            self.game_state.mark_pet_dirty(self.current_pet_id, self.current_pet, PRIORITY_CRITICAL)
+
+    def action(self, index, action):
+        if self._pet(index).apply_action(action):
+            self.game_state.award_satisfaction()
+
+    def evolve(self, index):
+        if self._pet(index).evolve():
+            self.game_state.award_evolution()
+
+    def switch(self, index):
+        pet = self.game_state.load_pet(self.pet_ids[index])
+        if pet:
+            self.current_pet, self.current_pet_id = pet, self.pet_ids[index]
+
+    def claim(self, aid):
+        self.game_state.claim_achievement(aid)
+
+    def buy_roll(self):
+        if self.game_state.buddy_bucks >= 50:
+            self.game_state.buddy_bucks -= 50
+            self.game_state.gacha_rolls += 1
+            self.game_state.save_game(PRIORITY_CRITICAL)
+
+    def happiness(self, index, value):
+        self._pet(index).happiness = value
+
+    def bubble_earn(self, amount):
+        self.game_state.record_bubble_earn(amount)
+        self.game_state.earn_bucks(amount)
+
+    def earn(self, amount):
+        self.game_state.buddy_bucks += amount
+        self.game_state.force_save()
+
+    def daily_bonus(self, amount):
+        self.game_state.buddy_bucks += amount
+        self.game_state.save_game()
+
+
+def _read_str(data, offset):
+    (length,) = _STR_LEN.unpack_from(data, offset)
+    offset += _STR_LEN.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def replay(path):
+    """Re-run a recorded session, returns (session, stats) where stats holds counts, timing and the digest check"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError("session log is truncated")
+    magic, version, seed, state_size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a session log")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported session log version {version}")
+    offset = _HEADER.size
+    state = json.loads(zlib.decompress(data[offset:offset + state_size]))
+    offset += state_size
+
+    session = Session(state, seed)
+    events = ticks = 0
+    expected = None
+    started = time.perf_counter()
+    while offset < len(data):
+        (kind,) = _TYPE.unpack_from(data, offset)
+        offset += _TYPE.size
+        events += 1
+        if kind == TICK:
+            (seconds,) = _DOUBLE.unpack_from(data, offset)
+            offset += _DOUBLE.size
+            session.tick(seconds)
+            ticks += 1
+        elif kind == ROLL:
+            (index,) = _PET.unpack_from(data, offset)
+            pet_id, offset = _read_str(data, offset + _PET.size)
+            session.roll(index, pet_id)
+        elif kind == ADOPT:
+            session.adopt()
+        elif kind == ACTION:
+            index, action = struct.unpack_from("<HB", data, offset)
+            offset += 3
+            session.action(index, ACTION_CODES[action])
+        elif kind in (EVOLVE, SWITCH):
+            (index,) = _PET.unpack_from(data, offset)
+            offset += _PET.size
+            (session.evolve if kind == EVOLVE else session.switch)(index)
+        elif kind == CLAIM:
+            aid, offset = _read_str(data, offset)
+            session.claim(aid)
+        elif kind == BUY_ROLL:
+            session.buy_roll()
+        elif kind == HAPPINESS:
+            index, value = struct.unpack_from("<Hd", data, offset)
+            offset += 10
+            session.happiness(index, value)
+        elif kind in (BUBBLE_EARN, EARN, DAILY_BONUS):
+            (amount,) = _AMOUNT.unpack_from(data, offset)
+            offset += _AMOUNT.size
+            {BUBBLE_EARN: session.bubble_earn, EARN: session.earn, DAILY_BONUS: session.daily_bonus}[kind](amount)
+        elif kind == END:
+            expected = data[offset:offset + 32]
+            offset += 32
+        else:
+            raise ValueError(f"unknown session record type {kind} at byte {offset - 1}")
+    wall_seconds = time.perf_counter() - started
+
+    digest = state_digest(session.game_state)
+    return session, {
+        "seed": seed,
+        "events": events,
+        "ticks": ticks,
+        "wall_seconds": wall_seconds,
+        "digest": digest.hex(),
+        # None if the recording was cut short before its END record
+        "matches": None if expected is None else digest == expected
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m replay", description="Re-run a recorded session headless")
+    parser.add_argument("log", help="session log written with BUDDY_RECORD=<path>")
+    args = parser.parse_args(argv)
+    try:
+        session, stats = replay(args.log)
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"Error replaying {args.log}: {e}")
+        return 2
+    game_state = session.game_state
+    print(f"Replayed {stats['events']:,} events ({stats['ticks']:,} ticks) in {stats['wall_seconds']:.3f} s, seed {stats['seed']}")
+    print(f"Final: {game_state.buddy_bucks} Buddy Bucks, {game_state.gacha_rolls} rolls, {len(game_state.pet_collection)} buddies")
+    print(f"Digest {stats['digest']}")
+    if stats["matches"] is None:
+        print("No final digest in the log (session did not close cleanly), nothing to compare")
+        return 0
+    print("Matches the recorded session" if stats["matches"] else "MISMATCH with the recorded session")
+    return 0 if stats["matches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# rng.py - Separate seeded random streams per subsystem, so sessions can be reproduced
+
+import os
+import random
+
+# One stream per subsystem, drawing from one never shifts the numbers another one sees
+ADOPTION = "adoption"    # Species, rarity and personality of new buddies
+ANIMATION = "animation"  # Blink timing
+BUBBLES = "bubbles"      # Bubble Pop spawning
+STREAMS = (ADOPTION, ANIMATION, BUBBLES)
+
+_streams = {name: random.Random() for name in STREAMS}
+_seed = None
+
+
+def seed_all(seed=None):
+    """Reseed every stream from one session seed (random if None), returns the seed used"""
+    global _seed
+    if seed is None:
+        seed = int.from_bytes(os.urandom(8), "little")
+    _seed = seed
+    for name, stream in _streams.items():
+        # String seeds are hashed, so every stream gets an unrelated sequence
+        stream.seed(f"{seed}:{name}")
+    return seed
+
+
+def get(name):
+    """The random.Random for a subsystem, keep using the same object, seed_all() reseeds it in place"""
+    return _streams[name]
+
+
+def session_seed():
+    return _seed
+
+
+def _env_seed():
+    try:
+        return int(os.environ["BUDDY_SEED"])
+    except (KeyError, ValueError):
+        return None
+
+
+# BUDDY_SEED=<int> makes a whole session reproducible
+seed_all(_env_seed())
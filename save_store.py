@@ -0,0 +1,627 @@
+# save_store.py - Crash-safe storage for the game state and pet saves
+
+import base64
+import copy
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from pet_codec import encode_pet, decode_pet, is_pet_record
+
+# Sentinel so a missing key never compares equal to a stored None
+_MISSING = object()
+
+
+def _pack_pet(pet_data):
+    """Binary pet record as base64 text for the JSON journal, None if the format cannot hold it"""
+    try:
+        return base64.b64encode(encode_pet(pet_data)).decode("ascii")
+    except ValueError:
+        return None
+
+
+def _unpack_pet(text):
+    return decode_pet(base64.b64decode(text))
+
+
+class JournalStore:
+    """
+    Snapshot plus append-only journal kept under the saves folder.
+
+    Every save appends one small JSON line: the game state fields (or the entries of its
+    dicts and lists) that changed since the last save, or a pet's binary record (see
+    pet_codec.py) as base64. A crash can at worst lose the line being written (which is
+    skipped on the next start) instead of truncating the whole save file. Once the journal grows
+    past `compact_every` records it is folded into a fresh snapshot on a background thread.
+    """
+
+    SNAPSHOT_NAME = "snapshot.json"
+    JOURNAL_NAME = "journal.log"
+
+    def __init__(self, save_dir, compact_every=500):
+        self.save_dir = save_dir
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(save_dir, self.SNAPSHOT_NAME)
+        self.journal_path = os.path.join(save_dir, self.JOURNAL_NAME)
+        os.makedirs(save_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.game = None  # Last known game state dict (None if never saved)
+        self.pets = {}    # pet_id -> {"pet_data": {...}, "last_saved": float}
+        self._seq = 0     # Sequence number of the last record written or replayed
+        self._journal_records = 0
+        self._compaction_thread = None
+        self._pending_lines = None  # Lines appended while a compaction is running
+
+        migrated = self._replay()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if migrated:
+            # Capture the old one-file-per-save layout in a snapshot straight away
+            self.compact()
+
+    # Loading
+
+    def _replay(self):
+        """Load the snapshot then apply every journal record written after it"""
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                self.game = snapshot.get("game")
+                for pet_id, entry in snapshot.get("pets", {}).items():
+                    pet_data = _unpack_pet(entry["b"]) if "b" in entry else entry["pet_data"]
+                    self.pets[pet_id] = {"pet_data": pet_data, "last_saved": entry.get("last_saved")}
+                snapshot_seq = snapshot.get("seq", 0)
+            except Exception as e:
+                print(f"Error loading save snapshot: {e}")
+        self._seq = snapshot_seq
+
+        replayed = self._replay_journal(snapshot_seq)
+        if self.game is None and not self.pets and not replayed:
+            return self._load_legacy()
+        return False
+
+    def _replay_journal(self, snapshot_seq):
+        """Apply journal records newer than the snapshot, dropping a torn last line"""
+        if not os.path.exists(self.journal_path):
+            return False
+
+        replayed = False
+        good_offset = 0
+        with open(self.journal_path, "rb") as f:
+            for raw in f:
+                try:
+                    if not raw.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(raw)
+                except ValueError:
+                    # Everything after a torn write is unusable, stop here
+                    print("Warning: skipping incomplete save journal record")
+                    break
+                good_offset += len(raw)
+                self._journal_records += 1
+                if record.get("seq", 0) <= snapshot_seq:
+                    continue
+                self._apply(record)
+                self._seq = record["seq"]
+                replayed = True
+
+        # Cut off the torn tail so new records are appended after the last good one
+        if good_offset < os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_offset)
+        return replayed
+
+    def _apply(self, record):
+        """Apply a single journal record to the in-memory state"""
+        if record["t"] == "game":
+            self._apply_game(record)
+        elif record["t"] == "pet":
+            if "b" in record:
+                self._apply_pet(record["id"], _unpack_pet(record["b"]), record.get("ts"), replace=True)
+            else:
+                self._apply_pet(record["id"], record["d"], record.get("ts"))
+        elif record["t"] == "pets":
+            for pet_id, packed in record.get("b", {}).items():
+                self._apply_pet(pet_id, _unpack_pet(packed), record.get("ts"), replace=True)
+            for pet_id, delta in record.get("d", {}).items():
+                self._apply_pet(pet_id, delta, record.get("ts"))
+
+    def _apply_game(self, record):
+        """Apply a game record: replaced keys, changed and removed entries of dicts, items appended to lists"""
+        if self.game is None:
+            self.game = {}
+        game = self.game
+        game.update(record.get("d", {}))
+        for key, entries in record.get("m", {}).items():
+            if not isinstance(game.get(key), dict):
+                game[key] = {}
+            game[key].update(entries)
+        for key, entries in record.get("r", {}).items():
+            for entry in entries:
+                game.get(key, {}).pop(entry, None)
+        for key, items in record.get("a", {}).items():
+            if not isinstance(game.get(key), list):
+                game[key] = []
+            game[key].extend(items)
+
+    def _apply_pet(self, pet_id, pet_data, ts, replace=False):
+        """Store a full pet record (replace=True) or merge a JSON delta into the known one"""
+        entry = self.pets.setdefault(pet_id, {"pet_data": {}, "last_saved": None})
+        if replace:
+            entry["pet_data"] = pet_data
+        else:
+            entry["pet_data"].update(pet_data)
+        entry["last_saved"] = ts
+
+    def _load_legacy(self):
+        """Import game_state.json and pet_*.json from before the journal existed"""
+        found = False
+        legacy_game = os.path.join(self.save_dir, "game_state.json")
+        if os.path.exists(legacy_game):
+            try:
+                with open(legacy_game, "r", encoding="utf-8") as f:
+                    self.game = json.load(f)
+                found = True
+            except Exception as e:
+                print(f"Error importing legacy game state: {e}")
+
+        for path in glob.glob(os.path.join(self.save_dir, "pet_*.json")):
+            pet_id = os.path.basename(path)[len("pet_"):-len(".json")]
+            entry = self._read_legacy_pet(path)
+            if entry:
+                self.pets[pet_id] = entry
+                found = True
+        return found
+
+    def _read_legacy_pet(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {"pet_data": data["pet_data"], "last_saved": data.get("last_saved")}
+        except Exception as e:
+            print(f"Error importing legacy pet save {path}: {e}")
+            return None
+
+    # Public API used by GameState
+
+    def load_game(self):
+        """Return a copy of the saved game state, or None if nothing was saved yet"""
+        with self._lock:
+            return copy.deepcopy(self.game) if self.game is not None else None
+
+    def save_game(self, data):
+        """Journal what changed since the last save, so a record is as big as the change and not the game state"""
+        with self._lock:
+            current = self.game or {}
+            record = {"t": "game"}
+            replaced, entries, removed, appended = {}, {}, {}, {}
+            for key, value in data.items():
+                old = current.get(key, _MISSING)
+                if old == value:
+                    continue
+                if isinstance(old, dict) and isinstance(value, dict):
+                    # Only the entries of a mapping that changed
+                    entries[key] = {k: v for k, v in value.items() if old.get(k, _MISSING) != v}
+                    gone = [k for k in old if k not in value]
+                    if gone:
+                        removed[key] = gone
+                elif isinstance(old, list) and isinstance(value, list) and value[:len(old)] == old:
+                    # Lists like pet_collection only grow, journal the new items
+                    appended[key] = value[len(old):]
+                else:
+                    replaced[key] = value
+            for name, part in (("d", replaced), ("m", entries), ("r", removed), ("a", appended)):
+                if part:
+                    record[name] = part
+            if len(record) == 1 and self.game is not None:
+                return True
+            if not self._append(record):
+                return False
+            self._apply_game(copy.deepcopy(record))
+            return True
+
+    def load_pet(self, pet_id):
+        """Return {"pet_data": ..., "last_saved": ...} for a pet, or None if it is unknown"""
+        with self._lock:
+            return self._load_pet(pet_id)
+
+    def load_pets(self, pet_ids):
+        """Return {pet_id: record} for every known pet in pet_ids"""
+        with self._lock:
+            records = {}
+            for pet_id in pet_ids:
+                record = self._load_pet(pet_id)
+                if record is not None:
+                    records[pet_id] = record
+            return records
+
+    def _load_pet(self, pet_id):
+        entry = self.pets.get(pet_id)
+        if entry is None:
+            # Pets saved by an older version may still only exist as their own file
+            path = os.path.join(self.save_dir, f"pet_{pet_id}.json")
+            if not os.path.exists(path):
+                return None
+            entry = self._read_legacy_pet(path)
+            if entry is None:
+                return None
+            self.pets[pet_id] = entry
+        return copy.deepcopy(entry)
+
+    def save_pet(self, pet_id, pet_data):
+        """Journal the pet's binary record"""
+        with self._lock:
+            now = time.time()
+            packed = _pack_pet(pet_data)
+            if packed is not None:
+                record = {"t": "pet", "id": pet_id, "b": packed, "ts": now}
+            else:
+                # Data the binary format cannot intern falls back to a JSON delta
+                record = {"t": "pet", "id": pet_id, "d": self._pet_delta(pet_id, pet_data), "ts": now}
+            if not self._append(record):
+                return False
+            self._apply_pet(pet_id, copy.deepcopy(pet_data), now, replace=True)
+            return True
+
+    def save_pets(self, pets):
+        """Journal several pets as a single record so they are saved all-or-nothing"""
+        if not pets:
+            return True
+        with self._lock:
+            packed, deltas = {}, {}
+            for pet_id, pet_data in pets.items():
+                record = _pack_pet(pet_data)
+                if record is not None:
+                    packed[pet_id] = record
+                else:
+                    deltas[pet_id] = self._pet_delta(pet_id, pet_data)
+            now = time.time()
+            if not self._append({"t": "pets", "b": packed, "d": deltas, "ts": now}):
+                return False
+            for pet_id, pet_data in pets.items():
+                self._apply_pet(pet_id, copy.deepcopy(pet_data), now, replace=True)
+            return True
+
+    def _pet_delta(self, pet_id, pet_data):
+        entry = self.pets.get(pet_id)
+        stored = entry["pet_data"] if entry else {}
+        return {k: v for k, v in pet_data.items() if stored.get(k, _MISSING) != v}
+
+    def close(self):
+        """Wait for any running compaction, fold the journal into the snapshot and close it"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+        self.compact()
+        with self._lock:
+            try:
+                self._journal.close()
+            except Exception:
+                pass
+
+    # Journal and compaction
+
+    def _append(self, record):
+        """Write one record to the journal and make sure it reached the disk"""
+        record["seq"] = self._seq + 1
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        try:
+            self._journal.write(line)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except Exception as e:
+            print(f"Error writing save journal: {e}")
+            return False
+
+        self._seq += 1
+        self._journal_records += 1
+        if self._pending_lines is not None:
+            self._pending_lines.append(line)
+        elif self._journal_records >= self.compact_every:
+            self._start_compaction()
+        return True
+
+    def _start_compaction(self):
+        """Fold the journal into the snapshot on a background thread"""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def compact(self):
+        """Write a new snapshot and restart the journal with whatever arrived meanwhile"""
+        with self._lock:
+            if self._pending_lines is not None:
+                return  # Another compaction is already running
+            pets = {}
+            for pet_id, entry in self.pets.items():
+                packed = _pack_pet(entry["pet_data"])
+                if packed is not None:
+                    pets[pet_id] = {"b": packed, "last_saved": entry["last_saved"]}
+                else:
+                    pets[pet_id] = copy.deepcopy(entry)
+            state = {"seq": self._seq, "game": copy.deepcopy(self.game), "pets": pets}
+            self._pending_lines = []
+
+        # Serializing and writing the snapshot happens outside the lock so saves keep flowing
+        try:
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"Error compacting save journal: {e}")
+            with self._lock:
+                self._pending_lines = None
+            return False
+
+        with self._lock:
+            # Records newer than the snapshot are kept, the rest are now redundant
+            lines = self._pending_lines
+            self._pending_lines = None
+            try:
+                self._journal.close()
+                tmp_path = self.journal_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.journal_path)
+                self._journal_records = len(lines)
+            except Exception as e:
+                # Replay skips records already in the snapshot, so the old journal is still safe
+                print(f"Error restarting save journal: {e}")
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        return True
+
+
+class SQLiteStore:
+    """
+    Single-file SQLite store for profiles that own a lot of buddies.
+
+    Pets live in one indexed table so the collection windows can fetch many of them in a
+    single query, and multi-pet saves run in one transaction. The first time the database
+    is created any existing JSON saves in the same folder are imported.
+    """
+
+    DB_NAME = "buddies.db"
+    # SQLite limits the number of bound parameters, so batch loads are chunked
+    BATCH_SIZE = 500
+
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+        os.makedirs(save_dir, exist_ok=True)
+        self.db_path = os.path.join(save_dir, self.DB_NAME)
+        self._lock = threading.RLock()
+        # The game loop thread and the Tk thread both save, access is serialized by the lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._migrate_json_saves()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS game (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pets ("
+                "pet_id TEXT PRIMARY KEY, species TEXT, rarity TEXT, stage INTEGER, "
+                "data BLOB NOT NULL, last_saved REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pets_species ON pets(species)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pets_rarity ON pets(rarity)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pets_stage ON pets(stage)")
+
+    def _migrate_json_saves(self):
+        """One-shot import of the JSON save layout (journal/snapshot or one file per save)"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if row is not None:
+                return
+
+            names = os.listdir(self.save_dir)
+            has_json = any(n.endswith(".json") or n == JournalStore.JOURNAL_NAME for n in names)
+            if has_json:
+                try:
+                    legacy = JournalStore(self.save_dir)
+                    game = legacy.load_game()
+                    pets = legacy.load_pets(list(legacy.pets.keys()))
+                    legacy.close()
+                    if game is not None:
+                        self.save_game(game)
+                    with self._conn:
+                        for pet_id, record in pets.items():
+                            self._write_pet(pet_id, record["pet_data"], record.get("last_saved"))
+                    print(f"Imported {len(pets)} pets from JSON saves into {self.DB_NAME}")
+                except Exception as e:
+                    # Leave the flag unset so the import is retried next start
+                    print(f"Error importing JSON saves: {e}")
+                    return
+
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (str(time.time()),))
+
+    def load_game(self):
+        """Return the saved game state, or None if nothing was saved yet"""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM game").fetchall()
+        if not rows:
+            return None
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_game(self, data):
+        """Write the top-level game state keys that changed"""
+        with self._lock:
+            current = dict(self._conn.execute("SELECT key, value FROM game").fetchall())
+            changed = []
+            for key, value in data.items():
+                encoded = json.dumps(value, separators=(",", ":"))
+                if current.get(key) != encoded:
+                    changed.append((key, encoded))
+            if not changed:
+                return True
+            try:
+                with self._conn:
+                    self._conn.executemany("INSERT OR REPLACE INTO game (key, value) VALUES (?, ?)", changed)
+                return True
+            except sqlite3.Error as e:
+                print(f"Error saving game state: {e}")
+                return False
+
+    def load_pet(self, pet_id):
+        """Return {"pet_data": ..., "last_saved": ...} for a pet, or None if it is unknown"""
+        return self.load_pets([pet_id]).get(pet_id)
+
+    def load_pets(self, pet_ids):
+        """Return {pet_id: record} for every known pet in pet_ids using batched queries"""
+        pet_ids = list(pet_ids)
+        records = {}
+        with self._lock:
+            for start in range(0, len(pet_ids), self.BATCH_SIZE):
+                chunk = pet_ids[start:start + self.BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT pet_id, data, last_saved FROM pets WHERE pet_id IN ({placeholders})", chunk
+                ).fetchall()
+                for pet_id, data, last_saved in rows:
+                    # Rows written before the binary format existed hold JSON text
+                    pet_data = decode_pet(data) if is_pet_record(data) else json.loads(data)
+                    records[pet_id] = {"pet_data": pet_data, "last_saved": last_saved}
+        return records
+
+    def find_pets(self, species=None, rarity=None, stage=None):
+        """Return the ids of pets matching the given species/rarity/stage (uses the indexes)"""
+        clauses, params = [], []
+        for column, value in (("species", species), ("rarity", rarity), ("stage", stage)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        query = "SELECT pet_id FROM pets"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def save_pet(self, pet_id, pet_data):
+        """Write one pet"""
+        return self.save_pets({pet_id: pet_data})
+
+    def save_pets(self, pets):
+        """Write several pets in a single transaction"""
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                for pet_id, pet_data in pets.items():
+                    self._write_pet(pet_id, pet_data, now)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving pets: {e}")
+            return False
+
+    def _write_pet(self, pet_id, pet_data, last_saved):
+        try:
+            data = sqlite3.Binary(encode_pet(pet_data))
+        except ValueError:
+            data = json.dumps(pet_data, separators=(",", ":"))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pets (pet_id, species, rarity, stage, data, last_saved) VALUES (?, ?, ?, ?, ?, ?)",
+            (pet_id, pet_data.get("species"), pet_data.get("rarity"), pet_data.get("stage"),
+             data, last_saved)
+        )
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+
+class MemoryStore:
+    """
+    Store that keeps everything in memory and never touches the disk.
+
+    Used by session replays (replay.py) so they start from the recorded profile and leave
+    the real saves alone.
+    """
+
+    def __init__(self, save_dir=None):
+        self.game = None
+        self.pets = {}  # pet_id -> {"pet_data": ..., "last_saved": ...}
+
+    def load_game(self):
+        return copy.deepcopy(self.game) if self.game is not None else None
+
+    def save_game(self, data):
+        self.game = copy.deepcopy(data)
+        return True
+
+    def load_pet(self, pet_id):
+        return copy.deepcopy(self.pets.get(pet_id))
+
+    def load_pets(self, pet_ids):
+        return {pet_id: copy.deepcopy(self.pets[pet_id]) for pet_id in pet_ids if pet_id in self.pets}
+
+    def save_pet(self, pet_id, pet_data):
+        return self.save_pets({pet_id: pet_data})
+
+    def save_pets(self, pets):
+        now = time.time()
+        for pet_id, pet_data in pets.items():
+            self.pets[pet_id] = {"pet_data": copy.deepcopy(pet_data), "last_saved": now}
+        return True
+
+    def close(self):
+        pass
+
+
+class NullStore:
+    """
+    Store that drops every write, nothing is kept and every load comes back empty.
+
+    For headless runs that never read their saves back (simulate.py, montecarlo.py), so
+    balancing runs with thousands of buddies do not spend their time copying save data.
+    """
+
+    def __init__(self, save_dir=None):
+        pass
+
+    def load_game(self):
+        return None
+
+    def save_game(self, data):
+        return True
+
+    def load_pet(self, pet_id):
+        return None
+
+    def load_pets(self, pet_ids):
+        return {}
+
+    def save_pet(self, pet_id, pet_data):
+        return True
+
+    def save_pets(self, pets):
+        return True
+
+    def close(self):
+        pass
+
+
+def open_store(save_dir, backend=None):
+    """Create the save store picked by `backend` or the BUDDY_SAVE_BACKEND env var (journal, sqlite or memory)"""
+    backend = (backend or os.getenv("BUDDY_SAVE_BACKEND", "journal")).lower()
+    if backend == "sqlite":
+        return SQLiteStore(save_dir)
+    if backend == "memory":
+        return MemoryStore(save_dir)
+    if backend != "journal":
+        print(f"Warning: unknown save backend '{backend}', using the journal")
+    return JournalStore(save_dir)
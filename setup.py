@@ -19,10 +19,25 @@ build_exe_options = {
     "packages": ["tkinter", "threading", "time", "json", "os", "random"],
     "excludes": [],
     "include_files": [
+        "animation.py",
+        "art_cache.py",
         "assets.py",
+        "autosave.py",
+        "batch_loader.py",
+        "collection_engine.py",
+        "game_actor.py",
+        "game_clock.py",
+        "game_loop.py",
         "game_state.py",
         "mini_games.py",
-        "pets.py"
+        "persistence.py",
+        "pet_codec.py",
+        "pets.py",
+        "replay.py",
+        "rng.py",
+        "save_store.py",
+        "ui_bindings.py",
+        "virtual_list.py"
     ],  # Include all necessary game files
     "optimize": 2,
     "include_msvcrt": True  # Include Microsoft Visual C++ Runtime for Windows compatibility
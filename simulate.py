@@ -0,0 +1,313 @@
+# simulate.py - Headless, accelerated-time balancing runs, no Tk needed
+#
+#   python -m simulate --hours 48 --pets 20 --policy feed:hunger<40 --policy sleep:energy<30
+#
+# Buddies are cared for by scripted policies and the clock only exists in the simulation,
+# so a day of play takes a few seconds. Reports time to evolution, the branch mix and the
+# Buddy Bucks earned per simulated hour.
+
+import argparse
+import json
+import operator
+import re
+import statistics
+import time
+import rng
+from assets import ACTION_COOLDOWNS, RARITY_DEFINITIONS
+from pets import Buddy
+from game_clock import GameClock
+from game_state import GameState
+from save_store import NullStore
+
+# Stats a policy condition can look at
+POLICY_STATS = ("hunger", "energy", "cleanliness", "happiness", "affection", "satisfaction")
+
+# What a reasonably attentive player does
+DEFAULT_POLICIES = (
+    "feed:hunger<40",
+    "sleep:energy<30",
+    "clean:cleanliness<40",
+    "play:happiness<50",
+    "pet:affection<70"
+)
+
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+_CONDITION = re.compile(r"^(\w+)\s*(<=|>=|<|>)\s*(-?\d+(?:\.\d+)?)$")
+
+
+class Policy:
+    """Do `action` whenever `stat op value` holds, or every time it is off cooldown if there is no condition"""
+
+    __slots__ = ("spec", "action", "stat", "compare", "value")
+
+    def __init__(self, spec, action, stat=None, compare=None, value=None):
+        self.spec = spec
+        self.action = action
+        self.stat = stat
+        self.compare = compare
+        self.value = value
+
+    def wants(self, buddy):
+        return self.stat is None or self.compare(getattr(buddy, self.stat), self.value)
+
+
+def parse_policy(spec):
+    """Parse 'action' or 'action:stat<value' (<, <=, > or >=) into a Policy, raises ValueError"""
+    action, _, condition = spec.partition(":")
+    action = action.strip()
+    if action not in ACTION_COOLDOWNS:
+        raise ValueError(f"unknown action '{action}' in policy '{spec}', expected one of {', '.join(ACTION_COOLDOWNS)}")
+    if not condition:
+        return Policy(spec, action)
+    match = _CONDITION.match(condition.strip())
+    if not match:
+        raise ValueError(f"cannot read condition '{condition}' in policy '{spec}', expected e.g. hunger<40")
+    stat, op, value = match.groups()
+    if stat not in POLICY_STATS:
+        raise ValueError(f"unknown stat '{stat}' in policy '{spec}', expected one of {', '.join(POLICY_STATS)}")
+    return Policy(spec, action, stat, _OPERATORS[op], float(value))
+
+
+# The knobs as shipped, tuning always scales these and never an already tuned value
+_BASE_EVOLUTION_TIMES = {rarity: data["evolution_time"] for rarity, data in RARITY_DEFINITIONS.items()}
+
+
+def _current_tuning():
+    return (Buddy.DECAY_SPEED_MULTIPLIER, Buddy.ACTION_GAIN_MULTIPLIER,
+            {rarity: data["evolution_time"] for rarity, data in RARITY_DEFINITIONS.items()},
+            GameState.SATISFACTION_REWARD, GameState.EVOLUTION_REWARD)
+
+
+def _set_tuning(decay_speed, action_gain, evolution_times, satisfaction_reward, evolution_reward):
+    Buddy.DECAY_SPEED_MULTIPLIER = decay_speed
+    Buddy.ACTION_GAIN_MULTIPLIER = action_gain
+    for rarity, evolution_time in evolution_times.items():
+        RARITY_DEFINITIONS[rarity]["evolution_time"] = evolution_time
+    GameState.SATISFACTION_REWARD = satisfaction_reward
+    GameState.EVOLUTION_REWARD = evolution_reward
+
+
+def apply_tuning(decay_speed=None, action_gain=None, evolution_time_scale=None,
+                 satisfaction_reward=None, evolution_reward=None):
+    """
+    Override the balancing knobs for this process, call before run_simulation().
+
+    evolution_time_scale scales the shipped evolution times, so applying the same tuning
+    twice gives the same values. Returns a function that puts back what was there before.
+    """
+    previous = _current_tuning()
+    if decay_speed is not None:
+        Buddy.DECAY_SPEED_MULTIPLIER = decay_speed
+    if action_gain is not None:
+        Buddy.ACTION_GAIN_MULTIPLIER = action_gain
+    if evolution_time_scale is not None:
+        for rarity, data in RARITY_DEFINITIONS.items():
+            data["evolution_time"] = _BASE_EVOLUTION_TIMES[rarity] * evolution_time_scale
+    if satisfaction_reward is not None:
+        GameState.SATISFACTION_REWARD = satisfaction_reward
+    if evolution_reward is not None:
+        GameState.EVOLUTION_REWARD = evolution_reward
+    return lambda: _set_tuning(*previous)
+
+
+def run_simulation(hours=24.0, policies=None, pets=1, tick=2.0, seed=None, auto_evolve=True, dilation=1.0):
+    """
+    Simulate `pets` fresh buddies for `hours` of play in `tick` second steps.
+
+    A GameClock driven by hand turns every tick into game time, sped up by `dilation` the
+    same way dev mode does in the game. Every tick the whole collection decays, ready
+    buddies evolve (if auto_evolve) and each policy fires for every buddy it matches, in
+    order, respecting the action cooldowns (which run on play time, like in the game).
+    Returns a dict of plain values, see format_report(). Raises ValueError for a tick or
+    dilation that is not positive, or hours that are negative or infinite.
+    """
+    if not tick > 0:
+        raise ValueError(f"tick must be greater than 0, got {tick}")
+    if not 0 <= hours < float("inf"):
+        raise ValueError(f"hours must be a finite number, 0 or more, got {hours}")
+    if not dilation > 0:
+        raise ValueError(f"dilation must be greater than 0, got {dilation}")
+    if seed is not None:
+        rng.seed_all(seed)
+    policies = [parse_policy(p) if isinstance(p, str) else p for p in (policies or DEFAULT_POLICIES)]
+
+    # Nothing is read back, so saves go nowhere and cost nothing
+    game_state = GameState(store=NullStore(), background_saves=False)
+    start_bucks = game_state.buddy_bucks
+    buddies = []
+    for i in range(pets):
+        buddy = Buddy()
+        game_state.add_pet_to_collection(f"sim_{i}", buddy)
+        buddies.append(buddy)
+    # Per buddy: action -> simulated time it comes off cooldown
+    cooldowns = [dict.fromkeys(ACTION_COOLDOWNS, 0.0) for _ in buddies]
+
+    time_to_stage = {2: [], 3: []}
+    branches = {}
+    # Final branch broken down by rarity and by personality trait
+    branches_by_rarity = {}
+    branches_by_trait = {}
+    # Buddy Bucks each buddy earned through evolution and satisfaction rewards
+    earned = [0] * pets
+    actions = dict.fromkeys(ACTION_COOLDOWNS, 0)
+    satisfaction_rewards = 0
+
+    clock = GameClock(step=tick, dilation=dilation, max_catch_up=tick, source=lambda: 0.0)
+    ticks = int(hours * 3600 / tick)
+    now = 0.0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        now += tick
+        _, game_seconds = clock.advance(tick)
+        if game_seconds:
+            game_state.decay_collection(game_seconds)
+
+        for index, (buddy, ready_at) in enumerate(zip(buddies, cooldowns)):
+            if auto_evolve and buddy.evolution_ready and buddy.evolve():
+                earned[index] += game_state.award_evolution()
+                time_to_stage[buddy.stage].append(now)
+                if buddy.stage == 3:
+                    branch = buddy.evolution_branch or "joy"
+                    branches[branch] = branches.get(branch, 0) + 1
+                    _count(branches_by_rarity, buddy.rarity, branch)
+                    for trait in buddy.personality:
+                        _count(branches_by_trait, trait, branch)
+
+            for policy in policies:
+                if ready_at[policy.action] <= now and policy.wants(buddy):
+                    if buddy.apply_action(policy.action):
+                        earned[index] += game_state.award_satisfaction()
+                        satisfaction_rewards += 1
+                    actions[policy.action] += 1
+                    ready_at[policy.action] = now + ACTION_COOLDOWNS[policy.action]
+    wall_seconds = time.perf_counter() - started
+    game_state.close()
+
+    bucks_earned = game_state.buddy_bucks - start_bucks
+    return {
+        "hours": hours,
+        "pets": pets,
+        "tick": tick,
+        "ticks": ticks,
+        "dilation": dilation,
+        "seed": seed,
+        "policies": [policy.spec for policy in policies],
+        "time_to_stage": {str(stage): times for stage, times in time_to_stage.items()},
+        "branches": branches,
+        "branches_by_rarity": branches_by_rarity,
+        "branches_by_trait": branches_by_trait,
+        "bucks_per_buddy_hour": [bucks / hours if hours else 0.0 for bucks in earned],
+        "actions": actions,
+        "satisfaction_rewards": satisfaction_rewards,
+        "bucks_earned": bucks_earned,
+        "bucks_per_hour": bucks_earned / hours if hours else 0.0,
+        "wall_seconds": wall_seconds,
+        "ticks_per_second": ticks / wall_seconds if wall_seconds else 0.0
+    }
+
+
+def _count(table, group, key):
+    counts = table.setdefault(group, {})
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _describe_minutes(seconds):
+    if not seconds:
+        return "never"
+    minutes = [s / 60 for s in seconds]
+    return (f"mean {statistics.mean(minutes):.1f} min, median {statistics.median(minutes):.1f}, "
+            f"min {min(minutes):.1f}, max {max(minutes):.1f}")
+
+
+def format_report(result):
+    """Human readable summary of a run_simulation() result"""
+    pets = result["pets"]
+    lines = [
+        f"Simulated {result['hours']:g} h for {pets} buddies ({result['ticks']:,} ticks of {result['tick']:g} s)",
+        f"Policies: {', '.join(result['policies'])}",
+        ""
+    ]
+    for stage, label in (("2", "child"), ("3", "adult")):
+        times = result["time_to_stage"][stage]
+        lines.append(f"Time to stage {stage} ({label}), {len(times)}/{pets} buddies: {_describe_minutes(times)}")
+
+    total = sum(result["branches"].values())
+    if total:
+        mix = ", ".join(f"{branch} {count / total:.0%}" for branch, count in
+                        sorted(result["branches"].items(), key=lambda item: -item[1]))
+        lines.append(f"Evolution branches: {mix}")
+    else:
+        lines.append("Evolution branches: no buddy reached its final form")
+
+    lines.append(f"Buddy Bucks earned: {result['bucks_earned']} ({result['bucks_per_hour']:.1f} per simulated hour, "
+                 f"{result['satisfaction_rewards']} satisfaction rewards)")
+    lines.append("Actions: " + ", ".join(f"{action} {count}" for action, count in result["actions"].items()))
+    lines.append(f"Ran in {result['wall_seconds']:.2f} s ({result['ticks_per_second'] * 60:,.0f} ticks/min)")
+    return "\n".join(lines)
+
+
+def _policy_arg(spec):
+    try:
+        return parse_policy(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _positive_float(text):
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def _non_negative_float(text):
+    value = float(text)
+    if not 0 <= value < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a finite number, 0 or more, got {text}")
+    return value
+
+
+def add_run_arguments(parser, hours=24.0):
+    """Arguments shared with montecarlo.py: run length, care policies and tuning overrides"""
+    parser.add_argument("--hours", type=_non_negative_float, default=hours, help=f"simulated hours (default {hours:g})")
+    parser.add_argument("--tick", type=_positive_float, default=2.0, help="simulated seconds per tick (default 2, same as the game)")
+    parser.add_argument("--policy", type=_policy_arg, action="append",
+                        help="care rule like feed:hunger<40, repeat for more (default: a typical player)")
+    parser.add_argument("--no-evolve", action="store_true", help="never accept evolution")
+    parser.add_argument("--dilation", type=_positive_float, default=1.0, help="game time per second of play (dev mode uses 30)")
+    parser.add_argument("--decay-speed", type=float, help="override Buddy.DECAY_SPEED_MULTIPLIER")
+    parser.add_argument("--action-gain", type=float, help="override Buddy.ACTION_GAIN_MULTIPLIER")
+    parser.add_argument("--evolution-time-scale", type=float, help="multiply every rarity's evolution_time")
+    parser.add_argument("--satisfaction-reward", type=int, help="override GameState.SATISFACTION_REWARD")
+    parser.add_argument("--evolution-reward", type=int, help="override GameState.EVOLUTION_REWARD")
+
+
+def tuning_from_args(args):
+    """apply_tuning() keyword arguments from parsed add_run_arguments() options"""
+    return {
+        "decay_speed": args.decay_speed,
+        "action_gain": args.action_gain,
+        "evolution_time_scale": args.evolution_time_scale,
+        "satisfaction_reward": args.satisfaction_reward,
+        "evolution_reward": args.evolution_reward
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m simulate", description="Headless accelerated-time balancing runs")
+    add_run_arguments(parser)
+    parser.add_argument("--pets", type=int, default=1, help="buddies cared for at once (default 1)")
+    parser.add_argument("--seed", type=int, help="seed species/rarity/personality rolls")
+    parser.add_argument("--json", action="store_true", help="print the raw result as JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    apply_tuning(**tuning_from_args(args))
+    result = run_simulation(args.hours, args.policy, args.pets, args.tick, args.seed, not args.no_evolve, args.dilation)
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+
+
+if __name__ == "__main__":
+    main()
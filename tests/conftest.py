@@ -0,0 +1,18 @@
+# conftest.py - The game modules live in the repo root, make them importable from the tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pet_data(**overrides):
+    """A saved pet dict with every field set, for the store and codec tests"""
+    data = {
+        "species": "starwhisker", "rarity": "rare", "personality": ["neat_freak", "lazy"],
+        "hunger": 12.5, "energy": 99.25, "cleanliness": 0.0, "happiness": 100.0,
+        "affection": 33.3, "satisfaction": 7.0, "stage": 3, "evolution_timer": 1234.5,
+        "evolution_ready": False, "evolution_branch": "spark", "last_action": "clean"
+    }
+    data.update(overrides)
+    return data
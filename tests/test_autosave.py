@@ -0,0 +1,108 @@
+# test_autosave.py - When the save scheduler writes: debounce, staleness, priorities, flush
+
+from autosave import SaveScheduler, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_CRITICAL
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler():
+    clock = FakeClock()
+    return SaveScheduler(debounce=5.0, max_staleness=15.0, clock=clock), clock
+
+
+def test_quiet_target_is_written_after_the_debounce():
+    scheduler, clock = make_scheduler()
+    written = []
+    scheduler.mark("game", written.append, 1)
+
+    clock.now += 4.9
+    assert scheduler.poll() == 0
+    # Another change restarts the wait and replaces what gets written
+    scheduler.mark("game", written.append, 2)
+    clock.now += 4.9
+    assert scheduler.poll() == 0
+    clock.now += 0.1
+    assert scheduler.poll() == 1
+    assert written == [2]
+    assert scheduler.coalesced == 1
+    assert scheduler.writes["debounce"] == 1
+    assert scheduler.poll() == 0
+
+
+def test_busy_target_is_written_once_the_oldest_change_gets_stale():
+    scheduler, clock = make_scheduler()
+    written = []
+    for i in range(5):
+        # Never quiet for the whole debounce
+        assert scheduler.poll() == 0
+        scheduler.mark("game", written.append, i)
+        clock.now += 3.0
+    assert scheduler.poll() == 1
+    assert written == [4]
+    assert scheduler.writes["staleness"] == 1
+    assert scheduler.max_staleness_seen == 15.0
+
+
+def test_next_deadline_is_the_earliest_of_debounce_and_staleness():
+    scheduler, clock = make_scheduler()
+    assert scheduler.next_deadline() is None
+    start = clock.now
+    scheduler.mark("game", print)
+    assert scheduler.next_deadline() == start + 5.0
+    clock.now += 12.0
+    scheduler.mark("game", print)
+    assert scheduler.next_deadline() == start + 15.0
+
+
+def test_critical_writes_straight_away_and_supersedes_the_pending_change():
+    scheduler, clock = make_scheduler()
+    written = []
+    scheduler.mark(("pet", "a"), written.append, "a low", priority=PRIORITY_LOW)
+    scheduler.mark(("pet", "b"), written.append, "b normal", priority=PRIORITY_NORMAL)
+    assert written == []
+
+    scheduler.mark(("pet", "a"), written.append, "a critical", priority=PRIORITY_CRITICAL)
+    assert written == ["a critical"]
+
+    # Only the other pet is still waiting, the low one for "a" is not written again
+    clock.now += 5.0
+    assert scheduler.poll() == 1
+    assert written == ["a critical", "b normal"]
+    assert scheduler.marks == [1, 1, 1]
+    assert scheduler.writes["critical"] == 1
+
+
+def test_flush_writes_everything_or_one_key():
+    scheduler, clock = make_scheduler()
+    written = []
+    scheduler.mark("game", written.append, "game")
+    scheduler.mark(("pet", "a"), written.append, "a")
+    scheduler.mark(("pet", "b"), written.append, "b")
+
+    assert scheduler.flush(("pet", "a")) == 1
+    assert written == ["a"]
+    assert scheduler.flush(("pet", "a")) == 0
+    assert scheduler.flush() == 2
+    assert sorted(written) == ["a", "b", "game"]
+    assert scheduler.next_deadline() is None
+    assert scheduler.stats()["pending"] == 0
+
+
+def test_failing_write_does_not_stop_the_others():
+    scheduler, clock = make_scheduler()
+    written = []
+
+    def broken():
+        raise OSError("disk full")
+
+    scheduler.mark("game", broken)
+    scheduler.mark(("pet", "a"), written.append, "a")
+    clock.now += 5.0
+    assert scheduler.poll() == 2
+    assert written == ["a"]
@@ -0,0 +1,81 @@
+# test_collection_engine.py - The column step against each buddy decaying on its own
+
+import pytest
+from collection_engine import CollectionEngine
+from pets import Buddy, ROW_FIELDS
+from conftest import pet_data
+
+COMPARED = [name for name in ROW_FIELDS if name != "dirty"] + ["evolution_branch"]
+
+PETS = {
+    "fresh": pet_data(rarity="common", personality=["playful"], stage=1, evolution_timer=0.0,
+                      hunger=90.0, energy=90.0, cleanliness=90.0, happiness=90.0, evolution_branch=None),
+    "almost_ready": pet_data(rarity="legendary", personality=["chill"], stage=2, evolution_timer=100.0,
+                             hunger=70.0, energy=95.0, cleanliness=60.0, happiness=65.0, evolution_branch=None),
+    "ready": pet_data(rarity="rare", personality=["lazy", "neat_freak"], stage=1, evolution_ready=True,
+                      evolution_timer=500.0, hunger=55.0, energy=52.0, cleanliness=51.0, happiness=50.5),
+    "starving": pet_data(rarity="epic", personality=["hungry"], stage=2, evolution_timer=40.0,
+                         hunger=1.0, energy=0.5, cleanliness=0.0, happiness=3.0, affection=0.2),
+    "adult": pet_data(rarity="uncommon", personality=[], stage=3, evolution_timer=900.0,
+                      hunger=100.0, energy=100.0, cleanliness=100.0, happiness=100.0),
+}
+
+
+def make_pair():
+    """An engine holding every pet, and standalone copies of the same pets"""
+    engine = CollectionEngine()
+    for pet_id, data in PETS.items():
+        engine.attach(pet_id, Buddy(from_data=data))
+    alone = {pet_id: Buddy(from_data=data) for pet_id, data in PETS.items()}
+    return engine, alone
+
+
+def assert_same(engine, alone):
+    for pet_id, buddy in alone.items():
+        attached = engine.get(pet_id)
+        for field in COMPARED:
+            expected = getattr(buddy, field)
+            if isinstance(expected, float):
+                assert getattr(attached, field) == pytest.approx(expected, abs=1e-9), (pet_id, field)
+            else:
+                assert getattr(attached, field) == expected, (pet_id, field)
+
+
+@pytest.mark.parametrize("tick", [0.5, 2.0, 30.0])
+def test_step_matches_apply_decay(tick):
+    engine, alone = make_pair()
+    for _ in range(int(600 / tick)):
+        engine.step(tick)
+        for buddy in alone.values():
+            buddy.apply_decay(tick)
+        assert_same(engine, alone)
+
+
+def test_rates_follow_a_stage_change_and_rows_survive_a_detach():
+    engine, alone = make_pair()
+    for _ in range(10):
+        engine.step(2.0)
+        for buddy in alone.values():
+            buddy.apply_decay(2.0)
+
+    # Evolving changes the decay rates, removing a pet moves the last row into its place
+    for buddies in (engine.get("fresh"), alone["fresh"]):
+        buddies.stage = 2
+    engine.detach("ready")
+    del alone["ready"]
+
+    for _ in range(100):
+        engine.step(2.0)
+        for buddy in alone.values():
+            buddy.apply_decay(2.0)
+    assert_same(engine, alone)
+
+
+def test_step_marks_changed_rows_dirty():
+    engine, _ = make_pair()
+    for pet_id in PETS:
+        engine.get(pet_id).mark_clean()
+    engine.step(0.0)
+    assert not any(engine.get(pet_id).dirty for pet_id in PETS)
+    engine.step(2.0)
+    assert all(engine.get(pet_id).dirty for pet_id in PETS)
@@ -0,0 +1,72 @@
+# test_game_clock.py - Fixed steps, dilation and the catch-up cap
+
+import pytest
+from game_clock import GameClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 500.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_game_time_comes_in_whole_steps():
+    clock = GameClock(step=2.0, dilation=1.0, source=FakeTime())
+    assert clock.advance(0.5) == (0.5, 0.0)
+    assert clock.advance(1.0) == (1.0, 0.0)
+    # 2.5 s accumulated, one step handed out and 0.5 s carried over
+    assert clock.advance(1.0) == (1.0, 2.0)
+    assert clock.advance(5.5) == (5.5, 6.0)
+    assert clock.game_seconds == 8.0
+    assert clock.ticks == 4
+
+
+def test_tick_reads_the_source_and_ignores_time_going_backwards():
+    source = FakeTime()
+    clock = GameClock(step=2.0, dilation=1.0, source=source)
+    source.now += 3.0
+    assert clock.tick() == (3.0, 2.0)
+    source.now -= 10.0
+    assert clock.tick() == (0.0, 0.0)
+    source.now += 1.0
+    assert clock.tick() == (1.0, 2.0)
+
+
+@pytest.mark.parametrize("dilation, real, game", [(0.0, 10.0, 0.0), (0.5, 10.0, 4.0), (30.0, 1.0, 30.0)])
+def test_dilation_scales_game_time(dilation, real, game):
+    clock = GameClock(step=2.0, dilation=dilation, source=FakeTime())
+    assert clock.advance(real) == (real, game)
+
+
+def test_set_dilation_keeps_the_accumulated_time():
+    clock = GameClock(step=2.0, dilation=1.0, source=FakeTime())
+    clock.advance(1.5)
+    clock.set_dilation(2.0)
+    assert clock.advance(0.25) == (0.25, 2.0)
+    clock.set_dilation(-1.0)
+    assert clock.dilation == 0.0
+    assert clock.real_seconds_until(2.0) is None
+
+
+def test_long_gaps_are_capped_and_the_rest_counted_as_dropped():
+    clock = GameClock(step=2.0, dilation=1.0, source=FakeTime())
+    assert clock.advance(300.0) == (120.0, 120.0)
+    assert clock.advance(120.0) == (120.0, 120.0)
+    assert clock.advance(121.0) == (120.0, 120.0)
+    assert clock.dropped_seconds == 181.0
+    assert clock.stats() == {"ticks": 3, "dilation": 1.0, "game_seconds": 360.0, "dropped_seconds": 181.0}
+
+
+def test_real_seconds_until_counts_the_carried_time():
+    clock = GameClock(step=2.0, dilation=2.0, source=FakeTime())
+    clock.advance(0.5)
+    # 1 game second accumulated: the next step (2 game seconds) is 0.5 real seconds away,
+    # the one after that 1.5
+    assert clock.real_seconds_until(0.1) == 0.5
+    assert clock.real_seconds_until(2.0) == 0.5
+    assert clock.real_seconds_until(3.0) == 1.5
+    assert clock.real_seconds_until(4.0) == 1.5
+    clock.advance(0.5)
+    assert clock.real_seconds_until(2.0) == 1.0
@@ -0,0 +1,67 @@
+# test_game_loop.py - The thread driver hands the actor over before anything can race it
+
+import threading
+import time
+from game_actor import GameActor
+from game_clock import GameClock
+from game_loop import ThreadLoop
+from game_state import GameState
+from replay import SessionRecorder
+from save_store import MemoryStore
+
+
+def make_actor():
+    return GameActor(GameState(store=MemoryStore(), background_saves=False), SessionRecorder(), GameClock())
+
+
+def test_thread_owns_the_actor_once_start_returns():
+    actor = make_actor()
+    loop = ThreadLoop(actor)
+    loop.start()
+    try:
+        assert actor._owner == loop.thread.ident
+        # So a command from here runs on the loop thread, not inline
+        assert actor.call(threading.get_ident) == loop.thread.ident
+    finally:
+        assert loop.stop()
+    assert actor._owner is None
+    assert actor.call(threading.get_ident) == threading.get_ident()
+
+
+def test_first_step_already_runs_as_the_owner(monkeypatch):
+    actor = make_actor()
+    steps = []
+    real_start, real_step = actor.start, actor.step
+
+    def slow_start(owner=None):
+        # Widen the gap between the thread starting and the handover
+        time.sleep(0.05)
+        real_start(owner)
+
+    def step():
+        steps.append(actor._owner == threading.get_ident())
+        return real_step()
+
+    monkeypatch.setattr(actor, "start", slow_start)
+    monkeypatch.setattr(actor, "step", step)
+    loop = ThreadLoop(actor)
+    loop.start()
+    loop.stop()
+    assert steps and all(steps)
+
+
+def test_call_gives_up_on_a_stuck_owner():
+    actor = make_actor()
+    loop = ThreadLoop(actor)
+    loop.start()
+    release = threading.Event()
+    ran = []
+    try:
+        # The owner is busy (e.g. stuck on a full save queue)
+        actor.submit(release.wait)
+        assert actor.call(ran.append, "late", timeout=0.05) is None
+    finally:
+        release.set()
+        loop.stop()
+    # Timed out commands are dropped, not run behind the caller's back later
+    assert ran == []
@@ -0,0 +1,135 @@
+# test_journal_store.py - The journal save format: replay, torn writes, compaction, old saves
+
+import json
+import os
+import threading
+import save_store
+from save_store import JournalStore
+from conftest import pet_data
+
+
+def test_save_and_reopen(tmp_path):
+    store = JournalStore(str(tmp_path))
+    store.save_game({"buddy_bucks": 120, "gacha_rolls": 1})
+    store.save_game({"buddy_bucks": 95, "gacha_rolls": 1})
+    store.save_pet("a", pet_data())
+    store.save_pets({"b": pet_data(species="slimey"), "c": pet_data(stage=2)})
+
+    reopened = JournalStore(str(tmp_path))
+    assert reopened.load_game() == {"buddy_bucks": 95, "gacha_rolls": 1}
+    assert reopened.load_pet("a")["pet_data"] == pet_data()
+    assert set(reopened.load_pets(["a", "b", "c", "missing"])) == {"a", "b", "c"}
+
+
+def test_torn_trailing_line_is_dropped(tmp_path):
+    store = JournalStore(str(tmp_path))
+    store.save_game({"buddy_bucks": 50})
+    store.save_pet("a", pet_data(hunger=10.0))
+    good_size = os.path.getsize(store.journal_path)
+
+    # A crash halfway through writing the next record
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"t":"game","d":{"buddy_bucks":99')
+
+    reopened = JournalStore(str(tmp_path))
+    assert reopened.load_game() == {"buddy_bucks": 50}
+    assert reopened.load_pet("a")["pet_data"]["hunger"] == 10.0
+    # The torn tail is cut off, so the next record starts on a clean line
+    assert os.path.getsize(reopened.journal_path) == good_size
+
+    reopened.save_game({"buddy_bucks": 75})
+    assert JournalStore(str(tmp_path)).load_game() == {"buddy_bucks": 75}
+
+
+def test_saves_during_compaction_are_kept(tmp_path, monkeypatch):
+    store = JournalStore(str(tmp_path))
+    store.save_pet("a", pet_data(hunger=1.0))
+
+    # Save from another thread while the snapshot is being written, outside the store lock
+    real_dump = json.dump
+
+    def dump_with_concurrent_save(obj, f, **kwargs):
+        saver = threading.Thread(target=lambda: (store.save_pet("a", pet_data(hunger=2.0)),
+                                                 store.save_pet("b", pet_data(species="slimey"))))
+        saver.start()
+        saver.join()
+        real_dump(obj, f, **kwargs)
+
+    monkeypatch.setattr(save_store.json, "dump", dump_with_concurrent_save)
+    assert store.compact()
+    monkeypatch.setattr(save_store.json, "dump", real_dump)
+
+    # The snapshot has the old value, the restarted journal the two saves made meanwhile
+    with open(store.journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+    reopened = JournalStore(str(tmp_path))
+    assert reopened.load_pet("a")["pet_data"]["hunger"] == 2.0
+    assert reopened.load_pet("b")["pet_data"]["species"] == "slimey"
+
+
+def test_background_compaction_under_concurrent_saves(tmp_path):
+    store = JournalStore(str(tmp_path), compact_every=10)
+
+    def saver(n):
+        for i in range(60):
+            store.save_pet(f"pet_{n}", pet_data(hunger=float(i)))
+            store.save_game({f"counter_{n}": i})
+
+    threads = [threading.Thread(target=saver, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    reopened = JournalStore(str(tmp_path))
+    for n in range(4):
+        assert reopened.load_pet(f"pet_{n}")["pet_data"]["hunger"] == 59.0
+        assert reopened.load_game()[f"counter_{n}"] == 59
+
+
+def test_legacy_json_saves_are_imported(tmp_path):
+    with open(tmp_path / "game_state.json", "w", encoding="utf-8") as f:
+        json.dump({"buddy_bucks": 300, "pet_collection": ["old"]}, f)
+    with open(tmp_path / "pet_old.json", "w", encoding="utf-8") as f:
+        json.dump({"pet_data": pet_data(stage=2), "last_saved": 1000.0}, f)
+
+    store = JournalStore(str(tmp_path))
+    assert store.load_game() == {"buddy_bucks": 300, "pet_collection": ["old"]}
+    assert store.load_pet("old") == {"pet_data": pet_data(stage=2), "last_saved": 1000.0}
+    # Captured in a snapshot straight away
+    assert os.path.exists(store.snapshot_path)
+
+    # A pet file that only turns up later is still found
+    with open(tmp_path / "pet_late.json", "w", encoding="utf-8") as f:
+        json.dump({"pet_data": pet_data(species="nebulite", rarity="legendary"), "last_saved": None}, f)
+    assert store.load_pet("late")["pet_data"]["species"] == "nebulite"
+
+
+def test_game_records_only_hold_what_changed(tmp_path):
+    store = JournalStore(str(tmp_path))
+    game = {
+        "buddy_bucks": 10,
+        "pet_collection": [f"pet_{i}" for i in range(2000)],
+        "achievement_state": {f"a{i}": {"unlocked": False} for i in range(200)}
+    }
+    store.save_game(game)
+
+    def record_size(data):
+        before = os.path.getsize(store.journal_path)
+        store.save_game(data)
+        return os.path.getsize(store.journal_path) - before
+
+    # One adoption and one achievement
+    game = dict(game, pet_collection=game["pet_collection"] + ["pet_new"],
+                achievement_state=dict(game["achievement_state"], a7={"unlocked": True}))
+    assert record_size(game) < 200
+
+    # A list that was not just appended to is written whole
+    game = dict(game, pet_collection=game["pet_collection"][1:])
+    game["achievement_state"].pop("a0")
+    assert record_size(game) > 2000 * 6
+
+    reopened = JournalStore(str(tmp_path))
+    assert reopened.load_game() == game
@@ -0,0 +1,106 @@
+# test_persistence.py - The background writer: coalescing, the bounded queue, writing it all on close
+
+import threading
+from game_state import GameState
+from persistence import PersistenceWorker
+from save_store import MemoryStore
+
+WAIT = 5.0  # Seconds, only reached when something is broken
+
+
+class Recorder:
+    """Write function that logs its calls and can be held up on a gate"""
+
+    def __init__(self):
+        self.written = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+
+    def __call__(self, key, value):
+        self.started.set()
+        assert self.gate.wait(WAIT)
+        self.written.append((key, value))
+
+
+def hold_writer(worker, recorder):
+    """Park the writer thread inside a write, so the next submits stay queued"""
+    recorder.gate.clear()
+    worker.submit("hold", recorder, "hold", 0)
+    assert recorder.started.wait(WAIT)
+
+
+def test_newest_snapshot_per_key_is_written_once():
+    worker = PersistenceWorker()
+    recorder = Recorder()
+    hold_writer(worker, recorder)
+    for value in range(3):
+        worker.submit("game", recorder, "game", value)
+    worker.submit(("pet", "a"), recorder, "a", 0)
+    assert [key for key, _ in worker.pending_snapshots()] == ["hold", "game", ("pet", "a")]
+
+    recorder.gate.set()
+    assert worker.flush(WAIT)
+    assert recorder.written == [("hold", 0), ("game", 2), ("a", 0)]
+    stats = worker.stats()
+    assert stats["superseded"] == 2
+    assert stats["writes"] == 3
+    assert stats["queue_depth"] == 0
+    assert worker.stop(WAIT)
+
+
+def test_full_queue_makes_new_keys_wait():
+    worker = PersistenceWorker(max_pending=2)
+    recorder = Recorder()
+    hold_writer(worker, recorder)
+    worker.submit("a", recorder, "a", 0)
+    worker.submit("b", recorder, "b", 0)
+
+    blocked = threading.Thread(target=worker.submit, args=("c", recorder, "c", 0))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+    # A key that is already queued only replaces its snapshot, it never waits
+    worker.submit("a", recorder, "a", 1)
+    assert worker.stats()["max_queue_depth"] == 2
+
+    recorder.gate.set()
+    blocked.join(WAIT)
+    assert not blocked.is_alive()
+    assert worker.stop(WAIT)
+    assert recorder.written == [("hold", 0), ("b", 0), ("a", 1), ("c", 0)]
+
+
+def test_stop_writes_what_is_queued_and_later_submits_inline():
+    worker = PersistenceWorker()
+    recorder = Recorder()
+    hold_writer(worker, recorder)
+    worker.submit("game", recorder, "game", 1)
+    recorder.gate.set()
+    assert worker.stop(WAIT)
+    assert recorder.written == [("hold", 0), ("game", 1)]
+    assert not worker._thread.is_alive()
+
+    worker.submit("game", recorder, "game", 2)
+    assert recorder.written[-1] == ("game", 2)
+
+
+def test_failed_writes_are_counted():
+    worker = PersistenceWorker()
+    worker.submit("a", lambda: False)
+    worker.submit("b", lambda: 1 / 0)
+    assert worker.stop(WAIT)
+    assert worker.stats()["errors"] == 2
+
+
+def test_close_writes_debounced_changes():
+    store = MemoryStore()
+    game_state = GameState(store=store)
+    game_state.buddy_bucks = 1234
+    # Still inside the debounce, nothing has reached the store yet
+    game_state.save_game()
+    assert store.load_game() is None
+
+    game_state.close(WAIT)
+    assert store.load_game()["buddy_bucks"] == 1234
+    assert not game_state.worker._thread.is_alive()
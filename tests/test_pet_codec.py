@@ -0,0 +1,82 @@
+# test_pet_codec.py - The binary pet record: roundtrips and rejecting what it cannot read
+
+import struct
+import pytest
+import pet_codec
+from assets import SPECIES_CODES, RARITY_CODES, BRANCH_CODES, ACTION_CODES
+from pet_codec import encode_pet, decode_pet, is_pet_record, MAGIC
+from pets import Buddy
+from conftest import pet_data
+
+
+def test_roundtrip():
+    data = pet_data()
+    assert decode_pet(encode_pet(data)) == data
+
+
+@pytest.mark.parametrize("species", SPECIES_CODES)
+@pytest.mark.parametrize("rarity", RARITY_CODES)
+def test_roundtrip_every_species_and_rarity(species, rarity):
+    data = pet_data(species=species, rarity=rarity)
+    assert decode_pet(encode_pet(data)) == data
+
+
+@pytest.mark.parametrize("branch", BRANCH_CODES)
+@pytest.mark.parametrize("action", ACTION_CODES)
+def test_roundtrip_every_branch_and_action(branch, action):
+    data = pet_data(evolution_branch=branch, last_action=action, evolution_ready=True, personality=[])
+    assert decode_pet(encode_pet(data)) == data
+
+
+def test_roundtrip_fresh_buddy():
+    data = Buddy().to_dict()
+    assert decode_pet(encode_pet(data)) == data
+
+
+def test_is_pet_record():
+    assert is_pet_record(encode_pet(pet_data()))
+    assert is_pet_record(memoryview(encode_pet(pet_data())))
+    assert not is_pet_record(b'{"species": "slimey"}')
+    assert not is_pet_record('{"species": "slimey"}')
+
+
+def test_rejects_bad_magic():
+    blob = b"NOPE" + encode_pet(pet_data())[4:]
+    with pytest.raises(ValueError, match="not a pet record"):
+        decode_pet(blob)
+
+
+def test_rejects_unknown_version():
+    blob = bytearray(encode_pet(pet_data()))
+    blob[len(MAGIC)] = pet_codec.FORMAT_VERSION + 1
+    with pytest.raises(ValueError, match="unsupported pet record version"):
+        decode_pet(bytes(blob))
+
+
+def test_rejects_truncated_records():
+    blob = encode_pet(pet_data())
+    with pytest.raises(ValueError, match="truncated"):
+        decode_pet(blob[:3])
+    with pytest.raises(ValueError, match="bytes, expected"):
+        decode_pet(blob[:-1])
+    with pytest.raises(ValueError, match="bytes, expected"):
+        decode_pet(blob + b"\0")
+
+
+@pytest.mark.parametrize("overrides", [
+    {"species": "unicorn"},
+    {"personality": ["playful", "lazy", "hungry", "chill", "neat_freak"]},
+    {"personality": ["grumpy"]},
+    {"stage": 300},
+    {"evolution_branch": "mystery"},
+])
+def test_encode_rejects_what_the_format_cannot_hold(overrides):
+    with pytest.raises(ValueError):
+        encode_pet(pet_data(**overrides))
+
+
+def test_header_layout_is_stable():
+    # Saves on disk depend on this, changing it needs a new FORMAT_VERSION
+    magic, version = struct.unpack_from("<4sB", encode_pet(pet_data()))
+    assert (magic, version) == (b"BUDY", 1)
+    assert len(encode_pet(pet_data())) == 5 + 66
@@ -0,0 +1,56 @@
+# test_pets.py - Catching up on time away against ticking through it
+
+import pytest
+from pets import Buddy
+from conftest import pet_data
+
+TICK = 2  # The game clock's step
+
+
+def away(data, seconds):
+    """(caught up, ticked) copies of a buddy after `seconds` away"""
+    caught_up = Buddy(from_data=data)
+    caught_up.catch_up(seconds)
+    ticked = Buddy(from_data=data)
+    for _ in range(seconds // TICK):
+        ticked.apply_decay(TICK)
+    return caught_up, ticked
+
+
+def assert_same_progress(caught_up, ticked):
+    for field in ("hunger", "energy", "cleanliness", "happiness", "affection", "evolution_timer"):
+        assert getattr(caught_up, field) == pytest.approx(getattr(ticked, field), abs=1e-6), field
+    assert caught_up.stage == ticked.stage
+    assert caught_up.evolution_ready == ticked.evolution_ready
+
+
+# Common pets evolve after 180 s above an average of 50, see Buddy.get_evolution_config()
+@pytest.mark.parametrize("seconds", [2, 60, 600, 36000])
+@pytest.mark.parametrize("stats, timer, stage", [
+    ((95.0, 90.0, 85.0, 99.0), 0.0, 1),       # Stays above the threshold for a while
+    ((95.0, 90.0, 85.0, 99.0), 170.0, 2),     # Gets ready on the way
+    ((40.0, 45.0, 50.0, 30.0), 100.0, 1),     # Already below, the timer resets
+    ((100.0, 100.0, 100.0, 100.0), 0.0, 3),   # Adults never get ready again
+])
+def test_catch_up_matches_ticking(stats, timer, stage, seconds):
+    hunger, energy, cleanliness, happiness = stats
+    data = pet_data(rarity="common", personality=["playful"], hunger=hunger, energy=energy,
+                    cleanliness=cleanliness, happiness=happiness, affection=60.0,
+                    stage=stage, evolution_timer=timer, evolution_ready=False, evolution_branch=None)
+    caught_up, ticked = away(data, seconds)
+    assert_same_progress(caught_up, ticked)
+    if ticked.evolution_ready:
+        # Ready at the end, both picked the branch from the same final stats
+        assert caught_up.evolution_branch == ticked.evolution_branch
+
+
+def test_branch_left_behind_by_a_dip_is_not_picked_by_catch_up():
+    # Ready after 10 s, then the average drops under 50 a little later
+    data = pet_data(rarity="common", personality=["playful"], hunger=60.0, energy=60.0,
+                    cleanliness=60.0, happiness=60.0, affection=60.0, stage=1,
+                    evolution_timer=170.0, evolution_ready=False, evolution_branch=None)
+    caught_up, ticked = away(data, 600)
+    assert_same_progress(caught_up, ticked)
+    assert not ticked.evolution_ready and ticked.evolution_timer == 0
+    assert ticked.evolution_branch is not None
+    assert caught_up.evolution_branch is None
@@ -0,0 +1,23 @@
+# test_simulate.py - The balancing simulator has to keep its speed with big collections
+
+import simulate
+
+
+def buddy_ticks_per_second(pets, hours=0.1):
+    # Best of two, a single run is easily slowed down by whatever else the machine does
+    return max(simulate.run_simulation(hours, None, pets, seed=1)["ticks_per_second"] * pets for _ in range(2))
+
+
+def test_throughput_does_not_fall_with_collection_size():
+    small = buddy_ticks_per_second(20)
+    large = buddy_ticks_per_second(500)
+    # Per buddy the work is the same, anything that grows with the collection (like copying
+    # the whole save on every evolution) shows up as a big drop here
+    assert large > small * 0.4, f"{large:,.0f} buddy-ticks/s at 500 pets vs {small:,.0f} at 20"
+
+
+def test_results_are_reproducible():
+    first = simulate.run_simulation(0.5, None, 10, seed=7)
+    second = simulate.run_simulation(0.5, None, 10, seed=7)
+    for key in ("branches", "time_to_stage", "bucks_earned", "actions"):
+        assert first[key] == second[key]
@@ -0,0 +1,83 @@
+# test_sqlite_store.py - The SQLite store and its one-time import of the JSON saves
+
+import json
+import sqlite3
+import save_store
+from save_store import JournalStore, SQLiteStore
+from conftest import pet_data
+
+
+def migrated_flag(save_dir):
+    conn = sqlite3.connect(str(save_dir / SQLiteStore.DB_NAME))
+    try:
+        return conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+    finally:
+        conn.close()
+
+
+def test_save_and_reopen(tmp_path):
+    store = SQLiteStore(str(tmp_path))
+    store.save_game({"buddy_bucks": 10, "unlocked_themes": ["Light"]})
+    store.save_pets({"a": pet_data(), "b": pet_data(species="dragonling", rarity="epic")})
+    store.close()
+
+    reopened = SQLiteStore(str(tmp_path))
+    assert reopened.load_game() == {"buddy_bucks": 10, "unlocked_themes": ["Light"]}
+    assert reopened.load_pet("a")["pet_data"] == pet_data()
+    assert reopened.find_pets(species="dragonling") == ["b"]
+    reopened.close()
+
+
+def test_json_saves_are_imported_once(tmp_path):
+    journal = JournalStore(str(tmp_path))
+    journal.save_game({"buddy_bucks": 200})
+    journal.save_pet("a", pet_data())
+    journal.close()
+
+    store = SQLiteStore(str(tmp_path))
+    assert store.load_game() == {"buddy_bucks": 200}
+    assert store.load_pet("a")["pet_data"] == pet_data()
+    store.close()
+    assert migrated_flag(tmp_path) is not None
+
+    # JSON saves written after the import are not imported again
+    journal = JournalStore(str(tmp_path))
+    journal.save_pet("late", pet_data(stage=1))
+    journal.close()
+    store = SQLiteStore(str(tmp_path))
+    assert store.load_pet("late") is None
+    store.close()
+
+
+def test_failed_import_is_retried(tmp_path, monkeypatch):
+    with open(tmp_path / "game_state.json", "w", encoding="utf-8") as f:
+        json.dump({"buddy_bucks": 42}, f)
+
+    class BrokenJournal:
+        JOURNAL_NAME = JournalStore.JOURNAL_NAME
+
+        def __init__(self, save_dir):
+            raise OSError("disk on fire")
+
+    monkeypatch.setattr(save_store, "JournalStore", BrokenJournal)
+    store = SQLiteStore(str(tmp_path))
+    assert store.load_game() is None
+    store.close()
+    assert migrated_flag(tmp_path) is None
+
+    monkeypatch.undo()
+    store = SQLiteStore(str(tmp_path))
+    assert store.load_game() == {"buddy_bucks": 42}
+    store.close()
+    assert migrated_flag(tmp_path) is not None
+
+
+def test_rows_from_before_the_binary_format_still_load(tmp_path):
+    store = SQLiteStore(str(tmp_path))
+    with store._conn:
+        store._conn.execute(
+            "INSERT INTO pets (pet_id, species, rarity, stage, data, last_saved) VALUES (?, ?, ?, ?, ?, ?)",
+            ("old", "glitterpup", "uncommon", 2, json.dumps(pet_data()), 5.0)
+        )
+    assert store.load_pet("old") == {"pet_data": pet_data(), "last_saved": 5.0}
+    store.close()
@@ -0,0 +1,162 @@
+# ui_bindings.py - Only talk to Tk when a widget option actually changes
+
+import time
+
+_MISSING = object()
+
+
+class WidgetBinder:
+    """
+    Remembers the last value pushed to every widget option.
+
+    set() compares against that cache and only calls configure() for options that changed,
+    all of them in one Tcl call. The UI refreshes a few times a second but most of the time
+    nothing on screen is different, so most updates never reach Tk. Counters show how many
+    option updates went through and how many were skipped.
+    """
+
+    def __init__(self):
+        self._last = {}  # (widget path, option) -> value
+        self.issued = 0
+        self.suppressed = 0
+
+    def set(self, widget, **options):
+        """Configure the options of widget that differ from what it last got, True if any did"""
+        path = str(widget)
+        changed = {}
+        for option, value in options.items():
+            if self._last.get((path, option), _MISSING) == value:
+                self.suppressed += 1
+            else:
+                changed[option] = value
+        if not changed:
+            return False
+
+        # Only cache once Tk took it, a destroyed widget raises and stays unknown
+        widget.configure(**changed)
+        for option, value in changed.items():
+            self._last[(path, option)] = value
+        self.issued += len(changed)
+        return True
+
+    def forget(self, widget):
+        """Drop the cache for widget and everything inside it (before destroying or rebuilding it)"""
+        path = str(widget)
+        prefix = path.rstrip(".") + "."
+        for key in [key for key in self._last if key[0] == path or key[0].startswith(prefix)]:
+            del self._last[key]
+
+    def stats(self):
+        total = self.issued + self.suppressed
+        return {
+            "issued": self.issued,
+            "suppressed": self.suppressed,
+            "suppressed_ratio": self.suppressed / total if total else 0.0
+        }
+
+
+class ThemeRegistry:
+    """
+    Widgets that take their colours from the theme.
+
+    Each widget is registered with the theme keys its options come from, e.g.
+    register(label, bg="bg", fg="fg"), and apply() recolours all of them in place through
+    the binder instead of rebuilding the UI. Destroyed widgets are dropped on the next apply().
+    """
+
+    def __init__(self, binder):
+        self.binder = binder
+        self._roles = []  # (widget, {option: theme key})
+
+    def register(self, widget, **roles):
+        self._roles.append((widget, roles))
+        return widget
+
+    def apply(self, theme):
+        """Recolour every registered widget for `theme` (a THEMES entry)"""
+        alive = []
+        for widget, roles in self._roles:
+            try:
+                if not widget.winfo_exists():
+                    continue
+                self.binder.set(widget, **{option: theme[key] for option, key in roles.items()})
+                alive.append((widget, roles))
+            except Exception as e:
+                print(f"Error applying theme: {e}")
+        self._roles = alive
+
+
+class RefreshPoller:
+    """
+    Redraws the UI from the Tk side whenever a version number has moved on.
+
+    Other threads only bump the version (e.g. the game actor publishing a snapshot), they
+    never schedule Tk callbacks, so there is never more than the one pending poll and a
+    stalled Tk thread (a modal dialog, a slow save) cannot pile up redraws that replay in a
+    burst afterwards. Versions that came and went between two redraws are counted as
+    coalesced, polls that ran much later than asked for as stalls.
+    """
+
+    def __init__(self, root, version, redraw, interval_ms=100, clock=time.monotonic):
+        self.root = root
+        self.version = version  # callable, the current version
+        self.redraw = redraw
+        self.interval_ms = interval_ms
+        self.clock = clock
+        self._drawn = None
+        self._after_id = None
+        self._due = None
+
+        # Counters
+        self.polls = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.stalls = 0
+        self.max_delay_ms = 0.0
+
+    def start(self):
+        if self._after_id is None:
+            self._due = self.clock() + self.interval_ms / 1000
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def refresh(self):
+        """Redraw now if anything changed (e.g. right after the UI ran a command), True if it did"""
+        version = self.version()
+        if version == self._drawn:
+            return False
+        if self._drawn is not None and isinstance(version, int):
+            self.coalesced += max(0, version - self._drawn - 1)
+        self._drawn = version
+        self.frames += 1
+        self.redraw()
+        return True
+
+    def _poll(self):
+        self._after_id = None
+        self.polls += 1
+        delay_ms = (self.clock() - self._due) * 1000
+        self.max_delay_ms = max(self.max_delay_ms, delay_ms)
+        if delay_ms > self.interval_ms:
+            self.stalls += 1
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error refreshing UI: {e}")
+        self.start()
+
+    def stats(self):
+        return {
+            "polls": self.polls,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "stalls": self.stalls,
+            "max_delay_ms": self.max_delay_ms
+        }
@@ -0,0 +1,128 @@
+# virtual_list.py - A scrolling list that only has widgets for the rows on screen
+
+import tkinter as tk
+from tkinter import ttk
+
+VISIBLE_ROWS = 20   # Until the list knows how tall it is
+WHEEL_ROWS = 3      # Rows per mouse wheel notch
+
+
+class VirtualList:
+    """
+    A scrollable list of any length backed by about a screenful of row widgets.
+
+    make_row(parent) builds one empty row widget, fill_row(row, item) points it at an item.
+    Rows have a fixed height and sit at fixed places, scrolling only refills them with other
+    items, so a collection of thousands of buddies still costs the ~20 rows that are visible
+    instead of a Frame and a few Labels per buddy. Rows that already show the right item are
+    not refilled.
+    """
+
+    def __init__(self, parent, make_row, fill_row, row_height, bg=None):
+        self.make_row = make_row
+        self.fill_row = fill_row
+        self.row_height = row_height
+        self.items = []
+        self.first = 0          # Index of the item in the top row
+        self.visible = VISIBLE_ROWS
+        self._rows = []         # Pooled row widgets, slot i sits at y = i * row_height
+        self._shown = []        # Per slot, the (index, item) it shows, None if hidden
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = tk.Frame(self.frame, bg=bg)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+        return self
+
+    # --- Items ---
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.first = min(self.first, self._last_first())
+        self.render()
+
+    def append(self, items):
+        """Add items at the end (e.g. pages streaming in), only visible rows get filled"""
+        self.items.extend(items)
+        self.render()
+
+    def refresh(self):
+        """Refill every visible row, for items that changed in place"""
+        self._shown = [(-1, None) if shown else None for shown in self._shown]
+        self.render()
+
+    # --- Scrolling ---
+
+    def _last_first(self):
+        return max(0, len(self.items) - self.visible)
+
+    def scroll_to(self, first):
+        first = max(0, min(int(first), self._last_first()))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self.visible
+            self.scroll_to(self.first + step)
+
+    def _on_wheel(self, event):
+        up = getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.first + (-WHEEL_ROWS if up else WHEEL_ROWS))
+        return "break"
+
+    def _bind_wheel(self, widget):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self._on_wheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _on_resize(self, event):
+        self.visible = max(1, event.height // self.row_height)
+        # One extra for the partly visible row at the bottom
+        while len(self._rows) < self.visible + 1:
+            row = self.make_row(self.body)
+            self._bind_wheel(row)
+            self._rows.append(row)
+            self._shown.append(None)
+        self.first = min(self.first, self._last_first())
+        self.render()
+
+    # --- Drawing ---
+
+    def render(self):
+        items = self.items
+        for slot, row in enumerate(self._rows):
+            index = self.first + slot
+            shown = self._shown[slot]
+            if index < len(items) and slot <= self.visible:
+                item = items[index]
+                if shown is not None and shown[0] == index and shown[1] is item:
+                    continue
+                self.fill_row(row, item)
+                if shown is None:
+                    row.place(x=0, y=slot * self.row_height, relwidth=1, height=self.row_height)
+                self._shown[slot] = (index, item)
+            elif shown is not None:
+                row.place_forget()
+                self._shown[slot] = None
+
+        total = len(items)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)